@@ -1,70 +1,311 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import or_, tuple_
 from sqlalchemy.orm import Session
-from typing import List, Optional
-from datetime import datetime, date
+from typing import Dict, List, Optional, Tuple
+from collections import OrderedDict
+from datetime import datetime, date, timedelta
+import asyncio
+import base64
+import json
+import os
+import time
 
-from db.database import get_db
-from models.models import User, SignalEvent, SignalSeverity, Investor, Startup, UserRole
-from api.auth import get_current_user
+from db.database import get_db, SessionLocal
+from models.models import User, SignalEvent, SignalSeverity, SignalType, Investor, Startup, UserRole
+from api.auth import get_current_user, get_user_from_token
+from services.signal_broker import signal_broker, RESYNC
+from services.feed_cache import feed_cache, feed_version, FEED_CACHE_SIZE
 
 router = APIRouter()
+optional_security = HTTPBearer(auto_error=False)
+
+STREAM_HEARTBEAT_SECONDS = 15
+STREAM_REPLAY_LIMIT = 200
+# Streams check the user's feed version this often for signals written by other
+# processes (the background worker, other API workers)
+STREAM_POLL_SECONDS = float(os.getenv("STREAM_POLL_SECONDS", "5"))
+# Re-read window behind each poll, for transactions that commit after rows they
+# timestamped earlier; duplicates are filtered by id
+STREAM_POLL_OVERLAP_SECONDS = 60
+STREAM_DELIVERED_MEMORY = 1000
+
+def encode_cursor(values: List) -> str:
+    """Opaque keyset cursor for the last row of a page"""
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+def decode_cursor(cursor: str, sort_key) -> List:
+    """Cursor values for sort_key; anything malformed is a 400"""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+        if not isinstance(values, list) or len(values) != len(sort_key):
+            raise ValueError("cursor does not match the feed order")
+        # created_at travels as an ISO string
+        return [datetime.fromisoformat(v) if col is SignalEvent.created_at and v is not None else v
+                for col, v in zip(sort_key, values)]
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
 @router.get("/")
 async def get_signal_feed(
+    response: Response,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
-    limit: int = Query(10, ge=1, le=50)
+    limit: int = Query(10, ge=1, le=50),
+    cursor: Optional[str] = None
 ):
-    """Primary Signal Feed - Landing Page UX"""
-    
-    # Query signals for this user
-    query = db.query(SignalEvent).filter(SignalEvent.user_id == current_user.id)
+    """
+    Primary Signal Feed - Landing Page UX
+    Keyset-paginated: pass the X-Next-Cursor header of a page as ?cursor= to get the next one.
+    """
     
     # Role-based constraints
-    if current_user.role == UserRole.INVESTOR or current_user.role == "INVESTOR":
+    is_investor = current_user.role == UserRole.INVESTOR or current_user.role == "INVESTOR"
+    if is_investor:
         # Investor Feed Rules:
-        # 1. Max 10 signals per day (to prevent noise)
-        today = date.today()
-        # Note: In a shared system we might need more complex logic, 
-        # but for now we'll just limit the results to the top 10 most recent/severe
-        
-        # 2. Sorted by severity, then time
-        # Mapping severity to order (HIGH=3, MEDIUM=2, LOW=1)
-        # SQLAlchemy can handle this if we use a case statement or just sort by the enum value if it's ordered correctly
-        # Here we just sort by created_at desc for the base, 
-        # but the prompt specifically says "Sorted by severity, then time"
-        
-        # Let's use a manual sort or a complex query
-        signals = query.order_by(
-            SignalEvent.severity.desc(), # Assumes HIGH > MEDIUM > LOW alphabetically or by enum index
-            SignalEvent.created_at.desc()
-        ).limit(limit).all()
-        
+        # 1. Max 10 signals per day (to prevent noise) - enforced at write time by SignalService
+        # 2. Sorted by severity (HIGH=3, MEDIUM=2, LOW=1), then time
+        # Served by ix_signal_events_feed (user_id, severity_rank, created_at, id)
+        sort_key = (SignalEvent.severity_rank, SignalEvent.created_at, SignalEvent.id)
     else:
         # Founder Feed Rules:
-        # Signals about their startup + Ecosystem benchmarks
-        signals = query.order_by(SignalEvent.created_at.desc()).limit(limit).all()
+        # Signals about their startup + Ecosystem benchmarks, newest first
+        sort_key = (SignalEvent.created_at, SignalEvent.id)
+    
+    # First page: served from the per-user feed cache
+    if not cursor:
+        version = feed_version(db, current_user.id)
+        entry = feed_cache.get(current_user.id, version)
+        if entry is None:
+            rows = query_feed_page(db, current_user.id, sort_key, None, FEED_CACHE_SIZE + 1)
+            entry = {
+                "items": [jsonable_encoder(format_signal(s, startup_name)) for s, startup_name in rows[:FEED_CACHE_SIZE]],
+                "cursors": [encode_cursor(feed_cursor_values(s, is_investor)) for s, _ in rows[:FEED_CACHE_SIZE]],
+                "complete": len(rows) <= FEED_CACHE_SIZE,
+                "version": version
+            }
+            feed_cache.set(current_user.id, entry)
+        items = entry["items"]
+        if limit <= len(items) or entry["complete"]:
+            if len(items) > limit or (limit == len(items) and not entry["complete"]):
+                response.headers["X-Next-Cursor"] = entry["cursors"][limit - 1]
+            return items[:limit]
+    
+    cursor_values = decode_cursor(cursor, sort_key) if cursor else None
+    
+    rows = query_feed_page(db, current_user.id, sort_key, cursor_values, limit + 1)
+    
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if has_more:
+        response.headers["X-Next-Cursor"] = encode_cursor(feed_cursor_values(rows[-1][0], is_investor))
 
     # Format response
-    results = []
-    for s in signals:
-        startup_name = s.startup.name if s.startup else "Ecosystem"
-        results.append({
-            "id": s.id,
-            "type": s.signal_type.value,
-            "severity": s.severity.value,
-            "headline": s.headline,
-            "explanation": s.explanation,
-            "evidence": s.evidence,
-            "startup_id": s.startup_id,
-            "startup_name": startup_name,
-            "created_at": s.created_at,
-            # Common action button mapping
-            "action_label": get_action_label(s),
-            "action_link": get_action_link(s)
-        })
+    return [format_signal(s, startup_name) for s, startup_name in rows]
+
+def query_feed_page(db: Session, user_id: str, sort_key, cursor_values: Optional[List], limit: int):
+    """Signals for this user, with the startup name joined in, after the cursor in feed order"""
+    query = db.query(SignalEvent, Startup.name).outerjoin(
+        Startup, SignalEvent.startup_id == Startup.id
+    ).filter(SignalEvent.user_id == user_id)
+    if cursor_values:
+        query = query.filter(tuple_(*sort_key) < tuple_(*cursor_values))
+    return query.order_by(*[col.desc() for col in sort_key]).limit(limit).all()
+
+def feed_cursor_values(s: SignalEvent, is_investor: bool) -> List:
+    values = [s.severity_rank] if is_investor else []
+    return values + [s.created_at.isoformat() if s.created_at else None, s.id]
+
+@router.get("/stream")
+async def stream_signal_feed(
+    request: Request,
+    token: Optional[str] = None,
+    last_event_id: Optional[str] = None,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)
+):
+    """
+    Live signal push (Server-Sent Events)
+    EventSource can't send headers, so the token may be passed as ?token=.
+    On reconnect the browser sends Last-Event-ID and missed signals are replayed from the DB.
+    Signals committed in this process arrive through the broker at once; signals
+    written by other processes are found by polling (see STREAM_POLL_SECONDS).
+    """
+    raw_token = credentials.credentials if credentials else token
+    if not raw_token:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    resume_from = request.headers.get("last-event-id") or last_event_id
+    
+    # Short-lived session: a stream must not hold a pooled connection while idle
+    db = SessionLocal()
+    try:
+        user_id = get_user_from_token(raw_token, db).id
+        # Subscribe before replaying so nothing lands in between
+        subscription = signal_broker.subscribe(user_id)
+        try:
+            backlog = replay_signals(db, user_id, resume_from) if resume_from else []
+            since = datetime.utcnow() - timedelta(seconds=STREAM_POLL_OVERLAP_SECONDS)
+            version = feed_version(db, user_id)
+            # Already-visible signals inside the overlap window aren't news
+            recent = changed_signals(db, user_id, since)
+        except Exception:
+            signal_broker.unsubscribe(subscription)
+            raise
+    finally:
+        db.close()
+    
+    async def event_stream():
+        nonlocal since, version
+        # id -> occurrence_count sent (or already visible), so each change goes out once
+        delivered: "OrderedDict[str, int]" = OrderedDict()
+        
+        def mark_delivered(item: Dict) -> bool:
+            """False if this version of the signal was already sent"""
+            count = item.get("occurrence_count") or 1
+            if delivered.get(item["id"], 0) >= count:
+                return False
+            delivered[item["id"]] = count
+            delivered.move_to_end(item["id"])
+            while len(delivered) > STREAM_DELIVERED_MEMORY:
+                delivered.popitem(last=False)
+            return True
         
-    return results
+        for item in recent:
+            mark_delivered(item)
+        startup_names: Dict[str, str] = {}
+        last_sent = time.monotonic()
+        try:
+            yield "retry: 3000\n\n"
+            for item in backlog:
+                mark_delivered(item)
+                yield format_sse(item)
+            while not await request.is_disconnected():
+                try:
+                    payload = await asyncio.wait_for(subscription.queue.get(), timeout=STREAM_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    payload = None
+                if payload is RESYNC:
+                    # Fell behind - close so the client reconnects and replays from the DB
+                    break
+                if payload is not None:
+                    item = format_pushed_signal(payload, startup_names)
+                    items = [item] if mark_delivered(item) else []
+                else:
+                    version, since, polled = await asyncio.to_thread(poll_signals, user_id, version, since)
+                    items = [item for item in polled if mark_delivered(item)]
+                for item in items:
+                    yield format_sse(item)
+                    last_sent = time.monotonic()
+                if time.monotonic() - last_sent >= STREAM_HEARTBEAT_SECONDS:
+                    yield ": keep-alive\n\n"
+                    last_sent = time.monotonic()
+        finally:
+            signal_broker.unsubscribe(subscription)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def changed_signals(db: Session, user_id: str, since: datetime) -> List[Dict]:
+    """This user's signals created or digest-bumped after since, oldest first"""
+    rows = db.query(SignalEvent, Startup.name).outerjoin(
+        Startup, SignalEvent.startup_id == Startup.id
+    ).filter(
+        SignalEvent.user_id == user_id,
+        or_(SignalEvent.created_at > since, SignalEvent.last_occurred_at > since)
+    ).order_by(
+        SignalEvent.created_at, SignalEvent.id
+    ).limit(STREAM_REPLAY_LIMIT).all()
+    return [format_signal(s, startup_name) for s, startup_name in rows]
+
+def poll_signals(user_id: str, version: int, since: datetime) -> Tuple[int, datetime, List[Dict]]:
+    """
+    (feed version, next since, changed signals) - the signal query only runs
+    when the user's feed version moved
+    """
+    db = SessionLocal()
+    try:
+        current = feed_version(db, user_id)
+        if current == version:
+            return version, since, []
+        polled_at = datetime.utcnow()
+        items = changed_signals(db, user_id, since)
+        return current, polled_at - timedelta(seconds=STREAM_POLL_OVERLAP_SECONDS), items
+    finally:
+        db.close()
+
+def replay_signals(db: Session, user_id: str, last_id: str) -> List[Dict]:
+    """Signals created after last_id for this user, oldest first"""
+    last = db.query(SignalEvent).filter(
+        SignalEvent.id == last_id,
+        SignalEvent.user_id == user_id
+    ).first()
+    if not last:
+        return []
+    
+    rows = db.query(SignalEvent, Startup.name).outerjoin(
+        Startup, SignalEvent.startup_id == Startup.id
+    ).filter(
+        SignalEvent.user_id == user_id,
+        tuple_(SignalEvent.created_at, SignalEvent.id) > tuple_(last.created_at, last.id)
+    ).order_by(
+        SignalEvent.created_at, SignalEvent.id
+    ).limit(STREAM_REPLAY_LIMIT).all()
+    
+    return [format_signal(s, startup_name) for s, startup_name in rows]
+
+def format_pushed_signal(payload: Dict, startup_names: Dict[str, str]) -> Dict:
+    """Format a broker payload like a feed row (startup names cached per stream)"""
+    signal = SignalEvent(
+        id=payload["id"],
+        user_id=payload["user_id"],
+        user_type=payload["user_type"],
+        startup_id=payload["startup_id"],
+        signal_type=SignalType(payload["signal_type"]),
+        severity=SignalSeverity(payload["severity"]),
+        headline=payload["headline"],
+        explanation=payload["explanation"],
+        evidence=payload["evidence"],
+        created_at=datetime.fromisoformat(payload["created_at"]),
+        occurrence_count=payload.get("occurrence_count", 1),
+        last_occurred_at=datetime.fromisoformat(payload["last_occurred_at"]) if payload.get("last_occurred_at") else None
+    )
+    startup_name = None
+    if signal.startup_id:
+        if signal.startup_id not in startup_names:
+            db = SessionLocal()
+            try:
+                row = db.query(Startup.name).filter(Startup.id == signal.startup_id).first()
+                startup_names[signal.startup_id] = row[0] if row else None
+            finally:
+                db.close()
+        startup_name = startup_names[signal.startup_id]
+    return format_signal(signal, startup_name)
+
+def format_sse(item: Dict) -> str:
+    return f"id: {item['id']}\nevent: signal\ndata: {json.dumps(jsonable_encoder(item))}\n\n"
+
+def format_signal(s: SignalEvent, startup_name: Optional[str]) -> Dict:
+    return {
+        "id": s.id,
+        "type": s.signal_type.value,
+        "severity": s.severity.value,
+        "headline": s.headline,
+        "explanation": s.explanation,
+        "evidence": s.evidence,
+        "startup_id": s.startup_id,
+        "startup_name": startup_name or "Ecosystem",
+        "created_at": s.created_at,
+        # Digest: how many times this signal fired within its window
+        "occurrence_count": s.occurrence_count or 1,
+        "last_occurred_at": s.last_occurred_at,
+        # Common action button mapping
+        "action_label": get_action_label(s),
+        "action_link": get_action_link(s)
+    }
 
 def get_action_label(signal: SignalEvent):
     sig_type = signal.signal_type.value.lower()
@@ -1,9 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from typing import List, Optional
-import json
 
 from db.database import get_db
+from db.json_columns import json_list, json_value
 from models.models import Story, StoryType
 
 router = APIRouter()
@@ -28,7 +28,7 @@ async def get_all_stories(
             "title": s.title,
             "type": s.type.value,
             "summary": s.summary,
-            "related_tags": json.loads(s.related_tags) if s.related_tags else [],
+            "related_tags": json_list(s.related_tags),
             "created_at": s.created_at
         })
     return results
@@ -49,7 +49,7 @@ async def get_story_detail(
         "title": story.title,
         "type": story.type.value,
         "summary": story.summary,
-        "content": json.loads(story.content),
-        "related_tags": json.loads(story.related_tags) if story.related_tags else [],
+        "content": json_value(story.content),
+        "related_tags": json_list(story.related_tags),
         "created_at": story.created_at
     }
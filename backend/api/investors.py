@@ -1,18 +1,23 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from typing import List, Optional
-import json
 
 from db.database import get_db
+from db.json_columns import json_array_contains, json_dict, json_list
 from models.models import (
     User, Investor, Startup, InvestorFitScore, InvestorType, 
     VisibilityStatus, TimelineEvent, WatchlistEntry, WatchIntent,
-    ProfileView, UserRole
+    ProfileView, UserRole, OutboxEventType
 )
 from api.auth import get_current_user
-from services.scoring_service import ScoringService
-from services.signal_service import SignalService
+from services.scoring_service import ScoringService, save_readiness_memo
+from services.outbox_service import enqueue_event
+from services.interest_rollup import record_interest
+from services.profile_view_rollup import record_profile_view
+from services.embedding_index import candidate_pattern_similarities
+from services.timeline_stats import execution_gap_from_stats, load_timeline_stats
 
 router = APIRouter()
 
@@ -60,13 +65,13 @@ async def create_investor_profile(
         name=investor_data.name,
         firm_name=investor_data.firm_name,
         investor_type=investor_data.type,
-        stage_focus=json.dumps(investor_data.stage_preference),
-        sector_focus=json.dumps(investor_data.sector_interests),
-        region_focus=json.dumps(investor_data.region_focus),
+        stage_focus=investor_data.stage_preference,
+        sector_focus=investor_data.sector_interests,
+        region_focus=investor_data.region_focus,
         check_size_min=investor_data.check_size_min,
         check_size_max=investor_data.check_size_max,
         investment_thesis=investor_data.investment_thesis,
-        portfolio_companies=json.dumps(investor_data.past_investments)
+        portfolio_companies=investor_data.past_investments
     )
     
     db.add(investor)
@@ -92,8 +97,8 @@ async def get_investor_profile(
         "id": str(investor.id),
         "name": investor.name,
         "type": investor.investor_type.value if investor.investor_type else None,
-        "stage_preference": json.loads(investor.stage_focus) if investor.stage_focus else [],
-        "sector_interests": json.loads(investor.sector_focus) if investor.sector_focus else [],
+        "stage_preference": json_list(investor.stage_focus),
+        "sector_interests": json_list(investor.sector_focus),
         "check_size_min": investor.check_size_min,
         "check_size_max": investor.check_size_max,
         "created_at": investor.created_at.isoformat() if investor.created_at else None
@@ -113,13 +118,16 @@ async def update_investor_profile(
     if not investor:
         raise HTTPException(status_code=404, detail="Investor profile not found")
     
-    # Update fields
+    # Update fields (request names -> column names where they differ)
+    columns = {
+        'type': 'investor_type',
+        'stage_preference': 'stage_focus',
+        'sector_interests': 'sector_focus',
+        'past_investments': 'portfolio_companies'
+    }
     update_data = investor_data.dict(exclude_unset=True)
     for field, value in update_data.items():
-        if field in ['stage_preference', 'sector_interests', 'past_investments'] and value is not None:
-            setattr(investor, field, json.dumps(value))
-        else:
-            setattr(investor, field, value)
+        setattr(investor, columns.get(field, field), value)
     
     db.commit()
     
@@ -153,6 +161,9 @@ async def get_curated_startups(
     
     scoring_service = ScoringService()
     
+    # Thesis/description similarity rank for every candidate, from one matrix product
+    similarities = candidate_pattern_similarities(db, investor, [startup.id for startup in visible_startups])
+    
     # Calculate fit scores for all startups
     startup_scores = []
     for startup in visible_startups:
@@ -161,7 +172,7 @@ async def get_curated_startups(
         
         # Calculate fit score (0-1)
         fit_score = scoring_service.calculate_investor_fit(
-            investor, startup, readiness_band
+            investor, startup, readiness_band, similarities[startup.id]
         )
         
         # Combined score (readiness * fit)
@@ -184,7 +195,7 @@ async def get_curated_startups(
         startup = item['startup']
         
         # Get metrics
-        metrics = json.loads(startup.metrics) if startup.metrics else {}
+        metrics = json_dict(startup.metrics)
         
         # Determine one risk to show
         risks = []
@@ -204,7 +215,7 @@ async def get_curated_startups(
         match_reasons = []
         if startup.readiness_score and startup.readiness_score >= 70:
             match_reasons.append("High readiness score")
-        if startup.sector in (json.loads(investor.sector_focus) if investor.sector_focus else []):
+        if startup.sector in json_list(investor.sector_focus):
             match_reasons.append(f"Strong fit for {startup.sector}")
         if startup.readiness_score and startup.readiness_score > 80:
             match_reasons.append("Top-tier execution vs peers")
@@ -218,7 +229,7 @@ async def get_curated_startups(
             "sector": startup.sector,
             "stage": startup.stage,
             "location": startup.location,
-            "impact_tags": json.loads(startup.impact_tags) if startup.impact_tags else [],
+            "impact_tags": json_list(startup.impact_tags),
             "impact_depth": startup.impact_depth.value if startup.impact_depth else None,
             "readiness_band": startup.readiness_band.value if startup.readiness_band else None,
             "public_review_band": _score_to_band(startup.public_review_score) if startup.public_review_score else None,
@@ -274,10 +285,10 @@ async def get_startup_details(
     scoring_service = ScoringService()
     readiness_result = scoring_service.calculate_startup_readiness(startup, timeline_events)
     
-    metrics = json.loads(startup.metrics) if startup.metrics else {}
+    metrics = json_dict(startup.metrics)
     
-    # Execution gap detection
-    execution_gap = scoring_service.detect_execution_gap(timeline_events)
+    # Execution gap detection, from the maintained timeline stats
+    execution_gap = execution_gap_from_stats(load_timeline_stats(db, startup.id))
     
     # Momentum
     momentum = scoring_service.calculate_momentum(timeline_events)
@@ -306,14 +317,14 @@ async def get_startup_details(
     
     # Blind mode ONLY hides: founder name, education, network cues
     # Blind mode MUST STILL SHOW: location, sector, stage, timeline, metrics, impact tags, scores
-    return {
+    details = {
         "id": str(startup.id),
         "name": startup.name if not blind_mode else "[Hidden Name]",
         "description": startup.description,
         "sector": startup.sector,
         "stage": startup.stage,
         "location": startup.location,
-        "impact_tags": json.loads(startup.impact_tags) if startup.impact_tags else [],
+        "impact_tags": json_list(startup.impact_tags),
         "impact_depth": startup.impact_depth.value if startup.impact_depth else None,
         "team_size": startup.team_size,
         "metrics": metrics,
@@ -335,6 +346,8 @@ async def get_startup_details(
         "momentum": momentum,
         "risks": risks[:3]  # Top 3 risks
     }
+    save_readiness_memo(db)
+    return details
 
 @router.post("/interests/{startup_id}")
 async def track_interest(
@@ -357,19 +370,23 @@ async def track_interest(
     
     action = request.get('action', 'viewed')
     
-    from models.models import InvestorInterest
+    from models.models import InvestorInterest, PassReason
     interest = InvestorInterest(
         investor_id=investor.id,
         startup_id=startup.id,
-        action=action
+        action=action,
+        pass_reason=PassReason.from_action(action)
     )
     
     db.add(interest)
-    db.commit()
+    record_interest(db, startup.id)
+    if action == 'viewed':
+        # Raw view log; rolled up daily for the founder's visibility stats
+        record_profile_view(db, investor.id, startup.id, "full_profile")
     
-    # Trigger Market Interest Signal (Aggregated/Anonymized)
-    signal_service = SignalService(db)
-    signal_service.trigger_market_interest(startup.id)
+    # Market Interest Signal (Aggregated/Anonymized) - evaluated by the outbox dispatcher
+    enqueue_event(db, OutboxEventType.MARKET_INTEREST, {'startup_id': startup.id})
+    db.commit()
     
     return {"message": f"Interest tracked: {action}"}
 
@@ -397,6 +414,8 @@ async def investor_search(
         Startup.visibility_status == VisibilityStatus.VISIBLE,
         Startup.readiness_score >= 0  # Set to 0 for maximum visibility during development
     )
+    if filters.impact_tags:
+        query = query.filter(or_(*(json_array_contains(db, Startup.impact_tags, tag) for tag in filters.impact_tags)))
     
     # 2. Apply Search Filters
     # If search is by ID or Slug (exact match), we bypass quality filters
@@ -442,12 +461,6 @@ async def investor_search(
     results = []
     scoring_service = ScoringService()
     for startup in startups:
-        # Filter by impact tags
-        if filters.impact_tags:
-            startup_tags = json.loads(startup.impact_tags) if startup.impact_tags else []
-            if not any(tag in startup_tags for tag in filters.impact_tags):
-                continue
-                
         # Get timeline events for momentum
         timeline_events = db.query(TimelineEvent).filter(
             TimelineEvent.startup_id == startup.id
@@ -526,7 +539,7 @@ async def discovery_map(
             "x_momentum": momentum_score,  # X-axis (Number 0-100)
             "y_readiness": startup.readiness_score,  # Y-axis
             "shape": startup.stage,  # Viz encoding
-            "color_tag": json.loads(startup.impact_tags)[0] if startup.impact_tags else "General"
+            "color_tag": (json_list(startup.impact_tags) or ["General"])[0]
         })
         
     return map_data
@@ -569,11 +582,10 @@ async def add_to_watchlist(
         intent=data.intent
     )
     db.add(entry)
-    db.commit()
     
-    # Trigger Market Interest Signal (Aggregated/Anonymized)
-    signal_service = SignalService(db)
-    signal_service.trigger_market_interest(startup.id)
+    # Market Interest Signal (Aggregated/Anonymized) - evaluated by the outbox dispatcher
+    enqueue_event(db, OutboxEventType.MARKET_INTEREST, {'startup_id': startup.id})
+    db.commit()
     
     return {"message": "Added to watchlist"}
 
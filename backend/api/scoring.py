@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from typing import List, Dict, Optional
@@ -7,6 +7,8 @@ from datetime import datetime
 from db.database import get_db
 from models.models import User, Startup, ReadinessScore, InvestorFitScore, TimelineEvent, UserRole
 from api.auth import get_current_user
+from db.json_columns import json_dict, json_list
+from services.readiness_history import history_points, RESOLUTIONS
 # from ml.scoring import StartupReadinessScorer, InvestorFitScorer
 
 router = APIRouter()
@@ -69,12 +71,20 @@ async def calculate_readiness_score(
 @router.get("/readiness/history/{startup_id}")
 async def get_readiness_history(
     startup_id: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    resolution: str = "raw",
+    limit: int = Query(10, ge=1, le=1000),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
-    Get historical readiness scores for a startup
+    Get historical readiness scores for a startup, newest first, optionally
+    within [start, end] and at daily or weekly resolution
     """
+    if resolution not in RESOLUTIONS:
+        raise HTTPException(status_code=400, detail=f"resolution must be one of {', '.join(RESOLUTIONS)}")
+    
     startup = db.query(Startup).filter(Startup.id == startup_id).first()
     if not startup:
         raise HTTPException(status_code=404, detail="Startup not found")
@@ -83,15 +93,14 @@ async def get_readiness_history(
     if (current_user.role == UserRole.STARTUP or current_user.role == "STARTUP") and startup.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Access denied")
     
-    scores = db.query(ReadinessScore).filter(
-        ReadinessScore.startup_id == startup_id
-    ).order_by(ReadinessScore.calculated_at.desc()).limit(10).all()
+    scores = history_points(db, startup_id, start, end, resolution, limit)
     
     return [
         {
             "score": score.score,
             "confidence_band": score.confidence_band,
             "calculated_at": score.calculated_at,
+            "resolution": max(score.resolution or "raw", resolution, key=RESOLUTIONS.index),
             "components": {
                 "execution": score.execution_score,
                 "traction": score.traction_score,
@@ -127,14 +136,12 @@ async def calculate_fit_score(
     
     # Prepare data for scoring
     investor_profile = {
-        'stage_focus': investor.stage_focus or [],
-        'sector_focus': investor.sector_focus or [],
+        'stage_focus': json_list(investor.stage_focus),
+        'sector_focus': json_list(investor.sector_focus),
         'deal_breakers': investor.deal_breakers or []
     }
     
-    # Parse metrics JSON
-    import json
-    metrics = json.loads(startup.metrics) if startup.metrics else {}
+    metrics = json_dict(startup.metrics)
     
     startup_data = {
         'stage': startup.stage,
@@ -3,19 +3,23 @@ from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from typing import List, Optional
 from datetime import date, datetime, timedelta
-import json
 
 from db.database import get_db
+from db.json_columns import json_dict, json_list
 from models.models import (
     User, Startup, TimelineEvent, EventType, ConfidenceLevel,
-    ReadinessBand, VisibilityStatus, ProfileView, WatchlistEntry,
-    InvestorInterest, UserRole
+    ReadinessBand, VisibilityStatus, WatchlistEntry,
+    InvestorInterest, UserRole, OutboxEventType
 )
 from sqlalchemy import func
 from api.auth import get_current_user
-from services.scoring_service import ScoringService
-from services.signal_service import SignalService
+from services.scoring_service import ScoringService, save_readiness_memo
+from services.outbox_service import enqueue_event
 from services.impact_service import calculate_impact_depth
+from services.profile_view_rollup import rollup_window
+from services.timeline_stats import execution_gap_from_stats, load_timeline_aggregate, load_timeline_stats
+from services.readiness_history import persist_readiness
+from services.cohort_stats import cohort_histogram, histogram_median, histogram_percentile, UNSCORED
 
 router = APIRouter()
 
@@ -157,7 +161,7 @@ async def create_startup_profile(
         region=startup_data.region,
         location=startup_data.location,
         description=startup_data.description,
-        impact_tags=json.dumps(impact_tags),
+        impact_tags=impact_tags,
         impact_depth=impact_depth,
         website_url=startup_data.website_url,
         founded_date=startup_data.founded_date,
@@ -193,12 +197,12 @@ async def create_startup_profile(
         fundraising_intent=startup_data.fundraising_intent,
         target_raise_stage=startup_data.target_raise_stage,
         
-        # Legacy compatibility - store as JSON for backward compat
-        metrics=json.dumps({
+        # Legacy compatibility - bucket object for backward compat
+        metrics={
             'users_bucket': startup_data.mau_range,
             'revenue_bucket': startup_data.revenue_range,
             'burn_bucket': 'medium'  # Can be derived from revenue vs growth
-        }),
+        },
         
         visibility_status=VisibilityStatus.HIDDEN  # Hidden until scores computed
     )
@@ -217,39 +221,12 @@ async def create_startup_profile(
     # Calculate public review
     public_review_result = scoring_service.calculate_public_review(startup)
     
-    # Update startup with scores
-    from models.models import ReadinessScore
-    
-    # Map readiness band
-    band_map = {'EARLY': ReadinessBand.EARLY, 'MEDIUM': ReadinessBand.MEDIUM, 'HIGH': ReadinessBand.HIGH}
-    readiness_band = band_map.get(readiness_result['band'], ReadinessBand.EARLY)
-    
-    startup.readiness_score = readiness_result['score']
-    startup.readiness_band = readiness_band
+    # Update startup with scores (and the readiness history)
+    persist_readiness(db, startup, readiness_result)
     startup.public_review_score = public_review_result['score']
     startup.visibility_status = VisibilityStatus.VISIBLE  # Make visible after scoring
     startup.confidence_level = 'Medium'  # Would calculate based on data completeness
     
-    # Save detailed readiness scores with subscores
-    readiness_score = ReadinessScore(
-        startup_id=startup.id,
-        score=readiness_result['score'],
-        confidence_band=10,  # Default
-        execution_score=readiness_result.get('execution_score', 0),
-        traction_score=readiness_result.get('traction_score', 0),
-        market_score=readiness_result.get('market_score', 0),
-        team_score=readiness_result.get('team_score', 0),
-        capital_efficiency_score=readiness_result.get('capital_efficiency_score', 0)
-    )
-    db.add(readiness_score)
-    
-    # Also save sub-scores to startup model for quick access
-    startup.execution_score = readiness_result.get('execution_score', 0)
-    startup.traction_score = readiness_result.get('traction_score', 0)
-    startup.market_score = readiness_result.get('market_score', 0)
-    startup.team_score = readiness_result.get('team_score', 0)
-    startup.capital_efficiency_score = readiness_result.get('capital_efficiency_score', 0)
-    
     db.commit()
     db.refresh(startup)
     
@@ -292,8 +269,8 @@ async def get_startup_dashboard(
     readiness_result = scoring_service.calculate_startup_readiness(startup, timeline_events)
     public_review_result = scoring_service.calculate_public_review(startup)
     
-    # Execution gap detection
-    execution_gap = scoring_service.detect_execution_gap(timeline_events)
+    # Execution gap detection, from the maintained timeline stats
+    execution_gap = execution_gap_from_stats(load_timeline_stats(db, startup.id))
     
     # Momentum indicator
     momentum = scoring_service.calculate_momentum(timeline_events)
@@ -312,19 +289,20 @@ async def get_startup_dashboard(
     else:
         limiting_areas.append("Missing public presence limits visibility signals")
     
-    metrics = json.loads(startup.metrics) if startup.metrics else {}
+    metrics = json_dict(startup.metrics)
     if metrics.get('users_bucket') != '0-100' and metrics.get('users_bucket'):
         key_factors.append("User traction indicates market validation")
     elif metrics.get('users_bucket') == '0-100':
         limiting_areas.append("Early-stage user base - focus on growth metrics")
     
-    if startup.team_size and startup.team_size >= 3:
+    # team_size is a range ("1-2", "3-5", ...); every range but the first starts at 3 or more
+    if startup.team_size and startup.team_size != "1-2":
         key_factors.append("Team size suggests operational capacity")
     
     if readiness_result['score'] >= 70:
         key_factors.append("Strong readiness signals across multiple dimensions")
     
-    return {
+    dashboard = {
         "startup": {
             "id": str(startup.id),
             "name": startup.name,
@@ -341,6 +319,8 @@ async def get_startup_dashboard(
         "what_improves_score": key_factors,  # Qualitative guidance only
         "what_hurts_score": limiting_areas  # Qualitative guidance only
     }
+    save_readiness_memo(db)
+    return dashboard
 
 @router.get("/profile")
 async def get_startup_profile(
@@ -355,8 +335,8 @@ async def get_startup_profile(
     if not startup:
         raise HTTPException(status_code=404, detail="Startup profile not found")
     
-    impact_tags = json.loads(startup.impact_tags) if startup.impact_tags else []
-    metrics = json.loads(startup.metrics) if startup.metrics else {}
+    impact_tags = json_list(startup.impact_tags)
+    metrics = json_dict(startup.metrics)
     
     return {
         "id": str(startup.id),
@@ -404,7 +384,6 @@ async def update_startup_profile(
         invalid_tags = [tag for tag in impact_tags if tag not in IMPACT_TAGS]
         if invalid_tags:
             raise HTTPException(status_code=400, detail=f"Invalid impact tags: {invalid_tags}")
-        update_data['impact_tags'] = json.dumps(impact_tags)
         
         # Recalculate impact depth if tags changed
         impact_depth = calculate_impact_depth(
@@ -414,9 +393,6 @@ async def update_startup_profile(
         )
         startup.impact_depth = impact_depth
     
-    if 'metrics' in update_data:
-        update_data['metrics'] = json.dumps(update_data['metrics'])
-    
     for field, value in update_data.items():
         setattr(startup, field, value)
     
@@ -432,10 +408,7 @@ async def update_startup_profile(
         readiness_result = scoring_service.calculate_startup_readiness(startup, timeline_events)
         public_review_result = scoring_service.calculate_public_review(startup)
         
-        from models.models import ReadinessBand
-        band_map = {'Early': ReadinessBand.EARLY, 'Medium': ReadinessBand.MEDIUM, 'High': ReadinessBand.HIGH}
-        startup.readiness_score = readiness_result['score']
-        startup.readiness_band = band_map.get(readiness_result['band'], ReadinessBand.EARLY)
+        persist_readiness(db, startup, readiness_result)
         startup.public_review_score = public_review_result['score']
     
     db.commit()
@@ -477,29 +450,34 @@ async def add_timeline_event(
     # Update startup last activity
     startup.last_activity = datetime.utcnow()
     
-    # Recalculate readiness score
-    timeline_events = db.query(TimelineEvent).filter(
-        TimelineEvent.startup_id == startup.id
-    ).all()
-    
+    # Recalculate readiness score from the maintained timeline aggregate
     scoring_service = ScoringService()
-    readiness_result = scoring_service.calculate_startup_readiness(startup, timeline_events)
+    readiness_result = scoring_service.calculate_startup_readiness_from_aggregate(
+        startup, *load_timeline_aggregate(db, startup.id)
+    )
     
     # Signal Generation
     old_band = startup.readiness_band.name if startup.readiness_band else "EARLY"
     
-    from models.models import ReadinessBand
-    band_map = {'EARLY': ReadinessBand.EARLY, 'MEDIUM': ReadinessBand.MEDIUM, 'HIGH': ReadinessBand.HIGH}
-    startup.readiness_score = readiness_result['score']
-    startup.readiness_band = band_map.get(readiness_result['band'], ReadinessBand.EARLY)
+    persist_readiness(db, startup, readiness_result)
     
-    signal_service = SignalService(db)
+    # Signal fan-out happens in the outbox dispatcher, not on the request path
     # 1. New Timeline Signal
-    signal_service.trigger_timeline_signal(startup, event)
+    enqueue_event(db, OutboxEventType.TIMELINE_EVENT_ADDED, {
+        'startup_id': startup.id,
+        'event_type': event_type_enum.value,
+        'title': event.title,
+        'confidence': confidence_enum.value,
+        'impact_score': event.impact_score
+    })
     
     # 2. Readiness Band Shift Signal
     if old_band != readiness_result['band']:
-        signal_service.trigger_readiness_shift(startup, old_band, readiness_result['band'])
+        enqueue_event(db, OutboxEventType.READINESS_SHIFT, {
+            'startup_id': startup.id,
+            'old_band': old_band,
+            'new_band': readiness_result['band']
+        })
         
     db.commit()
     
@@ -567,18 +545,13 @@ async def update_timeline_event(
     for field, value in update_data.items():
         setattr(event, field, value)
     
-    # Recalculate scores
-    timeline_events = db.query(TimelineEvent).filter(
-        TimelineEvent.startup_id == startup.id
-    ).all()
-    
+    # Recalculate scores from the maintained timeline aggregate
     scoring_service = ScoringService()
-    readiness_result = scoring_service.calculate_startup_readiness(startup, timeline_events)
+    readiness_result = scoring_service.calculate_startup_readiness_from_aggregate(
+        startup, *load_timeline_aggregate(db, startup.id)
+    )
     
-    from models.models import ReadinessBand
-    band_map = {'Early': ReadinessBand.EARLY, 'Medium': ReadinessBand.MEDIUM, 'High': ReadinessBand.HIGH}
-    startup.readiness_score = readiness_result['score']
-    startup.readiness_band = band_map.get(readiness_result['band'], ReadinessBand.EARLY)
+    persist_readiness(db, startup, readiness_result)
     
     db.commit()
     
@@ -608,18 +581,13 @@ async def delete_timeline_event(
     
     db.delete(event)
     
-    # Recalculate scores
-    timeline_events = db.query(TimelineEvent).filter(
-        TimelineEvent.startup_id == startup.id
-    ).all()
-    
+    # Recalculate scores from the maintained timeline aggregate
     scoring_service = ScoringService()
-    readiness_result = scoring_service.calculate_startup_readiness(startup, timeline_events)
+    readiness_result = scoring_service.calculate_startup_readiness_from_aggregate(
+        startup, *load_timeline_aggregate(db, startup.id)
+    )
     
-    from models.models import ReadinessBand
-    band_map = {'Early': ReadinessBand.EARLY, 'Medium': ReadinessBand.MEDIUM, 'High': ReadinessBand.HIGH}
-    startup.readiness_score = readiness_result['score']
-    startup.readiness_band = band_map.get(readiness_result['band'], ReadinessBand.EARLY)
+    persist_readiness(db, startup, readiness_result)
     
     db.commit()
     
@@ -639,19 +607,13 @@ async def get_visibility_stats(
         raise HTTPException(status_code=404, detail="Startup profile not found")
         
     # 1. Profile Views (Last 7 days, delayed by 24h)
-    # Filter: viewed_at > 8 days ago AND viewed_at < 1 day ago
-    # actually "last 7 days" usually means [now-7d, now]. 
-    # But requirement: "Delayed by 24 hours".
-    # So window is: [now-8d, now-1d]
-    
-    end_date = datetime.utcnow() - timedelta(days=1)
-    start_date = end_date - timedelta(days=7)
-    
-    views_count = db.query(ProfileView).filter(
-        ProfileView.startup_id == startup.id,
-        ProfileView.viewed_at >= start_date,
-        ProfileView.viewed_at <= end_date
-    ).count()
+    # Window is the 7 complete UTC days ending yesterday, read from the daily rollup
+    end_day = (datetime.utcnow() - timedelta(days=1)).date()
+    start_day = end_day - timedelta(days=6)
+    start_date = datetime.combine(start_day, datetime.min.time())
+    end_date = datetime.combine(end_day, datetime.max.time())
+    
+    views_count, unique_viewers = rollup_window(db, startup.id, start_day, end_day)
     
     # 2. Watchlist Adds (Total)
     watchlist_count = db.query(WatchlistEntry).filter(
@@ -677,6 +639,7 @@ async def get_visibility_stats(
             
     return {
         "views_last_7d": views_count,  # Delayed
+        "unique_investors_last_7d": unique_viewers,  # Approximate (HyperLogLog)
         "watchlist_total": watchlist_count,
         "intent_breakdown": intent_map,
         "period_start": start_date.isoformat(),
@@ -694,26 +657,14 @@ async def get_pass_reasons(
         
     startup = db.query(Startup).filter(Startup.user_id == current_user.id).first()
     
-    # Query InvestorInterest where action starts with 'passed_'
-    interests = db.query(InvestorInterest).filter(
+    # One grouped read over the (startup_id, pass_reason) index
+    counts = db.query(InvestorInterest.pass_reason, func.count(InvestorInterest.id)).filter(
         InvestorInterest.startup_id == startup.id,
-        InvestorInterest.action.like("passed_%")
-    ).all()
-    
-    # Aggregate
-    reasons = {}
-    total_passes = 0
-    
-    for interest in interests:
-        # action format: "passed_timing", "passed_team", etc.
-        try:
-            parts = interest.action.split('_', 1)
-            if len(parts) == 2:
-                reason = parts[1].replace('_', ' ').title()
-                reasons[reason] = reasons.get(reason, 0) + 1
-                total_passes += 1
-        except:
-            pass
+        InvestorInterest.pass_reason.isnot(None)
+    ).group_by(InvestorInterest.pass_reason).all()
+    
+    reasons = {reason.value.title(): count for reason, count in counts}
+    total_passes = sum(reasons.values())
             
     return {
         "reasons": reasons,
@@ -734,20 +685,24 @@ async def get_peer_benchmarks(
     if not startup:
         raise HTTPException(status_code=404, detail="Startup not found")
         
-    # Find similar startups (same sector and stage)
-    peers = db.query(Startup).filter(
-        Startup.sector == startup.sector,
-        Startup.stage == startup.stage,
-        Startup.id != startup.id
-    ).all()
-    
-    # Calculate median readiness
-    peer_scores = [p.readiness_score for p in peers if p.readiness_score]
-    median_score = sum(peer_scores) / len(peer_scores) if peer_scores else 50
+    # Cohort histogram (same sector and stage), minus this startup's own entry
+    histogram = cohort_histogram(db, startup.sector, startup.stage)
+    own_score = UNSCORED if startup.readiness_score is None else startup.readiness_score
+    if histogram.get(own_score):
+        histogram[own_score] -= 1
+    peer_count = sum(histogram.values())
+    
+    # True median and exact percentile of peer readiness
+    median_score = histogram_median(histogram)
+    if median_score is None:
+        median_score = 50
+    your_score = startup.readiness_score or 0
+    percentile = histogram_percentile(histogram, your_score)
     
     return {
-        "your_score": startup.readiness_score or 0,
+        "your_score": your_score,
         "median_peer_score": round(median_score, 1),
-        "peer_count": len(peers),
-        "benchmark_insight": "You are ahead of 65% of peers in your sector/stage." if (startup.readiness_score or 0) > median_score else "Consider increasing execution density to match median peer path."
+        "peer_count": peer_count,
+        "peer_percentile": percentile,
+        "benchmark_insight": f"You are ahead of {percentile}% of peers in your sector/stage." if percentile is not None and your_score > median_score else "Consider increasing execution density to match median peer path."
     }
@@ -12,7 +12,6 @@ from db.database import SessionLocal
 from models.models import User, Startup, UserRole, ReadinessBand, VisibilityStatus
 from passlib.context import CryptContext
 import uuid
-import json
 from datetime import datetime, date
 
 pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
@@ -59,7 +58,7 @@ def create_complete_startup():
             region="North America",
             location="San Francisco, CA",
             description="All-in-one workspace for notes, tasks, wikis, and databases. Notion combines the flexibility of documents with the structure of databases.",
-            impact_tags=json.dumps(["Future of Work", "Education", "Productivity"]),
+            impact_tags=["Future of Work", "Education", "Productivity"],
             website_url="https://www.notion.so",
             founded_date=date(2016, 1, 1),
             team_size="200+",
@@ -94,11 +93,11 @@ def create_complete_startup():
             target_raise_stage="Series C",
             
             # Legacy metrics
-            metrics=json.dumps({
+            metrics={
                 'users_bucket': '100M+',
                 'revenue_bucket': '$100M+',
                 'burn_bucket': 'low'
-            }),
+            },
             
             # Initial scores (will be recalculated)
             readiness_score=85,
@@ -0,0 +1,54 @@
+"""
+JSON columns
+JSONDocument stores lists and dicts natively: JSONB on Postgres (GIN-indexed
+where queried, @> containment), JSON text elsewhere. Python None is stored as
+SQL NULL.
+
+Reads go through json_list / json_dict / json_value, which also accept legacy
+JSON-encoded strings and return an empty value for anything of the wrong
+shape, so handlers never parse. json_array_contains and json_array_nonempty
+build the matching filters for the session's dialect.
+"""
+
+import json
+from typing import Any, Dict, List
+
+from sqlalchemy import JSON, Text, and_, cast, func, literal, select, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Session
+
+JSONDocument = JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql")
+
+
+def json_value(value: Any) -> Any:
+    """The stored document; a string that is itself JSON (legacy rows) is decoded"""
+    if isinstance(value, (str, bytes)):
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value
+    return value
+
+
+def json_list(value: Any) -> List:
+    value = json_value(value)
+    return value if isinstance(value, list) else []
+
+
+def json_dict(value: Any) -> Dict:
+    value = json_value(value)
+    return value if isinstance(value, dict) else {}
+
+
+def json_array_contains(db: Session, column, value):
+    """Filter: the JSON array in column contains value"""
+    if db.get_bind().dialect.name == "postgresql":
+        # The JSONB comparator, so this compiles to @> (GIN-indexable)
+        return type_coerce(column, JSONB).contains([value])
+    elements = func.json_each(column).table_valued("value")
+    return select(literal(1)).select_from(elements).where(elements.c.value == value).exists()
+
+
+def json_array_nonempty(column):
+    """Filter: column holds a non-empty array (dialect-neutral)"""
+    return and_(column.isnot(None), cast(column, Text) != "[]")
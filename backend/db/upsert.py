@@ -0,0 +1,28 @@
+"""
+Dialect-aware INSERT helpers
+Postgres and SQLite both support INSERT ... ON CONFLICT; this picks the right
+construct for the session's engine.
+"""
+
+from sqlalchemy import insert as generic_insert
+from sqlalchemy.orm import Session
+
+
+def dialect_insert(db: Session, model):
+    """INSERT construct with on_conflict_do_nothing / on_conflict_do_update available"""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f"ON CONFLICT not supported for dialect {dialect}")
+    return insert(model)
+
+
+def insert_ignore_duplicates(db: Session, model, rows, index_elements):
+    """Bulk INSERT that silently skips rows whose key already exists"""
+    if not rows:
+        return
+    stmt = dialect_insert(db, model).on_conflict_do_nothing(index_elements=index_elements)
+    db.execute(stmt, rows)
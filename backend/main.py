@@ -8,6 +8,9 @@ from dotenv import load_dotenv
 from db.database import get_db, engine
 from api import auth, investors, startups, scoring, introductions, ecosystem, feed, insights
 from models import models
+from services.background_jobs import (
+    background_jobs_enabled, register_default_jobs, start_background_jobs, stop_background_jobs
+)
 
 load_dotenv()
 
@@ -45,6 +48,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 security = HTTPBearer()
@@ -59,6 +63,17 @@ app.include_router(ecosystem.router, prefix="/api/ecosystem", tags=["ecosystem"]
 app.include_router(feed.router, prefix="/api/feed", tags=["feed"])
 app.include_router(insights.router, prefix="/api/insights", tags=["insights"])
 
+@app.on_event("startup")
+async def start_workers():
+    # Outbox dispatcher and other periodic jobs
+    if background_jobs_enabled():
+        register_default_jobs()
+        start_background_jobs()
+
+@app.on_event("shutdown")
+async def stop_workers():
+    stop_background_jobs()
+
 @app.get("/")
 async def root():
     return {"message": "ScaleX API - Funding Signal Intelligence Layer"}
@@ -0,0 +1,62 @@
+"""
+Text Embeddings
+Local, CPU-only, stateless embeddings for investor theses and startup
+descriptions: a hashing vectorizer (word unigrams and bigrams) folded into
+EMBEDDING_DIM dimensions and L2-normalized, so the dot product of two
+embeddings is their cosine similarity. Nothing is fitted, so any process
+embeds the same text to the same vector.
+
+Vectors are stored packed as little-endian float32 (EMBEDDING_DIM * 4 bytes)
+and read back zero-copy with np.frombuffer.
+"""
+
+from typing import Iterable, Optional
+
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+
+EMBEDDING_DIM = 512
+EMBEDDING_DTYPE = np.dtype('<f4')
+
+# Stored next to every embedding; bump whenever the vectorizer or the
+# embedded text changes, so stale vectors are ignored and re-embedded
+EMBEDDING_MODEL_VERSION = "hash512-v1"
+
+_vectorizer = HashingVectorizer(
+    n_features=EMBEDDING_DIM,
+    ngram_range=(1, 2),
+    stop_words='english',
+    alternate_sign=False,
+    norm='l2',
+    dtype=np.float32
+)
+
+
+def embed_texts(texts: Iterable[str]) -> np.ndarray:
+    """(n, EMBEDDING_DIM) float32 matrix; an empty text embeds to zeros"""
+    return _vectorizer.transform([text or "" for text in texts]).toarray().astype(EMBEDDING_DTYPE, copy=False)
+
+
+def embed_text(text: str) -> np.ndarray:
+    return embed_texts([text])[0]
+
+
+def pack_embedding(vector: np.ndarray) -> bytes:
+    return np.asarray(vector, dtype=EMBEDDING_DTYPE).tobytes()
+
+
+def unpack_embedding(blob: Optional[bytes]) -> Optional[np.ndarray]:
+    """Read-only float32 view of a packed embedding (None for missing or mis-sized)"""
+    if not blob or len(blob) != EMBEDDING_DIM * EMBEDDING_DTYPE.itemsize:
+        return None
+    return np.frombuffer(blob, dtype=EMBEDDING_DTYPE)
+
+
+def startup_text(startup) -> str:
+    """What a startup is embedded from"""
+    return "\n".join(part for part in (startup.sector, startup.description, startup.product_description) if part)
+
+
+def investor_text(investor) -> str:
+    """What an investor is embedded from"""
+    return investor.investment_thesis or ""
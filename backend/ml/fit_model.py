@@ -20,10 +20,13 @@ class FitModelInterface(ABC):
         investor_stage_preference: List[str],
         investor_sector_preference: List[str],
         check_size_range: Tuple[Optional[int], Optional[int]],
-        startup_funding_raised: Optional[float] = None
+        startup_funding_raised: Optional[float] = None,
+        pattern_similarity: Optional[float] = None
     ) -> float:
         """
-        Returns fit score 0-1 (used only for ranking)
+        Returns fit score 0-1 (used only for ranking). pattern_similarity is
+        the startup's thesis/description similarity rank among the candidates
+        being ranked (0-1, 0.5 when it has no embedding), None to leave it out.
         """
         pass
 
@@ -39,7 +42,8 @@ class RuleBasedFitModel(FitModelInterface):
         investor_stage_preference: List[str],
         investor_sector_preference: List[str],
         check_size_range: Tuple[Optional[int], Optional[int]],
-        startup_funding_raised: Optional[float] = None
+        startup_funding_raised: Optional[float] = None,
+        pattern_similarity: Optional[float] = None
     ) -> float:
         """Calculate fit using rule-based logic with dynamic scoring"""
         
@@ -93,6 +97,10 @@ class RuleBasedFitModel(FitModelInterface):
         # Convert to 0-1 range (max 100 points possible)
         fit_score = fit_score / 100.0
         
+        # Thesis/description similarity rank; every candidate gets one
+        if pattern_similarity is not None:
+            fit_score = fit_score * 0.8 + pattern_similarity * 0.2
+        
         # Add small randomization for variety (±5%)
         import random
         variance = random.uniform(-0.05, 0.05)
@@ -117,7 +125,8 @@ class AzureMLFitModel(FitModelInterface):
         investor_stage_preference: List[str],
         investor_sector_preference: List[str],
         check_size_range: Tuple[Optional[int], Optional[int]],
-        startup_funding_raised: Optional[float] = None
+        startup_funding_raised: Optional[float] = None,
+        pattern_similarity: Optional[float] = None
     ) -> float:
         """Call Azure ML endpoint if available, otherwise fallback"""
         
@@ -125,7 +134,7 @@ class AzureMLFitModel(FitModelInterface):
             return self.fallback.calculate_fit(
                 startup_stage, startup_sector, startup_readiness_band,
                 investor_stage_preference, investor_sector_preference,
-                check_size_range, startup_funding_raised
+                check_size_range, startup_funding_raised, pattern_similarity
             )
         
         try:
@@ -139,7 +148,8 @@ class AzureMLFitModel(FitModelInterface):
                 'investor_sector_preference': investor_sector_preference,
                 'check_size_min': check_size_range[0],
                 'check_size_max': check_size_range[1],
-                'startup_funding_raised': startup_funding_raised
+                'startup_funding_raised': startup_funding_raised,
+                'pattern_similarity': pattern_similarity
             }
             
             response = requests.post(
@@ -156,7 +166,7 @@ class AzureMLFitModel(FitModelInterface):
                 return self.fallback.calculate_fit(
                     startup_stage, startup_sector, startup_readiness_band,
                     investor_stage_preference, investor_sector_preference,
-                    check_size_range, startup_funding_raised
+                    check_size_range, startup_funding_raised, pattern_similarity
                 )
         
         except Exception as e:
@@ -164,7 +174,7 @@ class AzureMLFitModel(FitModelInterface):
             return self.fallback.calculate_fit(
                 startup_stage, startup_sector, startup_readiness_band,
                 investor_stage_preference, investor_sector_preference,
-                check_size_range, startup_funding_raised
+                check_size_range, startup_funding_raised, pattern_similarity
             )
 
 
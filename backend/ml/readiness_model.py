@@ -4,14 +4,94 @@ Determines if a startup is investable right now using comprehensive data.
 Now uses all the rich onboarding data for accurate sub-scores.
 """
 
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 from datetime import datetime, timedelta
 from abc import ABC, abstractmethod
+import logging
 import os
 
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever scoring logic, tables or weights change: memoized results
+# (Startup.readiness_cache) are keyed by it
+READINESS_MODEL_VERSION = "enhanced-2"
+
+# Timeline feature buckets the model counts events into (event_types keys)
+FEATURE_BUCKETS = ('team', 'product', 'traction', 'capital')
+
+# EventType value -> feature bucket; every EventType must be listed
+EVENT_TYPE_BUCKETS = {
+    'TEAM': 'team',
+    'ADVISORY': 'team',
+    'PRODUCT': 'product',
+    'PIVOT': 'product',
+    'MILESTONE': 'traction',
+    'FUNDING': 'capital',
+    'INVESTMENT': 'capital',
+    'EXIT': 'capital'
+}
+
+# Point tables shared by the scalar and batch paths
+# Weights: Execution 30%, Traction 30%, Market 15%, Team 15%, Capital Efficiency 10%
+READINESS_WEIGHTS = (0.30, 0.30, 0.15, 0.15, 0.10)
+
+# (days since the last timeline event below which, execution points)
+RECENCY_POINTS = ((30, 20), (60, 15), (90, 10), (180, 5))
+
+MAU_POINTS = {
+    '0-100': 5,
+    '100-1k': 12,
+    '1k-10k': 18,
+    '10k-100k': 25,
+    '100k+': 30
+}
+GROWTH_POINTS = {
+    '0-10%': 5,
+    '10-25%': 12,
+    '25-50%': 18,
+    '50%+': 25
+}
+REVENUE_POINTS = {
+    '0': 5,
+    '0-5k': 10,
+    '5k-25k': 15,
+    '25k-100k': 20,
+    '100k+': 25
+}
+RETENTION_POINTS = {
+    'low': 7,
+    'medium': 13,
+    'high': 20
+}
+TEAM_SIZE_POINTS = {
+    '1-2': 10,
+    '3-5': 18,
+    '6-10': 23,
+    '11-20': 25,
+    '20+': 22  # Slight penalty for too large before product-market fit
+}
+EXPERIENCE_POINTS = {
+    '0-2': 10,
+    '3-5': 18,
+    '6-10': 25,
+    '10+': 30
+}
+
 class ReadinessModelInterface(ABC):
     """Interface for readiness scoring - ML or rule-based"""
     
+    # Deterministic implementations set this so results can be memoized
+    version: Optional[str] = None
+    
+    def recency_key(self, days_since_last_event: int) -> int:
+        """
+        Coarsest form of days_since_last_event the result depends on: inputs
+        that differ only within one key score the same (memo fingerprints use it)
+        """
+        return days_since_last_event
+    
     @abstractmethod
     def calculate_readiness(
         self,
@@ -46,6 +126,12 @@ class ReadinessModelInterface(ABC):
 class EnhancedReadinessModel(ReadinessModelInterface):
     """Enhanced rule-based implementation with comprehensive scoring"""
     
+    version = READINESS_MODEL_VERSION
+    
+    def recency_key(self, days_since_last_event: int) -> int:
+        """Index of the RECENCY_POINTS step"""
+        return sum(days_since_last_event >= limit for limit, _ in RECENCY_POINTS)
+    
     def calculate_readiness(
         self,
         timeline_event_count: int,
@@ -100,13 +186,13 @@ class EnhancedReadinessModel(ReadinessModelInterface):
         )
         
         # ==== WEIGHTED OVERALL SCORE ====
-        # Weights: Execution 30%, Traction 30%, Market 15%, Team 15%, Capital Efficiency 10%
+        w_execution, w_traction, w_market, w_team, w_capital = READINESS_WEIGHTS
         final_score = int(
-            execution_score * 0.30 +
-            traction_score * 0.30 +
-            market_score * 0.15 +
-            team_score * 0.15 +
-            capital_efficiency_score * 0.10
+            execution_score * w_execution +
+            traction_score * w_traction +
+            market_score * w_market +
+            team_score * w_team +
+            capital_efficiency_score * w_capital
         )
         final_score = max(0, min(100, final_score))
         
@@ -118,9 +204,7 @@ class EnhancedReadinessModel(ReadinessModelInterface):
         else:
             band = 'EARLY'
         
-        explanation = f"Comprehensive score based on execution ({execution_score}/100), "
-        explanation += f"traction ({traction_score}/100), market ({market_score}/100), "
-        explanation += f"team ({team_score}/100), and capital efficiency ({capital_efficiency_score}/100)"
+        explanation = _explanation(execution_score, traction_score, market_score, team_score, capital_efficiency_score)
         
         return {
             'score': final_score,
@@ -133,6 +217,10 @@ class EnhancedReadinessModel(ReadinessModelInterface):
             'capital_efficiency_score': capital_efficiency_score
         }
     
+    def calculate_readiness_batch(self, columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Columnar calculate_readiness over encode_readiness_inputs() output"""
+        return calculate_readiness_batch(columns)
+    
     def _calculate_execution_score(
         self,
         timeline_count: int,
@@ -148,14 +236,7 @@ class EnhancedReadinessModel(ReadinessModelInterface):
         score += min(35, timeline_count * 4)
         
         # Recency bonus/penalty (0-20 points)
-        if days_since_last < 30:
-            score += 20
-        elif days_since_last < 60:
-            score += 15
-        elif days_since_last < 90:
-            score += 10
-        elif days_since_last < 180:
-            score += 5
+        score += next((points for limit, points in RECENCY_POINTS if days_since_last < limit), 0)
         
         # Event diversity (0-15 points)
         diversity = len([v for v in event_types.values() if v > 0])
@@ -187,44 +268,19 @@ class EnhancedReadinessModel(ReadinessModelInterface):
         
         # User base (0-30 points)
         mau_range = traction_data.get('mau_range', legacy_traction)
-        mau_scores = {
-            '0-100': 5,
-            '100-1k': 12,
-            '1k-10k': 18,
-            '10k-100k': 25,
-            '100k+': 30
-        }
-        score += mau_scores.get(mau_range, 5)
+        score += MAU_POINTS.get(mau_range, 5)
         
         # Growth rate (0-25 points)
         growth = traction_data.get('user_growth_rate', '0-10%')
-        growth_scores = {
-            '0-10%': 5,
-            '10-25%': 12,
-            '25-50%': 18,
-            '50%+': 25
-        }
-        score += growth_scores.get(growth, 5)
+        score += GROWTH_POINTS.get(growth, 5)
         
         # Revenue (0-25 points)
         revenue_range = traction_data.get('revenue_range', '0')
-        revenue_scores = {
-            '0': 5,
-            '0-5k': 10,
-            '5k-25k': 15,
-            '25k-100k': 20,
-            '100k+': 25
-        }
-        score += revenue_scores.get(revenue_range, 5)
+        score += REVENUE_POINTS.get(revenue_range, 5)
         
         # Retention (0-20 points)
         retention = traction_data.get('retention_level', 'medium')
-        retention_scores = {
-            'low': 7,
-            'medium': 13,
-            'high': 20
-        }
-        score += retention_scores.get(retention, 10)
+        score += RETENTION_POINTS.get(retention, 10)
         
         return min(100, score)
     
@@ -284,24 +340,11 @@ class EnhancedReadinessModel(ReadinessModelInterface):
         score = 0
         
         # Team size (0-25 points)
-        size_scores = {
-            '1-2': 10,
-            '3-5': 18,
-            '6-10': 23,
-            '11-20': 25,
-            '20+': 22  # Slight penalty for too large before product-market fit
-        }
-        score += size_scores.get(team_size, 10)
+        score += TEAM_SIZE_POINTS.get(team_size, 10)
         
         # Founder experience (0-30 points)
         experience_years = founder_data.get('experience_years', '0-2')
-        exp_scores = {
-            '0-2': 10,
-            '3-5': 18,
-            '6-10': 25,
-            '10+': 30
-        }
-        score += exp_scores.get(experience_years, 10)
+        score += EXPERIENCE_POINTS.get(experience_years, 10)
         
         # Previous startup experience (0-20 points)
         if founder_data.get('prev_startup_exp'):
@@ -379,6 +422,244 @@ class EnhancedReadinessModel(ReadinessModelInterface):
         return min(100, max(0, score))
 
 
+def event_bucket_counts(event_type_counts: Dict[str, int]) -> Dict[str, int]:
+    """Per-EventType counts folded into the model's event_types feature"""
+    event_types = dict.fromkeys(FEATURE_BUCKETS, 0)
+    for event_type, count in event_type_counts.items():
+        event_types[EVENT_TYPE_BUCKETS[event_type]] += count
+    return event_types
+
+
+def _explanation(execution, traction, market, team, capital_efficiency) -> str:
+    explanation = f"Comprehensive score based on execution ({execution}/100), "
+    explanation += f"traction ({traction}/100), market ({market}/100), "
+    explanation += f"team ({team}/100), and capital efficiency ({capital_efficiency}/100)"
+    return explanation
+
+
+# ==== BATCH (COLUMNAR) SCORING ====
+# Categorical fields are encoded as int8 codes: index into the field's
+# vocabulary, OTHER for any value outside it (including None), and ABSENT when
+# the key was missing and the scalar path would substitute a context-dependent
+# default (only mau_range, which falls back differently per sub-score).
+
+ABSENT = -2
+OTHER = -1
+
+READINESS_VOCABULARIES = {
+    'mau_range': list(MAU_POINTS),
+    'traction_bucket': list(MAU_POINTS),
+    'user_growth_rate': list(GROWTH_POINTS),
+    'revenue_range': list(REVENUE_POINTS),
+    'retention_level': list(RETENTION_POINTS),
+    'revenue_status': ['profitable', 'early_revenue'],
+    'market_size': ['large', 'medium'],
+    'competition_level': ['low', 'medium'],
+    'customer_type': ['B2B', 'B2C'],
+    'team_size': list(TEAM_SIZE_POINTS),
+    'experience_years': list(EXPERIENCE_POINTS),
+    'burn_bucket': ['low', 'medium'],
+}
+
+_MISSING = object()
+
+
+def _code(field: str, value) -> int:
+    return READINESS_VOCABULARIES[field].index(value) if value in READINESS_VOCABULARIES[field] else OTHER
+
+
+def _codes_of(field: str, *values) -> List[int]:
+    return [READINESS_VOCABULARIES[field].index(v) for v in values]
+
+
+def _lookup(codes: np.ndarray, field: str, points: Dict[str, int], other: int, absent: int = 0) -> np.ndarray:
+    table = np.array([absent, other] + [points[v] for v in READINESS_VOCABULARIES[field]], dtype=np.int64)
+    return table[codes.astype(np.int64) + 2]
+
+
+def encode_readiness_inputs(rows: Iterable[Dict]) -> Dict[str, np.ndarray]:
+    """
+    Encode calculate_readiness keyword arguments (one dict per startup) into
+    columns for calculate_readiness_batch. Key defaults are resolved the way
+    the scalar path resolves them.
+    """
+    columns: Dict[str, list] = {name: [] for name in (
+        'timeline_event_count', 'days_since_last_event', 'event_diversity',
+        'full_time', 'has_next_milestone', 'is_incorporated',
+        'mau_range', 'traction_bucket', 'user_growth_rate', 'revenue_range', 'retention_level',
+        'revenue_status', 'market_size', 'competition_level', 'has_monetization_model', 'customer_type',
+        'team_size', 'experience_years', 'prev_startup_exp', 'cofounder_count', 'has_founder_role',
+        'burn_bucket',
+        *(f'{bucket}_events' for bucket in FEATURE_BUCKETS)
+    )}
+    for row in rows:
+        founder = row.get('founder_data') or {}
+        traction = row.get('traction_data') or {}
+        market = row.get('market_data') or {}
+        roadmap = row.get('roadmap_data') or {}
+        mau_range = traction.get('mau_range', _MISSING)
+
+        columns['timeline_event_count'].append(row['timeline_event_count'])
+        columns['days_since_last_event'].append(row['days_since_last_event'])
+        columns['event_diversity'].append(len([v for v in row['event_types'].values() if v > 0]))
+        columns['full_time'].append(founder.get('time_commitment') == 'full_time')
+        columns['has_next_milestone'].append(bool(roadmap.get('next_milestone')))
+        columns['is_incorporated'].append(bool(founder.get('is_incorporated')))
+        columns['mau_range'].append(ABSENT if mau_range is _MISSING else _code('mau_range', mau_range))
+        columns['traction_bucket'].append(_code('traction_bucket', row['traction_bucket']))
+        columns['user_growth_rate'].append(_code('user_growth_rate', traction.get('user_growth_rate', '0-10%')))
+        columns['revenue_range'].append(_code('revenue_range', traction.get('revenue_range', '0')))
+        columns['retention_level'].append(_code('retention_level', traction.get('retention_level', 'medium')))
+        columns['revenue_status'].append(_code('revenue_status', traction.get('revenue_status', 'pre_revenue')))
+        columns['market_size'].append(_code('market_size', market.get('market_size', 'medium')))
+        columns['competition_level'].append(_code('competition_level', market.get('competition_level', 'medium')))
+        columns['has_monetization_model'].append(bool(market.get('monetization_model')))
+        columns['customer_type'].append(_code('customer_type', market.get('customer_type')))
+        columns['team_size'].append(_code('team_size', row['team_size']))
+        columns['experience_years'].append(_code('experience_years', founder.get('experience_years', '0-2')))
+        columns['prev_startup_exp'].append(bool(founder.get('prev_startup_exp')))
+        columns['cofounder_count'].append(founder.get('cofounder_count', 0))
+        columns['has_founder_role'].append(bool(founder.get('founder_role')))
+        columns['burn_bucket'].append(_code('burn_bucket', row['burn_bucket']))
+        for bucket in FEATURE_BUCKETS:
+            columns[f'{bucket}_events'].append(row['event_types'].get(bucket, 0))
+
+    encoded = {}
+    for name, values in columns.items():
+        if name in READINESS_VOCABULARIES:
+            encoded[name] = np.array(values, dtype=np.int8)
+        elif name in ('timeline_event_count', 'days_since_last_event', 'event_diversity', 'cofounder_count') \
+                or name.endswith('_events'):
+            encoded[name] = np.array(values, dtype=np.int64)
+        else:
+            encoded[name] = np.array(values, dtype=bool)
+    return encoded
+
+
+def calculate_readiness_batch(columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    EnhancedReadinessModel.calculate_readiness over encoded columns (see
+    encode_readiness_inputs). Returns int64 arrays for 'score' and the five
+    sub-scores and a string array for 'band'; identical to the scalar path.
+    """
+    c = columns
+    days = c['days_since_last_event']
+    growth = c['user_growth_rate']
+    revenue_range = c['revenue_range']
+    revenue_status = c['revenue_status']
+    mau = c['mau_range']
+    no_revenue = revenue_range == _code('revenue_range', '0')
+    profitable, early_revenue = (revenue_status == code for code in _codes_of('revenue_status', 'profitable', 'early_revenue'))
+
+    # Execution
+    execution = (
+        np.minimum(35, c['timeline_event_count'] * 4)
+        + np.select([days < limit for limit, _ in RECENCY_POINTS], [points for _, points in RECENCY_POINTS], 0)
+        + np.minimum(15, c['event_diversity'] * 5)
+        + np.where(c['full_time'], 15, 7)
+        + np.where(c['has_next_milestone'], 10, 0)
+        + np.where(c['is_incorporated'], 5, 0)
+    )
+    execution = np.minimum(100, execution)
+
+    # Traction (a missing mau_range falls back to the legacy traction bucket)
+    traction = (
+        np.where(mau == ABSENT, _lookup(c['traction_bucket'], 'traction_bucket', MAU_POINTS, 5),
+                 _lookup(mau, 'mau_range', MAU_POINTS, 5))
+        + _lookup(growth, 'user_growth_rate', GROWTH_POINTS, 5)
+        + _lookup(revenue_range, 'revenue_range', REVENUE_POINTS, 5)
+        + _lookup(c['retention_level'], 'retention_level', RETENTION_POINTS, 10)
+    )
+    traction = np.minimum(100, traction)
+
+    # Market (a missing mau_range reads as None here)
+    large, medium = _codes_of('market_size', 'large', 'medium')
+    low_competition, medium_competition = _codes_of('competition_level', 'low', 'medium')
+    b2b, b2c = _codes_of('customer_type', 'B2B', 'B2C')
+    early_mau = np.isin(mau, _codes_of('mau_range', '0-100', '100-1k'))
+    market = (
+        np.select([c['market_size'] == large, c['market_size'] == medium], [30, 20], 10)
+        + np.select([c['competition_level'] == low_competition, c['competition_level'] == medium_competition], [25, 15], 8)
+        + np.where(c['has_monetization_model'], 20, 0)
+        + np.select([profitable, early_revenue], [15, 10], 3)
+        + np.select([(c['customer_type'] == b2b) & ~no_revenue, (c['customer_type'] == b2c) & ~early_mau], [10, 7], 0)
+    )
+    market = np.minimum(100, market)
+
+    # Team
+    cofounders = c['cofounder_count']
+    team = (
+        _lookup(c['team_size'], 'team_size', TEAM_SIZE_POINTS, 10)
+        + _lookup(c['experience_years'], 'experience_years', EXPERIENCE_POINTS, 10)
+        + np.where(c['prev_startup_exp'], 20, 5)
+        + np.select([cofounders >= 2, cofounders == 1], [15, 10], 3)
+        + np.where(c['has_founder_role'], 10, 0)
+    )
+    team = np.minimum(100, team)
+
+    # Capital efficiency (a missing mau_range reads as '0-100' here)
+    g_10_25, g_25_50, g_50 = _codes_of('user_growth_rate', '10-25%', '25-50%', '50%+')
+    low_burn, medium_burn = _codes_of('burn_bucket', 'low', 'medium')
+    burn = c['burn_bucket']
+    growth_vs_burn = np.select(
+        [burn == low_burn, burn == medium_burn],
+        [
+            np.select([(growth == g_25_50) | (growth == g_50), growth == g_10_25], [30, 20], 10),
+            np.select([growth == g_50, growth == g_25_50], [25, 15], 8)
+        ],
+        np.where(growth == g_50, 15, 5)
+    )
+    capital_efficiency = (
+        50
+        + np.select([profitable, early_revenue, ~no_revenue], [40, 25, 15], 5)
+        + growth_vs_burn
+        + np.where(no_revenue & ((mau == ABSENT) | early_mau), 10, 0)
+    )
+    capital_efficiency = np.clip(capital_efficiency, 0, 100)
+
+    # Weighted total, summed in the scalar path's order so float rounding matches
+    w_execution, w_traction, w_market, w_team, w_capital = READINESS_WEIGHTS
+    total = (
+        execution * w_execution +
+        traction * w_traction +
+        market * w_market +
+        team * w_team +
+        capital_efficiency * w_capital
+    )
+    score = np.clip(np.trunc(total).astype(np.int64), 0, 100)
+    band = np.select([score >= 70, score >= 40], ['HIGH', 'MEDIUM'], 'EARLY')
+
+    return {
+        'score': score,
+        'band': band,
+        'execution_score': execution,
+        'traction_score': traction,
+        'market_score': market,
+        'team_score': team,
+        'capital_efficiency_score': capital_efficiency
+    }
+
+
+def readiness_batch_results(batch: Dict[str, np.ndarray]) -> List[Dict]:
+    """Per-startup dicts in calculate_readiness's result shape"""
+    rows = zip(*(batch[key].tolist() for key in (
+        'score', 'band', 'execution_score', 'traction_score', 'market_score', 'team_score', 'capital_efficiency_score'
+    )))
+    return [
+        {
+            'score': score,
+            'band': band,
+            'explanation': _explanation(execution, traction, market, team, capital_efficiency),
+            'execution_score': execution,
+            'traction_score': traction,
+            'market_score': market,
+            'team_score': team,
+            'capital_efficiency_score': capital_efficiency
+        }
+        for score, band, execution, traction, market, team, capital_efficiency in rows
+    ]
+
+
 class AzureMLReadinessModel(ReadinessModelInterface):
     """Azure ML implementation (v2) - optional"""
     
@@ -464,7 +745,21 @@ class AzureMLReadinessModel(ReadinessModelInterface):
 
 
 def get_readiness_model() -> ReadinessModelInterface:
-    """Factory function - returns ML model if enabled, else enhanced rule-based"""
+    """
+    Factory function - returns the trained model if READINESS_MODEL_PATH points
+    at an artifact, the Azure ML model if enabled, else enhanced rule-based
+    """
+    artifact_path = os.getenv("READINESS_MODEL_PATH")
+    if artifact_path:
+        try:
+            from ml.trained_readiness_model import TrainedReadinessModel
+            return TrainedReadinessModel(artifact_path)
+        except Exception as e:
+            logger.warning(
+                f"Trained readiness model at {artifact_path} unavailable ({e}); "
+                f"using rule-based model {READINESS_MODEL_VERSION}"
+            )
+    
     use_ml = os.getenv("USE_ML_READINESS", "false").lower() == "true"
     
     if use_ml:
@@ -3,13 +3,9 @@ SignalFund ML Scoring System
 Explainable, rule-based scoring with confidence bands
 """
 
-import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Optional
-from sklearn.preprocessing import StandardScaler
-from sklearn.ensemble import GradientBoostingRegressor
-from sklearn.linear_model import LogisticRegression
+from datetime import datetime
+from typing import Dict, List, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
@@ -17,12 +13,10 @@ logger = logging.getLogger(__name__)
 class StartupReadinessScorer:
     """
     Startup Readiness Score (SRS): 0-100 investability score
-    Rule-based with ML enhancement for pattern recognition
+    Rule-based (the trained model lives in ml/trained_readiness_model.py)
     """
     
     def __init__(self):
-        self.scaler = StandardScaler()
-        self.model = None
         self.feature_weights = {
             'execution_consistency': 0.25,
             'traction_velocity': 0.25,
@@ -281,8 +275,10 @@ class InvestorFitScorer:
             startup_data
         )
         
-        # Pattern similarity (simplified - would use ML in production)
-        pattern_similarity = 0.7  # Placeholder for ML-based similarity
+        # Thesis/description cosine similarity (services/embedding_index.py)
+        pattern_similarity = startup_data.get('pattern_similarity')
+        if pattern_similarity is None:
+            pattern_similarity = 0.5  # Neutral if either side isn't embedded
         
         # Weighted final score
         fit_multiplier = (
@@ -0,0 +1,152 @@
+"""
+Trained Readiness Model
+GradientBoostingClassifier estimating the probability that a startup reaches
+a term sheet, trained offline by scripts/train_readiness_model.py and loaded
+from a joblib artifact once per process. The overall score is that
+probability's percentile among the training set; sub-scores and the
+explanation come from the rule-based tables so they stay explainable.
+
+Inference runs in-process on the columnar encoding (encode_readiness_inputs),
+so the batch path is one predict_proba call.
+"""
+
+import os
+from bisect import bisect_left
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import joblib
+import numpy as np
+
+from ml.readiness_model import (
+    FEATURE_BUCKETS, READINESS_MODEL_VERSION, RECENCY_POINTS, ReadinessModelInterface,
+    calculate_readiness_batch, encode_readiness_inputs, readiness_batch_results
+)
+
+ARTIFACT_FORMAT = 1
+
+# Encoded columns the classifier reads, in matrix column order
+READINESS_FEATURES = (
+    'timeline_event_count', 'days_since_last_event', 'event_diversity',
+    *(f'{bucket}_events' for bucket in FEATURE_BUCKETS),
+    'full_time', 'has_next_milestone', 'is_incorporated',
+    'mau_range', 'traction_bucket', 'user_growth_rate', 'revenue_range', 'retention_level',
+    'revenue_status', 'market_size', 'competition_level', 'has_monetization_model', 'customer_type',
+    'team_size', 'experience_years', 'prev_startup_exp', 'cofounder_count', 'has_founder_role',
+    'burn_bucket'
+)
+
+_artifacts: Dict[str, Dict] = {}
+
+
+def readiness_feature_matrix(columns: Dict[str, np.ndarray]) -> np.ndarray:
+    """(n, len(READINESS_FEATURES)) float32 matrix from encode_readiness_inputs output"""
+    return np.column_stack([columns[name].astype(np.float32) for name in READINESS_FEATURES])
+
+
+def feature_split_points(classifier, feature: str) -> List[float]:
+    """Sorted thresholds the classifier's trees split feature on (a tree sends x <= t left)"""
+    index = READINESS_FEATURES.index(feature)
+    points = set()
+    for estimator in np.ravel(getattr(classifier, 'estimators_', [])):
+        tree = estimator.tree_
+        points.update(tree.threshold[tree.feature == index].tolist())
+    return sorted(points)
+
+
+def save_readiness_artifact(classifier, train_probabilities: np.ndarray, path: str, metrics: Dict, samples: int) -> Dict:
+    trained_at = datetime.utcnow()
+    artifact = {
+        'format': ARTIFACT_FORMAT,
+        'version': f"gb-{trained_at:%Y%m%d%H%M%S}",
+        'trained_at': trained_at.isoformat(),
+        'features': READINESS_FEATURES,
+        'model': classifier,
+        # Percentile boundaries of the training-set probabilities (score -> band)
+        'score_quantiles': np.quantile(train_probabilities, np.linspace(0, 1, 101)),
+        'metrics': metrics,
+        'samples': samples
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    joblib.dump(artifact, path)
+    return artifact
+
+
+def load_readiness_artifact(path: str) -> Dict:
+    """Load (and cache per process) an artifact written by save_readiness_artifact"""
+    path = os.path.abspath(path)
+    if path not in _artifacts:
+        artifact = joblib.load(path)
+        if artifact.get('format') != ARTIFACT_FORMAT:
+            raise ValueError(
+                f"Unsupported readiness artifact format {artifact.get('format')} (version {artifact.get('version')})"
+            )
+        if tuple(artifact['features']) != READINESS_FEATURES:
+            raise ValueError(
+                f"Readiness artifact version {artifact.get('version')} was trained on a different feature set; retrain it"
+            )
+        _artifacts[path] = artifact
+    return _artifacts[path]
+
+
+class TrainedReadinessModel(ReadinessModelInterface):
+    """Offline-trained gradient boosting implementation"""
+
+    def __init__(self, path: Optional[str] = None):
+        artifact = load_readiness_artifact(path or os.environ["READINESS_MODEL_PATH"])
+        self.classifier = artifact['model']
+        self.score_quantiles = artifact['score_quantiles']
+        # Sub-scores come from the rule tables, so their version is part of ours
+        self.version = f"{artifact['version']}+{READINESS_MODEL_VERSION}"
+        # Where the result can change with days_since_last_event: the trees' splits and the
+        # rule table's steps (days >= limit, i.e. days > limit - 0.5 for whole days)
+        self.recency_splits = sorted(
+            set(feature_split_points(self.classifier, 'days_since_last_event'))
+            | {limit - 0.5 for limit, _ in RECENCY_POINTS}
+        )
+
+    def recency_key(self, days_since_last_event: int) -> int:
+        """Number of recency splits days_since_last_event lies above"""
+        return bisect_left(self.recency_splits, days_since_last_event)
+
+    def calculate_readiness(
+        self,
+        timeline_event_count: int,
+        days_since_last_event: int,
+        event_types: Dict[str, int],
+        team_size: str,
+        traction_bucket: str,
+        burn_bucket: str,
+        founder_data: Optional[Dict] = None,
+        traction_data: Optional[Dict] = None,
+        market_data: Optional[Dict] = None,
+        roadmap_data: Optional[Dict] = None
+    ) -> Dict:
+        columns = encode_readiness_inputs([{
+            'timeline_event_count': timeline_event_count,
+            'days_since_last_event': days_since_last_event,
+            'event_types': event_types,
+            'team_size': team_size,
+            'traction_bucket': traction_bucket,
+            'burn_bucket': burn_bucket,
+            'founder_data': founder_data,
+            'traction_data': traction_data,
+            'market_data': market_data,
+            'roadmap_data': roadmap_data
+        }])
+        return readiness_batch_results(self.calculate_readiness_batch(columns))[0]
+
+    def calculate_readiness_batch(self, columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Columnar calculate_readiness over encode_readiness_inputs() output"""
+        batch = calculate_readiness_batch(columns)
+        probabilities = self.predict_proba(columns)
+        score = np.clip(np.searchsorted(self.score_quantiles, probabilities, side='right') - 1, 0, 100).astype(np.int64)
+        batch['score'] = score
+        batch['band'] = np.select([score >= 70, score >= 40], ['HIGH', 'MEDIUM'], 'EARLY')
+        return batch
+
+    def predict_proba(self, columns: Dict[str, np.ndarray]) -> np.ndarray:
+        """Term-sheet probability per row"""
+        if len(columns['timeline_event_count']) == 0:
+            return np.zeros(0)
+        return self.classifier.predict_proba(readiness_feature_matrix(columns))[:, 1]
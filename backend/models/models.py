@@ -1,9 +1,11 @@
 import enum
 import json
 import uuid
-from sqlalchemy import Column, String, Integer, Boolean, ForeignKey, Enum, Text, Date, DateTime, Float, func
-from sqlalchemy.orm import relationship
+from datetime import datetime
+from sqlalchemy import Column, String, Integer, Boolean, ForeignKey, Enum, Text, Date, DateTime, Float, Index, UniqueConstraint, LargeBinary, func
+from sqlalchemy.orm import deferred, relationship
 from db.database import Base
+from db.json_columns import JSONDocument
 
 # Enums
 class UserRole(str, enum.Enum):
@@ -77,6 +79,17 @@ class PassReason(str, enum.Enum):
     TIMING = "timing"
     OTHER = "other"
 
+    @classmethod
+    def from_action(cls, action):
+        """'passed_timing' -> TIMING; unknown 'passed_*' reasons -> OTHER; anything else -> None"""
+        action = (action or "").lower()
+        if not action.startswith("passed_") or action == "passed_":
+            return None
+        try:
+            return cls(action[len("passed_"):])
+        except ValueError:
+            return cls.OTHER
+
 class SignalType(str, enum.Enum):
     TIMELINE_UPDATE = "TIMELINE_UPDATE"
     READINESS_SHIFT = "READINESS_SHIFT"
@@ -91,6 +104,22 @@ class SignalSeverity(str, enum.Enum):
     MEDIUM = "MEDIUM"
     HIGH = "HIGH"
 
+# Numeric severity for SQL ordering (the enum sorts as strings: MEDIUM > LOW > HIGH)
+SEVERITY_RANK = {
+    SignalSeverity.LOW: 1,
+    SignalSeverity.MEDIUM: 2,
+    SignalSeverity.HIGH: 3
+}
+
+def _severity_rank_default(context):
+    severity = context.get_current_parameters().get("severity")
+    return SEVERITY_RANK.get(SignalSeverity(severity), 1) if severity else 1
+
+class OutboxEventType(str, enum.Enum):
+    TIMELINE_EVENT_ADDED = "TIMELINE_EVENT_ADDED"
+    READINESS_SHIFT = "READINESS_SHIFT"
+    MARKET_INTEREST = "MARKET_INTEREST"
+
 class StoryType(str, enum.Enum):
     DECISION_STORY = "decision_story"
     ECOSYSTEM_INSIGHT = "ecosystem_insight"
@@ -111,20 +140,26 @@ class User(Base):
 
 class Investor(Base):
     __tablename__ = "investors"
+    __table_args__ = (
+        # Containment queries (sector ∈ sector_focus); GIN only exists on Postgres JSONB
+        Index("ix_investors_stage_focus", "stage_focus", postgresql_using="gin").ddl_if(dialect="postgresql"),
+        Index("ix_investors_sector_focus", "sector_focus", postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"))
     name = Column(String(255), nullable=False)
     firm_name = Column(String(255))
     investor_type = Column(Enum(InvestorType))
-    stage_focus = Column(Text)  # JSON array
-    sector_focus = Column(Text)  # JSON array
-    region_focus = Column(Text)  # JSON array - geographic preferences
+    stage_focus = Column(JSONDocument)  # Array of stages
+    sector_focus = Column(JSONDocument)  # Array of sectors
+    region_focus = Column(JSONDocument)  # Array - geographic preferences
     check_size_min = Column(Integer)
     check_size_max = Column(Integer)
     investment_thesis = Column(Text)  # Free-text thesis description
-    portfolio_companies = Column(Text)  # JSON array of past investments
-    thesis_embedding = Column(Text)  # JSON vector
+    portfolio_companies = Column(JSONDocument)  # Array of past investments
+    thesis_embedding = Column(LargeBinary)  # Packed little-endian float32 (ml/embeddings.py)
+    thesis_embedding_model = Column(String(32))  # EMBEDDING_MODEL_VERSION it was computed with
     created_at = Column(DateTime, server_default=func.now())
     
     # Relationships
@@ -138,6 +173,9 @@ class Investor(Base):
 
 class Startup(Base):
     __tablename__ = "startups"
+    __table_args__ = (
+        Index("ix_startups_impact_tags", "impact_tags", postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"))
@@ -152,7 +190,7 @@ class Startup(Base):
     description = Column(Text)  # Short description
     founded_date = Column(Date)
     is_incorporated = Column(Boolean, default=False)
-    impact_tags = Column(Text)  # JSON array (max 5)
+    impact_tags = Column(JSONDocument)  # Array (max 5)
     impact_depth = Column(Enum(ImpactDepth))  # surface/integrated/core
     website_url = Column(String(500))
     team_size = Column(String(50))  # e.g., "1-2", "3-5", etc.
@@ -187,7 +225,7 @@ class Startup(Base):
     target_raise_stage = Column(String(50))  # "angel", "seed", etc.
     
     # Legacy/Computed fields
-    metrics = Column(Text)  # JSON: backward compatibility
+    metrics = Column(JSONDocument)  # Object: backward compatibility
     readiness_score = Column(Integer)  # 0-100, cached
     readiness_band = Column(Enum(ReadinessBand))  # Early/Medium/High
     public_review_score = Column(Integer)  # 0-100
@@ -200,6 +238,15 @@ class Startup(Base):
     team_score = Column(Integer)  # 0-100
     capital_efficiency_score = Column(Integer)  # 0-100
     
+    # Memoized readiness model output, keyed by a fingerprint of its inputs
+    readiness_fingerprint = Column(String(64))
+    readiness_cache = Column(JSONDocument)  # calculate_readiness result
+    
+    # Packed float32 embedding of sector + descriptions (services/embedding_index.py);
+    # deferred so ordinary startup queries don't load it
+    description_embedding = deferred(Column(LargeBinary))
+    description_embedding_model = Column(String(32))  # EMBEDDING_MODEL_VERSION it was computed with
+    
     visibility_status = Column(Enum(VisibilityStatus), default=VisibilityStatus.HIDDEN)
     last_activity = Column(DateTime, server_default=func.now())
     created_at = Column(DateTime, server_default=func.now())
@@ -217,6 +264,14 @@ class Startup(Base):
 
 class SignalEvent(Base):
     __tablename__ = "signal_events"
+    __table_args__ = (
+        # Investor feed: severity, then time (keyset pagination)
+        Index("ix_signal_events_feed", "user_id", "severity_rank", "created_at", "id"),
+        # Founder feed: time only
+        Index("ix_signal_events_user_time", "user_id", "created_at", "id"),
+        # Retention: oldest-first archival sweep
+        Index("ix_signal_events_created_at", "created_at", "id"),
+    )
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
@@ -227,26 +282,79 @@ class SignalEvent(Base):
     explanation = Column(Text)
     evidence = Column(Text)
     severity = Column(Enum(SignalSeverity), nullable=False)
-    created_at = Column(DateTime, server_default=func.now())
+    severity_rank = Column(Integer, nullable=False, default=_severity_rank_default, server_default="1")  # LOW=1, MEDIUM=2, HIGH=3
+    # Python-side default keeps one timestamp format on SQLite, which keyset cursors compare against
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=func.now())
+    # Digest: repeats within the digest window bump the count instead of adding rows
+    occurrence_count = Column(Integer, nullable=False, default=1, server_default="1")
+    last_occurred_at = Column(DateTime)
     
     # Relationships
     user = relationship("User")
     startup = relationship("Startup", back_populates="signal_events")
 
+class UserFeedVersion(Base):
+    """Bumped in every transaction that changes a user's signals; cached feeds and streams compare against it"""
+    __tablename__ = "user_feed_versions"
+    
+    user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+class OutboxEvent(Base):
+    """Domain events written in the request transaction, materialized into signals by the dispatcher"""
+    __tablename__ = "outbox_events"
+    __table_args__ = (
+        Index("ix_outbox_events_pending", "processed_at", "created_at"),
+    )
+    
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    event_type = Column(Enum(OutboxEventType), nullable=False)
+    payload = Column(JSONDocument, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    last_error = Column(Text)
+    created_at = Column(DateTime, server_default=func.now())
+    processed_at = Column(DateTime)  # NULL while pending
+
+class EcosystemCounter(Base):
+    """Ecosystem aggregates maintained in the writing transaction (see services/ecosystem_counters.py)"""
+    __tablename__ = "ecosystem_counters"
+    
+    dimension = Column(String(50), primary_key=True)  # band / depth / visible_stage / visible_location / ...
+    key = Column(String(255), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    readiness_sum = Column(Integer, nullable=False, default=0)
+    readiness_n = Column(Integer, nullable=False, default=0)  # rows with a readiness score
+
+class CohortScoreBucket(Base):
+    """Readiness score histogram per (sector, stage) cohort (see services/cohort_stats.py)"""
+    __tablename__ = "cohort_score_buckets"
+    
+    sector = Column(String(100), primary_key=True)  # "" when unset
+    stage = Column(String(50), primary_key=True)
+    score = Column(Integer, primary_key=True)  # 0-100, -1 = not yet scored
+    count = Column(Integer, nullable=False, default=0)
+
 class Story(Base):
     __tablename__ = "stories"
+    __table_args__ = (
+        Index("ix_stories_related_tags", "related_tags", postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     slug = Column(String(255), unique=True, index=True, nullable=False)
     title = Column(String(255), nullable=False)
     type = Column(Enum(StoryType), nullable=False)
     summary = Column(Text, nullable=False)
-    content = Column(Text, nullable=False) # JSON structure for blocks
-    related_tags = Column(Text) # JSON array
+    content = Column(JSONDocument, nullable=False) # Structure for blocks
+    related_tags = Column(JSONDocument) # Array
     created_at = Column(DateTime, server_default=func.now())
 
 class TimelineEvent(Base):
     __tablename__ = "timeline_events"
+    __table_args__ = (
+        # Execution-gap sweep: MAX(event_date) GROUP BY startup_id
+        Index("ix_timeline_events_startup_date", "startup_id", "event_date"),
+    )
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     startup_id = Column(String, ForeignKey("startups.id", ondelete="CASCADE"), nullable=True)
@@ -265,7 +373,11 @@ class TimelineEvent(Base):
     investor = relationship("Investor", back_populates="timeline_events")
 
 class ReadinessScore(Base):
+    """Readiness time series (services/readiness_history.py downsamples old points)"""
     __tablename__ = "readiness_scores"
+    __table_args__ = (
+        Index("ix_readiness_scores_startup_time", "startup_id", "calculated_at"),
+    )
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     startup_id = Column(String, ForeignKey("startups.id", ondelete="CASCADE"))
@@ -276,7 +388,8 @@ class ReadinessScore(Base):
     market_score = Column(Integer)
     team_score = Column(Integer)
     capital_efficiency_score = Column(Integer)
-    calculated_at = Column(DateTime, server_default=func.now())
+    calculated_at = Column(DateTime, default=datetime.utcnow, server_default=func.now())
+    resolution = Column(String(10), nullable=False, default="raw", server_default="raw")  # raw/daily/weekly
     
     # Relationships
     startup = relationship("Startup", back_populates="readiness_scores")
@@ -316,30 +429,97 @@ class Introduction(Base):
 
 class InvestorInterest(Base):
     __tablename__ = "investor_interests"
+    __table_args__ = (
+        # Pass-reason breakdown per startup
+        Index("ix_investor_interests_startup_pass_reason", "startup_id", "pass_reason"),
+    )
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     investor_id = Column(String, ForeignKey("investors.id", ondelete="CASCADE"))
     startup_id = Column(String, ForeignKey("startups.id", ondelete="CASCADE"))
     action = Column(String(50))  # 'viewed', 'watched', 'passed'
+    pass_reason = Column(Enum(PassReason))  # Parsed from 'passed_<reason>' actions
     created_at = Column(DateTime, server_default=func.now())
     
     # Relationships
     investor = relationship("Investor", back_populates="interests")
     startup = relationship("Startup", back_populates="interests")
 
+class StartupTimelineStats(Base):
+    """Timeline aggregate per startup, maintained in the writing transaction (services/timeline_stats.py)"""
+    __tablename__ = "startup_timeline_stats"
+    
+    startup_id = Column(String, ForeignKey("startups.id", ondelete="CASCADE"), primary_key=True)
+    event_count = Column(Integer, nullable=False, default=0)
+    last_event_date = Column(Date)
+    event_type_counts = Column(JSONDocument)  # {EventType value: count}
+    largest_gap_days = Column(Integer)  # Largest gap between consecutive events
+    largest_gap_start = Column(Date)
+
+class ExecutionGapAlert(Base):
+    """One row per detected execution gap, keyed by the last event before it"""
+    __tablename__ = "execution_gap_alerts"
+    __table_args__ = (
+        UniqueConstraint("startup_id", "last_event_date", name="uq_execution_gap_alerts_gap"),
+    )
+    
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    startup_id = Column(String, ForeignKey("startups.id", ondelete="CASCADE"), nullable=False)
+    last_event_date = Column(Date, nullable=False)
+    gap_days = Column(Integer, nullable=False)
+    created_at = Column(DateTime, server_default=func.now())
+
+class StartupInterestRollup(Base):
+    """Hourly count of investor interest actions per startup (sliding-window market interest)"""
+    __tablename__ = "startup_interest_rollups"
+    
+    startup_id = Column(String, ForeignKey("startups.id", ondelete="CASCADE"), primary_key=True)
+    bucket_start = Column(DateTime, primary_key=True)  # UTC, truncated to the hour
+    interest_count = Column(Integer, nullable=False, default=0)
+
+class MarketInterestAlertState(Base):
+    """When the market-interest signal last fired for a startup (at most once per window)"""
+    __tablename__ = "market_interest_alert_state"
+    
+    startup_id = Column(String, ForeignKey("startups.id", ondelete="CASCADE"), primary_key=True)
+    last_fired_at = Column(DateTime)
+
 class ProfileView(Base):
     __tablename__ = "profile_views"
+    __table_args__ = (
+        # Rollup aggregator keyset and raw-row compaction
+        Index("ix_profile_views_viewed_at", "viewed_at", "id"),
+    )
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     investor_id = Column(String, ForeignKey("investors.id", ondelete="CASCADE"))
     startup_id = Column(String, ForeignKey("startups.id", ondelete="CASCADE"))
     view_type = Column(String(50)) # 'card', 'full_profile'
-    viewed_at = Column(DateTime, server_default=func.now())
+    viewed_at = Column(DateTime, default=datetime.utcnow, server_default=func.now())
     
     # Relationships
     investor = relationship("Investor", back_populates="profile_views")
     startup = relationship("Startup", back_populates="profile_views")
 
+class ProfileViewDaily(Base):
+    """Daily rollup of profile_views (raw rows are compacted after PROFILE_VIEW_RAW_RETENTION_DAYS)"""
+    __tablename__ = "profile_view_daily"
+    
+    startup_id = Column(String, ForeignKey("startups.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)  # UTC
+    view_type = Column(String(50), primary_key=True)
+    view_count = Column(Integer, nullable=False, default=0)
+    unique_investors = Column(Integer, nullable=False, default=0)  # HyperLogLog estimate
+    investor_sketch = Column(LargeBinary, nullable=False)  # HyperLogLog registers
+
+class RollupWatermark(Base):
+    """How far an aggregator has consumed its source table, keyset (at, id)"""
+    __tablename__ = "rollup_watermarks"
+    
+    name = Column(String(50), primary_key=True)
+    watermark_at = Column(DateTime)
+    watermark_id = Column(String)
+
 class WatchlistEntry(Base):
     __tablename__ = "watchlist_entries"
     
@@ -0,0 +1,44 @@
+"""
+Signal archival (one-off run of the signal-archiver background job)
+Moves signals older than SIGNAL_HOT_DAYS into gzip JSONL files under
+SIGNAL_ARCHIVE_DIR and prunes archives past SIGNAL_ARCHIVE_RETENTION_DAYS.
+
+Run from backend/:
+    python scripts/archive_signals.py --dry-run
+    python scripts/archive_signals.py
+    python scripts/archive_signals.py --read 2025-01 [--user <user_id>]
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from db.database import SessionLocal
+from services.signal_retention import (
+    SignalArchiver, archive_expired_signals, read_archived_signals, SIGNAL_HOT_DAYS
+)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Archive signals older than the hot window")
+    parser.add_argument("--dry-run", action="store_true", help="report how many signals would move in the first batch")
+    parser.add_argument("--read", metavar="YYYY-MM", help="print archived signals for a month")
+    parser.add_argument("--user", help="with --read, only this user's signals")
+    args = parser.parse_args()
+
+    if args.read:
+        for row in read_archived_signals(args.read, user_id=args.user):
+            print(json.dumps(row))
+    elif args.dry_run:
+        db = SessionLocal()
+        try:
+            count = SignalArchiver(db).archive_batch(dry_run=True)
+            print(f"{count} signals older than {SIGNAL_HOT_DAYS} days in the first batch")
+        finally:
+            db.close()
+    else:
+        moved = archive_expired_signals(max_batches=1000)
+        print(f"Archived {moved} signals")
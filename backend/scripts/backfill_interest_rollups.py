@@ -0,0 +1,46 @@
+"""
+Backfill: market interest rollups
+Rebuilds startup_interest_rollups for the current window from investor_interests.
+Run once after deploying the rollup tables (the API keeps them current afterwards).
+
+Run from backend/:
+    python scripts/backfill_interest_rollups.py
+"""
+
+import os
+import sys
+from collections import Counter
+from datetime import datetime
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from db.database import SessionLocal, engine
+from models import models
+from models.models import InvestorInterest, StartupInterestRollup
+from services.interest_rollup import hour_bucket, window_start
+
+
+def backfill():
+    models.Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        buckets = Counter()
+        rows = db.query(InvestorInterest.startup_id, InvestorInterest.created_at).filter(
+            InvestorInterest.created_at >= window_start(datetime.utcnow())
+        ).yield_per(5000)
+        for startup_id, created_at in rows:
+            buckets[(startup_id, hour_bucket(created_at))] += 1
+
+        db.query(StartupInterestRollup).delete(synchronize_session=False)
+        db.bulk_insert_mappings(StartupInterestRollup, [
+            {"startup_id": startup_id, "bucket_start": bucket_start, "interest_count": count}
+            for (startup_id, bucket_start), count in buckets.items()
+        ])
+        db.commit()
+        print(f"Rebuilt {len(buckets)} hourly buckets")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    backfill()
@@ -0,0 +1,104 @@
+"""
+Login storm benchmark
+
+Fires a burst of concurrent logins at the API (in-process, via httpx's ASGI
+transport) while probing /health, and reports login throughput plus the
+latency distribution of the non-auth probe.
+
+Run from backend/:
+    python scripts/bench_login_storm.py --logins 200 --concurrency 50
+    python scripts/bench_login_storm.py --inline   # hash on the event loop (old behaviour)
+
+Requires httpx (pip install httpx).
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+# Point the app at a throwaway database before anything imports db.database
+_tmp_dir = tempfile.mkdtemp(prefix="login_storm_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp_dir, 'bench.db')}"
+
+import httpx
+
+EMAIL = "storm@example.com"
+PASSWORD = "storm-password"
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+async def run(logins: int, concurrency: int, inline: bool):
+    import main
+    from api import auth
+    from db.database import SessionLocal
+    from models.models import User, UserRole
+
+    if inline:
+        # Reproduce the old behaviour: pbkdf2 runs directly on the event loop
+        async def verify_inline(plain, hashed):
+            return auth.verify_password(plain, hashed)
+        auth.verify_password_async = verify_inline
+
+    db = SessionLocal()
+    db.add(User(email=EMAIL, password_hash=auth.get_password_hash(PASSWORD), role=UserRole.INVESTOR))
+    db.commit()
+    db.close()
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        semaphore = asyncio.Semaphore(concurrency)
+        login_latencies = []
+        probe_latencies = []
+        storm_done = asyncio.Event()
+
+        async def login_once():
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.post("/api/auth/login", json={"email": EMAIL, "password": PASSWORD})
+                login_latencies.append(time.perf_counter() - start)
+                assert response.status_code == 200, response.text
+
+        async def probe():
+            while not storm_done.is_set():
+                start = time.perf_counter()
+                await client.get("/health")
+                probe_latencies.append(time.perf_counter() - start)
+                await asyncio.sleep(0.005)
+
+        probe_task = asyncio.create_task(probe())
+        start = time.perf_counter()
+        try:
+            await asyncio.gather(*(login_once() for _ in range(logins)))
+        finally:
+            elapsed = time.perf_counter() - start
+            storm_done.set()
+            await probe_task
+
+    mode = "inline (event loop)" if inline else f"worker pool ({auth.PASSWORD_HASH_WORKERS} threads)"
+    print(f"\nLogin storm: {logins} logins, concurrency {concurrency}, hashing: {mode}")
+    print("=" * 70)
+    print(f"   Login throughput:  {logins / elapsed:.1f} logins/sec ({elapsed:.2f}s total)")
+    print(f"   Login p50 / p99:   {percentile(login_latencies, 50) * 1000:.1f} ms / {percentile(login_latencies, 99) * 1000:.1f} ms")
+    print(f"   /health probes:    {len(probe_latencies)}")
+    print(f"   /health p50 / p99: {percentile(probe_latencies, 50) * 1000:.1f} ms / {percentile(probe_latencies, 99) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark concurrent logins")
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--inline", action="store_true", help="hash on the event loop for comparison")
+    args = parser.parse_args()
+    asyncio.run(run(args.logins, args.concurrency, args.inline))
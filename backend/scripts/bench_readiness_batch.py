@@ -0,0 +1,111 @@
+"""
+Readiness batch scoring benchmark
+
+Times calculate_readiness_batch over --rows synthetic startups (random
+encoded columns), and the scalar calculate_readiness plus the encoder over a
+--sample of synthetic input dicts, checking that batch and scalar results are
+identical on the sample.
+
+Run from backend/:
+    python scripts/bench_readiness_batch.py --rows 1000000 --sample 20000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import numpy as np
+
+from ml.readiness_model import (
+    ABSENT, OTHER, READINESS_VOCABULARIES, EVENT_TYPE_BUCKETS, EnhancedReadinessModel,
+    encode_readiness_inputs, event_bucket_counts, readiness_batch_results
+)
+
+
+def random_columns(n: int, rng: np.random.Generator):
+    columns = {}
+    for field, vocab in READINESS_VOCABULARIES.items():
+        low = ABSENT if field == 'mau_range' else OTHER
+        columns[field] = rng.integers(low, len(vocab), n).astype(np.int8)
+    columns['timeline_event_count'] = rng.integers(0, 20, n)
+    columns['days_since_last_event'] = rng.integers(0, 400, n)
+    columns['event_diversity'] = rng.integers(0, 5, n)
+    columns['cofounder_count'] = rng.integers(0, 4, n)
+    for flag in ('full_time', 'has_next_milestone', 'is_incorporated', 'has_monetization_model',
+                 'prev_startup_exp', 'has_founder_role'):
+        columns[flag] = rng.random(n) < 0.5
+    return columns
+
+
+def random_inputs(rng: random.Random):
+    def pick(field):
+        return rng.choice(READINESS_VOCABULARIES[field] + [None, 'unknown'])
+
+    def sparse(d):
+        # Drop some keys so the scalar path's .get() defaults are exercised
+        return {k: v for k, v in d.items() if rng.random() < 0.85}
+
+    return {
+        'timeline_event_count': rng.randint(0, 20),
+        'days_since_last_event': rng.choice([0, 29, 30, 59, 60, 89, 90, 179, 180, 999]),
+        'event_types': event_bucket_counts({t: rng.randint(0, 2) for t in EVENT_TYPE_BUCKETS if rng.random() < 0.5}),
+        'team_size': pick('team_size'),
+        'traction_bucket': pick('traction_bucket'),
+        'burn_bucket': rng.choice(['low', 'medium', 'high']),
+        'founder_data': sparse({
+            'founder_role': rng.choice([None, 'CEO']),
+            'time_commitment': rng.choice(['full_time', 'part_time', None]),
+            'prev_startup_exp': rng.choice([True, False, None]),
+            'experience_years': pick('experience_years'),
+            'cofounder_count': rng.randint(0, 3),
+            'is_incorporated': rng.choice([True, False, None])
+        }),
+        'traction_data': sparse({
+            field: pick(field)
+            for field in ('mau_range', 'user_growth_rate', 'revenue_range', 'retention_level', 'revenue_status')
+        }),
+        'market_data': sparse({
+            'customer_type': pick('customer_type'),
+            'market_size': pick('market_size'),
+            'monetization_model': rng.choice([None, 'subscription']),
+            'competition_level': pick('competition_level')
+        }),
+        'roadmap_data': sparse({'next_milestone': rng.choice([None, 'Launch v2'])})
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark columnar readiness scoring")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="rows for the batch timing")
+    parser.add_argument("--sample", type=int, default=20_000, help="rows for the scalar timing and parity check")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    model = EnhancedReadinessModel()
+
+    columns = random_columns(args.rows, np.random.default_rng(args.seed))
+    start = time.perf_counter()
+    batch = model.calculate_readiness_batch(columns)
+    elapsed = time.perf_counter() - start
+    print(f"batch:  {args.rows:>9} rows in {elapsed:.3f}s  ({args.rows / elapsed:,.0f} rows/sec)")
+
+    rng = random.Random(args.seed)
+    inputs = [random_inputs(rng) for _ in range(args.sample)]
+
+    start = time.perf_counter()
+    scalar = [model.calculate_readiness(**row) for row in inputs]
+    elapsed = time.perf_counter() - start
+    print(f"scalar: {args.sample:>9} rows in {elapsed:.3f}s  ({args.sample / elapsed:,.0f} rows/sec)")
+
+    start = time.perf_counter()
+    encoded = encode_readiness_inputs(inputs)
+    elapsed = time.perf_counter() - start
+    print(f"encode: {args.sample:>9} rows in {elapsed:.3f}s  ({args.sample / elapsed:,.0f} rows/sec)")
+
+    mismatches = sum(1 for a, b in zip(scalar, readiness_batch_results(model.calculate_readiness_batch(encoded))) if a != b)
+    print(f"parity: {mismatches} mismatches in {args.sample} rows")
+    sys.exit(1 if mismatches else 0)
@@ -0,0 +1,66 @@
+"""
+Check: JSON column filters compile to the intended SQL on each dialect
+- Postgres: JSONB containment (@>), which the GIN indexes serve
+- SQLite: a json_each EXISTS subquery
+
+Needs no database; exits non-zero on a mismatch.
+
+Run from backend/:
+    python scripts/check_json_filters.py
+"""
+
+import os
+import sys
+import warnings
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from sqlalchemy import create_mock_engine
+from sqlalchemy.exc import SADeprecationWarning
+from sqlalchemy.orm import Session
+from db.json_columns import json_array_contains, json_array_nonempty
+from models.models import Investor, Startup, Story
+
+FILTERED_COLUMNS = (Startup.impact_tags, Investor.stage_focus, Investor.sector_focus, Story.related_tags)
+
+EXPECTED = {
+    "postgresql": ("@>", "::JSONB"),
+    "sqlite": ("EXISTS", "json_each("),
+}
+
+
+def compiled(dialect_name: str, clause) -> str:
+    """SQL for clause(db) on a session bound to dialect_name; deprecated operator fallbacks are errors"""
+    engine = create_mock_engine(f"{dialect_name}://", lambda *args, **kwargs: None)
+    db = Session(bind=engine)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", SADeprecationWarning)
+        try:
+            return str(clause(db).compile(dialect=engine.dialect))
+        except SADeprecationWarning as e:
+            return f"<deprecated operator: {e}>"
+
+
+def run_checks() -> bool:
+    ok = True
+    for dialect_name, fragments in EXPECTED.items():
+        for column in FILTERED_COLUMNS:
+            sql = compiled(dialect_name, lambda db: json_array_contains(db, column, "climate"))
+            missing = [fragment for fragment in fragments if fragment not in sql]
+            if missing or "LIKE" in sql:
+                print(f"❌ {dialect_name} {column}: {sql}")
+                ok = False
+            else:
+                print(f"✅ {dialect_name} {column}: contains")
+
+            sql = compiled(dialect_name, lambda db: json_array_nonempty(column))
+            if "!=" not in sql:
+                print(f"❌ {dialect_name} {column}: {sql}")
+                ok = False
+            else:
+                print(f"✅ {dialect_name} {column}: nonempty")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_checks() else 1)
@@ -0,0 +1,88 @@
+"""
+Check: investor profile views reach the founder's visibility stats
+Runs the whole path on a scratch SQLite database: investors POST
+/api/investors/interests/{id} with action "viewed" (record_profile_view),
+the rollup aggregator folds the raw views into profile_view_daily, and
+/api/startups/visibility reads them back through rollup_window. Views from
+today stay out of the delayed 7-day window.
+
+Exits non-zero on a failure.
+
+Run from backend/:
+    python scripts/check_profile_view_rollup.py
+"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+BACKEND = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'check_profile_view_rollup.db')}"
+os.environ["BACKGROUND_JOBS_ENABLED"] = "false"
+sys.path.append(BACKEND)
+
+from fastapi.testclient import TestClient
+
+import main
+from db.database import SessionLocal
+from models.models import ProfileView
+from services.profile_view_rollup import aggregate_batch
+
+client = TestClient(main.app)
+
+
+def signup(email: str, role: str) -> dict:
+    token = client.post("/api/auth/signup", json={"email": email, "password": "check", "role": role}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def run_checks() -> bool:
+    founder = signup("views-founder@example.com", "STARTUP")
+    startup_id = client.post("/api/startups/onboarding", headers=founder, json={
+        "name": "View Check", "sector": "Fintech", "stage": "Seed", "location": "Pune"
+    }).json()["id"]
+
+    investors = []
+    for i in range(3):
+        headers = signup(f"views-investor-{i}@example.com", "INVESTOR")
+        client.post("/api/investors/onboarding", headers=headers, json={
+            "name": f"Investor {i}", "type": "vc", "stage_preference": ["Seed"], "sector_interests": ["Fintech"]
+        })
+        investors.append(headers)
+
+    # Four views from three investors, then a pass that isn't a view
+    for headers in investors + investors[:1]:
+        client.post(f"/api/investors/interests/{startup_id}", headers=headers, json={"action": "viewed"})
+    client.post(f"/api/investors/interests/{startup_id}", headers=investors[1], json={"action": "passed"})
+
+    db = SessionLocal()
+    try:
+        ok = True
+        logged = db.query(ProfileView).filter(ProfileView.startup_id == startup_id).count()
+        if logged == 4:
+            print("✅ the interest POST logged each view")
+        else:
+            print(f"❌ {logged} raw views logged, expected 4")
+            ok = False
+
+        # Move them into yesterday, inside the delayed window, and add one view today
+        yesterday = datetime.utcnow() - timedelta(days=1)
+        db.query(ProfileView).update({ProfileView.viewed_at: yesterday}, synchronize_session=False)
+        db.commit()
+        client.post(f"/api/investors/interests/{startup_id}", headers=investors[2], json={"action": "viewed"})
+        aggregate_batch(db, datetime.utcnow() + timedelta(seconds=1))
+    finally:
+        db.close()
+
+    stats = client.get("/api/startups/visibility", headers=founder).json()
+    if (stats["views_last_7d"], stats["unique_investors_last_7d"]) == (4, 3):
+        print("✅ visibility stats read the rolled-up views")
+    else:
+        print(f"❌ visibility stats: {stats['views_last_7d']} views, {stats['unique_investors_last_7d']} investors; expected 4, 3")
+        ok = False
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_checks() else 1)
@@ -0,0 +1,93 @@
+"""
+Check: dashboard reads reuse the memoized readiness result across days
+On a scratch SQLite database, a founder logs an event 20 days back and reads
+/api/startups/dashboard today, tomorrow and ten days on (with the scoring
+clock moved forward). The first two reads sit in the same recency step and
+must not rescore. The third crosses the 30-day step and rescores once, and
+the read after it hits the memo that read saved.
+
+Exits non-zero on a failure.
+
+Run from backend/:
+    python scripts/check_readiness_memo.py
+"""
+
+import os
+import sys
+import tempfile
+from datetime import date, datetime, timedelta
+
+BACKEND = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'check_readiness_memo.db')}"
+os.environ["BACKGROUND_JOBS_ENABLED"] = "false"
+os.environ.pop("READINESS_MODEL_PATH", None)
+os.environ.pop("USE_ML_READINESS", None)
+sys.path.append(BACKEND)
+
+from fastapi.testclient import TestClient
+
+import main
+from ml.readiness_model import EnhancedReadinessModel
+from services import scoring_service
+
+client = TestClient(main.app)
+
+scored = []
+_calculate_readiness = EnhancedReadinessModel.calculate_readiness
+
+
+def counting_calculate_readiness(self, *args, **kwargs):
+    scored.append(kwargs.get('days_since_last_event'))
+    return _calculate_readiness(self, *args, **kwargs)
+
+
+def shift_clock(days: int):
+    """Make the scoring service's today `days` from now"""
+    class ShiftedDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime.now(tz) + timedelta(days=days)
+    scoring_service.datetime = ShiftedDatetime
+
+
+def read_dashboard(headers: dict, days_on: int) -> int:
+    """Number of rescorings a dashboard read `days_on` days from now triggered"""
+    shift_clock(days_on)
+    scored.clear()
+    response = client.get("/api/startups/dashboard", headers=headers)
+    response.raise_for_status()
+    return len(scored)
+
+
+def run_checks() -> bool:
+    token = client.post("/api/auth/signup", json={
+        "email": "memo-founder@example.com", "password": "check", "role": "STARTUP"
+    }).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    client.post("/api/startups/onboarding", headers=headers, json={
+        "name": "Memo Check", "sector": "Fintech", "stage": "Seed", "location": "Pune"
+    }).raise_for_status()
+    client.post("/api/startups/timeline/events", headers=headers, json={
+        "event_date": (date.today() - timedelta(days=20)).isoformat(),
+        "event_type": "PRODUCT", "title": "Beta launch", "confidence": "SELF_REPORTED"
+    }).raise_for_status()
+
+    EnhancedReadinessModel.calculate_readiness = counting_calculate_readiness
+    ok = True
+    for days_on, expected, label in (
+        (0, 0, "today's read hit the memo"),
+        (1, 0, "tomorrow's read hit the memo"),
+        (10, 1, "crossing the 30-day recency step rescored once"),
+        (10, 0, "the next read hit the memo that read saved"),
+    ):
+        count = read_dashboard(headers, days_on)
+        if count == expected:
+            print(f"✅ {label}")
+        else:
+            print(f"❌ {label}: rescored {count} times")
+            ok = False
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_checks() else 1)
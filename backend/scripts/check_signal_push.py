@@ -0,0 +1,165 @@
+"""
+Check: signals written by another process reach the API's feed and streams
+Starts the API (uvicorn) on a scratch SQLite database, opens an investor's
+/api/feed/stream and warms their cached feed, then writes signals from this
+process - a different process, broker and feed cache, like
+scripts/run_worker.py. Passes when the stream delivers the new signal and its
+digest bump, and /api/feed serves it without waiting for the cache TTL.
+
+Exits non-zero on a failure.
+
+Run from backend/:
+    python scripts/check_signal_push.py
+"""
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+BACKEND = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+DB_PATH = os.path.join(tempfile.mkdtemp(), "check_signal_push.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+os.environ["BACKGROUND_JOBS_ENABLED"] = "false"
+os.environ["STREAM_POLL_SECONDS"] = "0.5"
+sys.path.append(BACKEND)
+
+import requests
+
+from db.database import SessionLocal, engine
+from models import models
+from models.models import SignalSeverity, SignalType
+from services.signal_service import SignalService
+
+WAIT_SECONDS = 10
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_for(predicate, timeout: float = WAIT_SECONDS) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.2)
+    return False
+
+
+def read_stream(url: str, token: str, received: list):
+    try:
+        with requests.get(url, params={"token": token}, stream=True, timeout=WAIT_SECONDS * 3) as response:
+            for line in response.iter_lines(decode_unicode=True):
+                if line and line.startswith("data: "):
+                    received.append(json.loads(line[len("data: "):]))
+    except requests.RequestException:
+        # The server stopping ends the stream
+        pass
+
+
+def run_checks() -> bool:
+    models.Base.metadata.create_all(bind=engine)
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}/api"
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port)],
+        cwd=BACKEND, env=os.environ.copy(), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        if not wait_for(lambda: _is_up(base_url)):
+            print("❌ API did not start")
+            return False
+
+        token = requests.post(f"{base_url}/auth/signup", json={
+            "email": "stream-check@example.com", "password": "check", "role": "INVESTOR"
+        }).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        user_id = requests.get(f"{base_url}/auth/me", headers=headers).json()["id"]
+        founder_token = requests.post(f"{base_url}/auth/signup", json={
+            "email": "stream-founder@example.com", "password": "check", "role": "STARTUP"
+        }).json()["access_token"]
+        founder = {"Authorization": f"Bearer {founder_token}"}
+        startup_id = requests.post(f"{base_url}/startups/onboarding", headers=founder, json={
+            "name": "Stream Check", "sector": "Fintech", "stage": "Seed", "location": "Pune"
+        }).json()["id"]
+
+        # Warm this user's cached first page
+        requests.get(f"{base_url}/feed/", headers=headers)
+        requests.get(f"{base_url}/feed/", headers=headers)
+
+        received = []
+        threading.Thread(target=read_stream, args=(f"{base_url}/feed/stream", token, received), daemon=True).start()
+        time.sleep(1)
+
+        # Written here, not in the API process
+        db = SessionLocal()
+        try:
+            signal = SignalService(db).generate_signal(
+                user_id, "investor", SignalType.MARKET_INTEREST, SignalSeverity.MEDIUM,
+                "Cross-process signal", "written outside the API", "check", startup_id=startup_id
+            )
+            signal_id = signal.id
+        finally:
+            db.close()
+
+        ok = True
+        if wait_for(lambda: any(item["id"] == signal_id for item in received)):
+            print("✅ stream delivered a signal written by another process")
+        else:
+            print("❌ stream never delivered the signal")
+            ok = False
+
+        feed = requests.get(f"{base_url}/feed/", headers=headers).json()
+        if [item["id"] for item in feed] == [signal_id]:
+            print("✅ cached feed picked up the signal without waiting for the TTL")
+        else:
+            print(f"❌ feed served {feed}")
+            ok = False
+
+        # A repeat within the digest window bumps the same row
+        db = SessionLocal()
+        try:
+            SignalService(db).generate_signal(
+                user_id, "investor", SignalType.MARKET_INTEREST, SignalSeverity.MEDIUM,
+                "Cross-process signal", "again", "check", startup_id=startup_id
+            )
+        finally:
+            db.close()
+        if wait_for(lambda: any(item["id"] == signal_id and item["occurrence_count"] == 2 for item in received)):
+            print("✅ stream delivered the digest bump")
+        else:
+            print("❌ stream never delivered the digest bump")
+            ok = False
+
+        if len([item for item in received if item["id"] == signal_id]) == 2:
+            print("✅ each change was delivered once")
+        else:
+            print(f"❌ deliveries: {received}")
+            ok = False
+        return ok
+    finally:
+        # Open streams hold up uvicorn's graceful shutdown
+        server.terminate()
+        try:
+            server.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            server.kill()
+            server.wait()
+
+
+def _is_up(base_url: str) -> bool:
+    try:
+        return requests.get(base_url.rsplit("/api", 1)[0] + "/", timeout=1).ok
+    except requests.RequestException:
+        return False
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_checks() else 1)
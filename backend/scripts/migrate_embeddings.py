@@ -0,0 +1,120 @@
+"""
+Migration: text embeddings for pattern similarity
+- Adds startups.description_embedding (packed float32) and the
+  description_embedding_model / thesis_embedding_model version tags
+- Converts investors.thesis_embedding from JSON text vectors to packed
+  float32, keeping vectors of the right size and dropping the rest
+- Backfills startup description and investor thesis embeddings that are
+  missing or from another EMBEDDING_MODEL_VERSION (all of them with --all)
+
+Safe to re-run.
+
+Run from backend/:
+    python scripts/migrate_embeddings.py
+    python scripts/migrate_embeddings.py --all
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from sqlalchemy import LargeBinary, inspect, or_, text
+from db.database import SessionLocal, engine
+from models.models import Investor, Startup
+from ml.embeddings import EMBEDDING_DIM, EMBEDDING_MODEL_VERSION, pack_embedding
+from services.embedding_index import embed_investors, embed_startups
+
+CHUNK = 1000
+
+# The only model that ever wrote untagged vectors (JSON or packed)
+UNTAGGED_MODEL = "hash512-v1"
+
+
+def convert_json_thesis_embeddings(conn, blob_type: str) -> int:
+    """Rewrite investors.thesis_embedding as a binary column; returns vectors kept"""
+    column = next(col for col in inspect(conn).get_columns('investors') if col['name'] == 'thesis_embedding')
+    if isinstance(column['type'], LargeBinary):
+        return 0
+
+    print("Converting investors.thesis_embedding from JSON to packed float32...")
+    conn.execute(text(f"ALTER TABLE investors ADD COLUMN thesis_embedding_packed {blob_type}"))
+    converted = []
+    for investor_id, raw in conn.execute(text(
+        "SELECT id, thesis_embedding FROM investors WHERE thesis_embedding IS NOT NULL"
+    )):
+        try:
+            vector = json.loads(raw)
+        except ValueError:
+            continue
+        if isinstance(vector, list) and len(vector) == EMBEDDING_DIM:
+            converted.append({"id": investor_id, "packed": pack_embedding(vector), "model": UNTAGGED_MODEL})
+    for i in range(0, len(converted), CHUNK):
+        conn.execute(text(
+            "UPDATE investors SET thesis_embedding_packed = :packed, thesis_embedding_model = :model WHERE id = :id"
+        ), converted[i:i + CHUNK])
+    conn.execute(text("ALTER TABLE investors DROP COLUMN thesis_embedding"))
+    conn.execute(text("ALTER TABLE investors RENAME COLUMN thesis_embedding_packed TO thesis_embedding"))
+    return len(converted)
+
+
+def backfill(db, model, version_column, embed, recompute_all: bool) -> int:
+    """Embed CHUNK rows at a time in id order; returns rows embedded"""
+    done, after_id = 0, None
+    while True:
+        query = db.query(model)
+        if not recompute_all:
+            query = query.filter(or_(version_column.is_(None), version_column != EMBEDDING_MODEL_VERSION))
+        if after_id is not None:
+            query = query.filter(model.id > after_id)
+        rows = query.order_by(model.id).limit(CHUNK).all()
+        if not rows:
+            return done
+        embed(rows)
+        after_id = rows[-1].id
+        done += len(rows)
+        db.commit()
+
+
+def migrate(recompute_all: bool = False):
+    columns = [col['name'] for col in inspect(engine).get_columns('startups')]
+    investor_columns = [col['name'] for col in inspect(engine).get_columns('investors')]
+    column_type = Startup.__table__.c.description_embedding.type.compile(dialect=engine.dialect)
+
+    with engine.begin() as conn:
+        if 'description_embedding' not in columns:
+            print("Adding 'description_embedding' column to startups...")
+            conn.execute(text(f"ALTER TABLE startups ADD COLUMN description_embedding {column_type}"))
+
+        if 'description_embedding_model' not in columns:
+            print("Adding 'description_embedding_model' column to startups...")
+            conn.execute(text("ALTER TABLE startups ADD COLUMN description_embedding_model VARCHAR(32)"))
+            conn.execute(text(
+                "UPDATE startups SET description_embedding_model = :model WHERE description_embedding IS NOT NULL"
+            ), {"model": UNTAGGED_MODEL})
+
+        if 'thesis_embedding_model' not in investor_columns:
+            print("Adding 'thesis_embedding_model' column to investors...")
+            conn.execute(text("ALTER TABLE investors ADD COLUMN thesis_embedding_model VARCHAR(32)"))
+
+        kept = convert_json_thesis_embeddings(conn, column_type)
+        if kept:
+            print(f"Converted {kept} JSON thesis embeddings")
+
+    db = SessionLocal()
+    try:
+        startups = backfill(db, Startup, Startup.description_embedding_model, embed_startups, recompute_all)
+        investors = backfill(db, Investor, Investor.thesis_embedding_model, embed_investors, recompute_all)
+        print(f"Embedded {startups} startups and {investors} investors")
+    finally:
+        db.close()
+
+    print("Migration completed successfully!")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Add and backfill text embeddings")
+    parser.add_argument("--all", action="store_true", help="recompute every embedding, not just missing ones")
+    migrate(parser.parse_args().all)
@@ -0,0 +1,94 @@
+"""
+Migration: native JSON columns
+- Normalizes the JSON-text columns below: empty strings and 'null' become
+  NULL, double-encoded documents are unwrapped, and text that isn't JSON is
+  kept as a JSON string
+- On Postgres, converts them to JSONB and adds the GIN indexes declared on
+  the models (SQLite keeps its TEXT storage; only the values are normalized)
+
+Safe to re-run.
+
+Run from backend/:
+    python scripts/migrate_json_columns.py
+"""
+
+import json
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from sqlalchemy import inspect, text
+from sqlalchemy.dialects.postgresql import JSONB
+from db.database import engine
+from models.models import Investor, OutboxEvent, Startup, StartupTimelineStats, Story
+
+JSON_COLUMNS = {
+    Investor: ("stage_focus", "sector_focus", "region_focus", "portfolio_companies"),
+    Startup: ("impact_tags", "metrics", "readiness_cache"),
+    Story: ("content", "related_tags"),
+    StartupTimelineStats: ("event_type_counts",),
+    OutboxEvent: ("payload",),
+}
+
+CHUNK = 1000
+
+
+def normalized(raw: str, nullable: bool):
+    """JSON text to store for a legacy value (None for SQL NULL), or raw itself if already fine"""
+    if not raw.strip() or raw.strip() == "null":
+        return None if nullable else json.dumps("")
+    try:
+        value = json.loads(raw)
+    except ValueError:
+        return json.dumps(raw)
+    if isinstance(value, str):
+        try:
+            inner = json.loads(value)
+        except ValueError:
+            return raw
+        if isinstance(inner, (list, dict)):
+            return json.dumps(inner)
+    return raw
+
+
+def normalize_column(conn, table: str, key: str, column: str, nullable: bool) -> int:
+    fixes = []
+    for row_id, raw in conn.execute(text(f"SELECT {key}, {column} FROM {table} WHERE {column} IS NOT NULL")):
+        fixed = normalized(raw, nullable)
+        if fixed != raw:
+            fixes.append({"id": row_id, "value": fixed})
+    for i in range(0, len(fixes), CHUNK):
+        conn.execute(text(f"UPDATE {table} SET {column} = :value WHERE {key} = :id"), fixes[i:i + CHUNK])
+    return len(fixes)
+
+
+def migrate():
+    postgres = engine.dialect.name == "postgresql"
+
+    for model, columns in JSON_COLUMNS.items():
+        table = model.__tablename__
+        key = model.__table__.primary_key.columns.values()[0].name
+        existing = {col['name']: col for col in inspect(engine).get_columns(table)}
+        with engine.begin() as conn:
+            for column in columns:
+                if column not in existing or isinstance(existing[column]['type'], JSONB):
+                    continue
+                fixed = normalize_column(conn, table, key, column, model.__table__.c[column].nullable)
+                if fixed:
+                    print(f"Normalized {fixed} values in {table}.{column}")
+                if postgres:
+                    print(f"Converting {table}.{column} to JSONB...")
+                    conn.execute(text(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE JSONB USING {column}::jsonb"))
+
+        if postgres:
+            for index in model.__table__.indexes:
+                if index.dialect_options["postgresql"]["using"] == "gin":
+                    print(f"Creating index {index.name}...")
+                    index.create(bind=engine, checkfirst=True)
+
+    print("Migration completed successfully!")
+
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,58 @@
+"""
+Migration: structured pass reasons
+- Adds investor_interests.pass_reason (PassReason enum) and
+  ix_investor_interests_startup_pass_reason
+- Backfills it from 'passed_<reason>' actions; unrecognized reasons become OTHER
+
+Safe to re-run.
+
+Run from backend/:
+    python scripts/migrate_pass_reason.py
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from sqlalchemy import func, inspect, text
+from db.database import SessionLocal, engine
+from models.models import InvestorInterest, PassReason
+
+
+def migrate():
+    columns = [col['name'] for col in inspect(engine).get_columns('investor_interests')]
+    column = InvestorInterest.__table__.c.pass_reason
+
+    with engine.begin() as conn:
+        if 'pass_reason' not in columns:
+            print("Adding 'pass_reason' column to investor_interests...")
+            # Creates the native enum type on Postgres; no-op elsewhere
+            column.type.create(bind=conn, checkfirst=True)
+            conn.execute(text(f"ALTER TABLE investor_interests ADD COLUMN pass_reason {column.type.compile(dialect=engine.dialect)}"))
+
+    for index in InvestorInterest.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
+
+    db = SessionLocal()
+    try:
+        backfilled = 0
+        for reason in PassReason:
+            backfilled += db.query(InvestorInterest).filter(
+                InvestorInterest.pass_reason.is_(None),
+                func.lower(InvestorInterest.action) == f"passed_{reason.value}"
+            ).update({InvestorInterest.pass_reason: reason}, synchronize_session=False)
+        backfilled += db.query(InvestorInterest).filter(
+            InvestorInterest.pass_reason.is_(None),
+            func.lower(InvestorInterest.action).like("passed\\_%", escape="\\")
+        ).update({InvestorInterest.pass_reason: PassReason.OTHER}, synchronize_session=False)
+        db.commit()
+        print(f"Backfilled pass_reason on {backfilled} rows")
+    finally:
+        db.close()
+
+    print("Migration completed successfully!")
+
+
+if __name__ == "__main__":
+    migrate()
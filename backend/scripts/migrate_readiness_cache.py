@@ -0,0 +1,37 @@
+"""
+Migration: memoized readiness results
+- Adds startups.readiness_fingerprint and startups.readiness_cache
+
+Safe to re-run.
+
+Run from backend/:
+    python scripts/migrate_readiness_cache.py
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from sqlalchemy import inspect, text
+from db.database import engine
+
+
+def migrate():
+    json_type = "JSONB" if engine.dialect.name == "postgresql" else "JSON"
+    columns = [col['name'] for col in inspect(engine).get_columns('startups')]
+
+    with engine.begin() as conn:
+        if 'readiness_fingerprint' not in columns:
+            print("Adding 'readiness_fingerprint' column to startups...")
+            conn.execute(text("ALTER TABLE startups ADD COLUMN readiness_fingerprint VARCHAR(64)"))
+
+        if 'readiness_cache' not in columns:
+            print("Adding 'readiness_cache' column to startups...")
+            conn.execute(text(f"ALTER TABLE startups ADD COLUMN readiness_cache {json_type}"))
+
+    print("Migration completed successfully!")
+
+
+if __name__ == "__main__":
+    migrate()
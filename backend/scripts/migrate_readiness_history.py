@@ -0,0 +1,42 @@
+"""
+Migration: readiness history
+- Adds readiness_scores.resolution (raw / daily / weekly)
+- Adds the (startup_id, calculated_at) index the history endpoint reads
+- Runs one downsampling pass so existing history is compacted
+
+Safe to re-run.
+
+Run from backend/:
+    python scripts/migrate_readiness_history.py
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from sqlalchemy import inspect, text
+from db.database import engine
+from models.models import ReadinessScore
+
+
+def migrate():
+    columns = [col['name'] for col in inspect(engine).get_columns('readiness_scores')]
+
+    with engine.begin() as conn:
+        if 'resolution' not in columns:
+            print("Adding 'resolution' column to readiness_scores...")
+            conn.execute(text("ALTER TABLE readiness_scores ADD COLUMN resolution VARCHAR(10) NOT NULL DEFAULT 'raw'"))
+
+    for index in ReadinessScore.__table__.indexes:
+        print(f"Creating index {index.name}...")
+        index.create(bind=engine, checkfirst=True)
+
+    from services.readiness_history import downsample_readiness_history
+    print(f"Downsampled readiness history ({downsample_readiness_history()} points removed)")
+
+    print("Migration completed successfully!")
+
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,36 @@
+"""
+Migration: signal digests
+- Adds signal_events.occurrence_count (default 1) and signal_events.last_occurred_at
+
+Safe to re-run.
+
+Run from backend/:
+    python scripts/migrate_signal_digest.py
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from sqlalchemy import inspect, text
+from db.database import engine
+
+
+def migrate():
+    columns = [col['name'] for col in inspect(engine).get_columns('signal_events')]
+
+    with engine.begin() as conn:
+        if 'occurrence_count' not in columns:
+            print("Adding 'occurrence_count' column to signal_events...")
+            conn.execute(text("ALTER TABLE signal_events ADD COLUMN occurrence_count INTEGER NOT NULL DEFAULT 1"))
+
+        if 'last_occurred_at' not in columns:
+            print("Adding 'last_occurred_at' column to signal_events...")
+            conn.execute(text("ALTER TABLE signal_events ADD COLUMN last_occurred_at TIMESTAMP"))
+
+    print("Migration completed successfully!")
+
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,59 @@
+"""
+Migration: signal feed keyset pagination
+- Adds signal_events.severity_rank (LOW=1, MEDIUM=2, HIGH=3) and backfills it
+- Normalizes SQLite created_at text to one format so keyset cursors compare correctly
+- Creates the feed indexes
+
+Safe to re-run (e.g. after seeding signals with raw SQL).
+
+Run from backend/:
+    python scripts/migrate_signal_feed.py
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from sqlalchemy import inspect, text
+from db.database import engine
+from models.models import SignalEvent
+
+
+def migrate():
+    columns = [col['name'] for col in inspect(engine).get_columns('signal_events')]
+
+    with engine.begin() as conn:
+        if 'severity_rank' not in columns:
+            print("Adding 'severity_rank' column to signal_events...")
+            conn.execute(text("ALTER TABLE signal_events ADD COLUMN severity_rank INTEGER NOT NULL DEFAULT 1"))
+
+        print("Backfilling severity_rank...")
+        conn.execute(text("""
+            UPDATE signal_events
+            SET severity_rank = CASE UPPER(CAST(severity AS VARCHAR))
+                WHEN 'HIGH' THEN 3
+                WHEN 'MEDIUM' THEN 2
+                ELSE 1
+            END
+        """))
+
+        if engine.dialect.name == "sqlite":
+            # Rows written by CURRENT_TIMESTAMP or isoformat() differ from SQLAlchemy's
+            # 'YYYY-MM-DD HH:MM:SS.ffffff' storage format and would break cursor comparisons
+            print("Normalizing created_at timestamps...")
+            conn.execute(text("""
+                UPDATE signal_events
+                SET created_at = strftime('%Y-%m-%d %H:%M:%f', created_at) || '000'
+                WHERE created_at IS NOT NULL AND created_at NOT LIKE '____-__-__ __:__:__.______'
+            """))
+
+    for index in SignalEvent.__table__.indexes:
+        print(f"Ensuring index {index.name}...")
+        index.create(bind=engine, checkfirst=True)
+
+    print("Migration completed successfully!")
+
+
+if __name__ == "__main__":
+    migrate()
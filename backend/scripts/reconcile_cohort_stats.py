@@ -0,0 +1,36 @@
+"""
+Cohort score histogram reconciliation
+Rebuilds cohort_score_buckets from a grouped scan of startups and reports
+drift. The first run initializes the histograms.
+
+Run from backend/:
+    python scripts/reconcile_cohort_stats.py --check   # report only
+    python scripts/reconcile_cohort_stats.py           # report and repair
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from db.database import SessionLocal, engine
+from models import models
+from services.cohort_stats import reconcile_buckets
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Verify cohort_score_buckets against a full recompute")
+    parser.add_argument("--check", action="store_true", help="report drift without repairing")
+    args = parser.parse_args()
+
+    models.Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        drift = reconcile_buckets(db, repair=not args.check)
+    finally:
+        db.close()
+
+    for (sector, stage, score), (stored, expected) in sorted(drift.items()):
+        print(f"   {sector or '-'}/{stage or '-'} score {score}: stored {stored} expected {expected}")
+    print(f"{len(drift)} drifted buckets" + ("" if args.check else " (repaired)"))
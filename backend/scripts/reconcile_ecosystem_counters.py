@@ -0,0 +1,36 @@
+"""
+Ecosystem counter reconciliation
+Recomputes ecosystem_counters from a full scan of startups and introductions
+and reports drift. The first run initializes the counters.
+
+Run from backend/:
+    python scripts/reconcile_ecosystem_counters.py --check   # report only
+    python scripts/reconcile_ecosystem_counters.py           # report and repair
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from db.database import SessionLocal, engine
+from models import models
+from services.ecosystem_counters import reconcile_counters
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Verify ecosystem_counters against a full recompute")
+    parser.add_argument("--check", action="store_true", help="report drift without repairing")
+    args = parser.parse_args()
+
+    models.Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        drift = reconcile_counters(db, repair=not args.check)
+    finally:
+        db.close()
+
+    for (dimension, key), (stored, expected) in sorted(drift.items()):
+        print(f"   {dimension}/{key}: stored {stored} expected {expected}")
+    print(f"{len(drift)} drifted keys" + ("" if args.check else " (repaired)"))
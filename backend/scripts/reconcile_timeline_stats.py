@@ -0,0 +1,37 @@
+"""
+Timeline stats reconciliation (one-off run of the timeline-stats-reconcile background job)
+Rebuilds startup_timeline_stats from one scan of timeline_events, creating
+missing rows (e.g. the first run on an existing database) and reporting drift.
+
+Run from backend/:
+    python scripts/reconcile_timeline_stats.py --check   # report only
+    python scripts/reconcile_timeline_stats.py           # report and repair
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from db.database import SessionLocal, engine
+from models import models
+from services.timeline_stats import reconcile_timeline_stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Verify startup_timeline_stats against the timeline")
+    parser.add_argument("--check", action="store_true", help="report drift without repairing")
+    args = parser.parse_args()
+
+    models.Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        missing, drifted = reconcile_timeline_stats(db, repair=not args.check)
+    finally:
+        db.close()
+
+    for startup_id in drifted:
+        print(f"   {startup_id}: drifted")
+    suffix = "" if args.check else " (repaired)"
+    print(f"{len(missing)} missing rows, {len(drifted)} drifted rows{suffix}")
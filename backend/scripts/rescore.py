@@ -0,0 +1,197 @@
+"""
+Offline full-catalog readiness rescore
+
+Streams startups in id order, CHUNK at a time, with one grouped timeline
+aggregate query per chunk, and scores each chunk with ScoringService's
+readiness model in a process pool (columnar batch path where the model
+has one). Startups whose score, band or sub-scores changed get their Startup
+columns bulk-updated and a ReadinessScore history row.
+
+Progress is checkpointed in rollup_watermarks ('rescore') in the same
+transaction as each chunk's writes; --resume continues after the last
+committed chunk. Bulk updates bypass the ORM listeners, so the ecosystem
+counters and cohort histograms are reconciled at the end.
+
+Run from backend/:
+    python scripts/rescore.py --workers 4 --chunk 2000
+    python scripts/rescore.py --resume
+    python scripts/rescore.py --dry-run     # score and report, write nothing
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from sqlalchemy import func, insert, update
+
+from db.database import SessionLocal, engine
+from db.upsert import insert_ignore_duplicates
+from ml.readiness_model import encode_readiness_inputs, readiness_batch_results
+from models import models
+from models.models import Startup, TimelineEvent, ReadinessScore, ReadinessBand, RollupWatermark
+from services.scoring_service import ScoringService, READINESS_INPUT_FIELDS
+
+CHECKPOINT = "rescore"
+
+SCORE_FIELDS = ('execution_score', 'traction_score', 'market_score', 'team_score', 'capital_efficiency_score')
+
+_service = None
+
+
+def _init_worker():
+    global _service
+    _service = ScoringService()
+
+
+def score_chunk(inputs):
+    """Worker: readiness results for a list of calculate_readiness kwargs"""
+    service = _service or ScoringService()
+    if hasattr(service.readiness_model, "calculate_readiness_batch"):
+        return readiness_batch_results(service.readiness_model.calculate_readiness_batch(encode_readiness_inputs(inputs)))
+    return [service.readiness_model.calculate_readiness(**row) for row in inputs]
+
+
+def read_chunk(db, service, after_id, chunk_size, today):
+    """Next chunk of (startup id, stored scores, readiness inputs) after after_id"""
+    query = db.query(
+        Startup.id, Startup.readiness_score, Startup.readiness_band,
+        *(getattr(Startup, field) for field in SCORE_FIELDS + READINESS_INPUT_FIELDS)
+    )
+    if after_id is not None:
+        query = query.filter(Startup.id > after_id)
+    rows = query.order_by(Startup.id).limit(chunk_size).all()
+    if not rows:
+        return []
+
+    aggregates = {}
+    for startup_id, event_type, count, last_date in db.query(
+        TimelineEvent.startup_id, TimelineEvent.event_type, func.count(TimelineEvent.id), func.max(TimelineEvent.event_date)
+    ).filter(
+        TimelineEvent.startup_id.in_([row.id for row in rows])
+    ).group_by(TimelineEvent.startup_id, TimelineEvent.event_type):
+        total, by_type, latest = aggregates.get(startup_id, (0, {}, None))
+        by_type[event_type.value] = count
+        latest = last_date if latest is None or (last_date is not None and last_date > latest) else latest
+        aggregates[startup_id] = (total + count, by_type, latest)
+
+    chunk = []
+    for row in rows:
+        event_count, by_type, last_date = aggregates.get(row.id, (0, {}, None))
+        stored = (row.readiness_score, row.readiness_band.value if row.readiness_band else None,
+                  *(getattr(row, field) for field in SCORE_FIELDS))
+        chunk.append((row.id, stored, service.readiness_inputs_from_aggregates(row, event_count, by_type, last_date, today)))
+    return chunk
+
+
+def write_chunk(db, chunk, results, dry_run):
+    """Bulk-write changed scores and advance the checkpoint; returns the number changed"""
+    updates, history = [], []
+    for (startup_id, stored, _), result in zip(chunk, results):
+        if stored == (result['score'], result['band'], *(result[field] for field in SCORE_FIELDS)):
+            continue
+        updates.append({
+            "id": startup_id,
+            "readiness_score": result['score'],
+            "readiness_band": ReadinessBand(result['band']),
+            **{field: result[field] for field in SCORE_FIELDS}
+        })
+        history.append({
+            "startup_id": startup_id,
+            "score": result['score'],
+            "confidence_band": 10,
+            **{field: result[field] for field in SCORE_FIELDS}
+        })
+    if dry_run:
+        return len(updates)
+
+    if updates:
+        db.execute(update(Startup), updates)
+        db.execute(insert(ReadinessScore), history)
+    checkpoint = db.get(RollupWatermark, CHECKPOINT)
+    checkpoint.watermark_at = datetime.utcnow()
+    checkpoint.watermark_id = chunk[-1][0]
+    db.commit()
+    return len(updates)
+
+
+def reconcile_aggregates(db):
+    from services.ecosystem_counters import reconcile_counters
+    from services.cohort_stats import reconcile_buckets
+
+    print(f"Reconciled ecosystem counters ({len(reconcile_counters(db))} drifted keys)")
+    print(f"Reconciled cohort histograms ({len(reconcile_buckets(db))} drifted buckets)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rescore every startup's readiness")
+    parser.add_argument("--chunk", type=int, default=2000, help="startups per chunk")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="scoring processes (0 = in-process)")
+    parser.add_argument("--resume", action="store_true", help="continue after the last committed chunk")
+    parser.add_argument("--dry-run", action="store_true", help="score and count changes without writing")
+    parser.add_argument("--no-reconcile", action="store_true", help="skip the counter/histogram reconcile")
+    args = parser.parse_args()
+
+    models.Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    service = ScoringService()
+    today = datetime.now().date()
+
+    after_id = None
+    if not args.dry_run:
+        insert_ignore_duplicates(db, RollupWatermark, [{"name": CHECKPOINT}], index_elements=["name"])
+        checkpoint = db.get(RollupWatermark, CHECKPOINT)
+        if args.resume and checkpoint.watermark_id:
+            after_id = checkpoint.watermark_id
+            print(f"Resuming after startup {after_id} (checkpoint {checkpoint.watermark_at})")
+        else:
+            checkpoint.watermark_at, checkpoint.watermark_id = None, None
+        db.commit()
+
+    pool = ProcessPoolExecutor(args.workers, initializer=_init_worker) if args.workers > 0 else None
+    in_flight = deque()
+    scored = changed = 0
+    started = time.perf_counter()
+
+    def drain_one():
+        nonlocal scored, changed
+        chunk, future = in_flight.popleft()
+        results = future.result() if pool else future
+        changed += write_chunk(db, chunk, results, args.dry_run)
+        scored += len(chunk)
+        elapsed = time.perf_counter() - started
+        print(f"   {scored} scored, {changed} changed  ({scored / elapsed:,.0f} startups/sec)")
+
+    try:
+        while True:
+            chunk = read_chunk(db, service, after_id, args.chunk, today)
+            if not chunk:
+                break
+            after_id = chunk[-1][0]
+            inputs = [row_inputs for _, _, row_inputs in chunk]
+            in_flight.append((chunk, pool.submit(score_chunk, inputs) if pool else score_chunk(inputs)))
+            # Keep the pool busy while bounding memory; write in order so the checkpoint is a prefix
+            if len(in_flight) > max(1, args.workers) * 2:
+                drain_one()
+        while in_flight:
+            drain_one()
+    finally:
+        if pool:
+            pool.shutdown(cancel_futures=True)
+
+    elapsed = time.perf_counter() - started
+    print(f"Rescored {scored} startups in {elapsed:.1f}s ({scored / max(elapsed, 1e-9):,.0f} startups/sec); "
+          f"{changed} changed" + (" (dry run, nothing written)" if args.dry_run else ""))
+
+    if changed and not args.dry_run and not args.no_reconcile:
+        reconcile_aggregates(db)
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
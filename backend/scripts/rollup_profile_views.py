@@ -0,0 +1,33 @@
+"""
+Profile view rollup (one-off run of the profile-view-rollup background job)
+Creates ix_profile_views_viewed_at on existing databases, then folds every raw
+profile view older than PROFILE_VIEW_ROLLUP_LAG_SECONDS into profile_view_daily
+and compacts raw rows past PROFILE_VIEW_RAW_RETENTION_DAYS. The first run
+backfills the rollup from all existing raw rows.
+
+Run from backend/:
+    python scripts/rollup_profile_views.py
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from db.database import engine
+from models import models
+from models.models import ProfileView
+from services.profile_view_rollup import run_profile_view_rollup
+
+
+if __name__ == "__main__":
+    models.Base.metadata.create_all(bind=engine)
+    for index in ProfileView.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
+    total = 0
+    while True:
+        handled = run_profile_view_rollup()
+        total += handled
+        if not handled:
+            break
+    print(f"Rolled up {total} profile views")
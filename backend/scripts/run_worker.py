@@ -0,0 +1,35 @@
+"""
+Standalone background worker
+Runs the outbox dispatcher and other periodic jobs outside the API process.
+Run exactly one per deployment; API processes leave the jobs to it unless
+BACKGROUND_JOBS_ENABLED=true. Signals it writes reach the API's cached feeds
+and open streams through the per-user feed version row, so it needs no other
+channel to the API processes.
+
+Run from backend/:
+    python scripts/run_worker.py
+"""
+
+import os
+import sys
+import time
+import logging
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from db.database import engine
+from models import models
+from services.background_jobs import register_default_jobs, start_background_jobs, stop_background_jobs
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    models.Base.metadata.create_all(bind=engine)
+
+    register_default_jobs()
+    start_background_jobs()
+    print("Worker running. Ctrl+C to stop.")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        stop_background_jobs()
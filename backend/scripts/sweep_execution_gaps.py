@@ -0,0 +1,27 @@
+"""
+Execution gap sweep (one-off run of the execution-gap-sweeper background job)
+Creates ix_timeline_events_startup_date on existing databases, then raises an
+alarm for every startup whose last timeline event (or, without events, whose
+creation) is older than EXECUTION_GAP_THRESHOLD_DAYS. Already-alarmed gaps are
+skipped.
+
+Run from backend/:
+    python scripts/sweep_execution_gaps.py
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from db.database import engine
+from models import models
+from models.models import TimelineEvent
+from services.execution_gap_sweeper import sweep_execution_gaps
+
+
+if __name__ == "__main__":
+    models.Base.metadata.create_all(bind=engine)
+    for index in TimelineEvent.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
+    print(f"Raised {sweep_execution_gaps()} execution gap alarms")
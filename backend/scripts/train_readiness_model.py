@@ -0,0 +1,137 @@
+"""
+Train the readiness model
+
+Builds one labeled row per startup with a resolved introduction: positive if
+any introduction reached TERM_SHEET (as of the first one), negative if all
+resolved ones passed, ghosted, were declined or expired (as of the latest).
+Timeline features only count events up to that date; profile fields are the
+startup's current values. Trains a GradientBoostingClassifier on CPU, reports
+holdout metrics, refits on every row and saves a versioned artifact.
+
+Serve it by pointing READINESS_MODEL_PATH at the artifact.
+
+Run from backend/:
+    python scripts/train_readiness_model.py --output ml/artifacts/readiness-gb.joblib
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import numpy as np
+from sklearn.ensemble import GradientBoostingClassifier
+from sklearn.metrics import average_precision_score, roc_auc_score
+from sklearn.model_selection import train_test_split
+
+from db.database import SessionLocal
+from ml.readiness_model import encode_readiness_inputs
+from ml.trained_readiness_model import readiness_feature_matrix, save_readiness_artifact
+from models.models import Introduction, IntroductionOutcome, IntroductionStatus, Startup, TimelineEvent
+from services.scoring_service import ScoringService
+
+CHUNK = 500
+
+
+def resolved_labels(db):
+    """startup id -> (label, as-of datetime) from resolved introductions"""
+    labels = {}
+    for startup_id, status, outcome, requested_at, responded_at in db.query(
+        Introduction.startup_id, Introduction.status, Introduction.outcome,
+        Introduction.requested_at, Introduction.responded_at
+    ).filter(Introduction.startup_id.isnot(None)):
+        positive = outcome == IntroductionOutcome.TERM_SHEET
+        if outcome is None and status not in (IntroductionStatus.DECLINED, IntroductionStatus.EXPIRED):
+            continue
+        as_of = responded_at or requested_at or datetime.utcnow()
+        current = labels.get(startup_id)
+        if current is None \
+                or (positive and (not current[0] or as_of < current[1])) \
+                or (not positive and not current[0] and as_of > current[1]):
+            labels[startup_id] = (int(positive), as_of)
+    return labels
+
+
+def build_dataset(db, service, labels):
+    """(feature matrix, labels) with point-in-time timeline aggregates"""
+    inputs, y = [], []
+    startup_ids = sorted(labels)
+    for i in range(0, len(startup_ids), CHUNK):
+        chunk = startup_ids[i:i + CHUNK]
+        events = {}
+        for startup_id, event_type, event_date in db.query(
+            TimelineEvent.startup_id, TimelineEvent.event_type, TimelineEvent.event_date
+        ).filter(TimelineEvent.startup_id.in_(chunk)):
+            events.setdefault(startup_id, []).append((event_type.value, event_date))
+
+        for startup in db.query(Startup).filter(Startup.id.in_(chunk)):
+            label, as_of = labels[startup.id]
+            as_of_day = as_of.date()
+            counts, last_date = {}, None
+            for event_type, event_date in events.get(startup.id, []):
+                if event_date > as_of_day:
+                    continue
+                counts[event_type] = counts.get(event_type, 0) + 1
+                last_date = event_date if last_date is None or event_date > last_date else last_date
+            inputs.append(service.readiness_inputs_from_aggregates(
+                startup, sum(counts.values()), counts, last_date, today=as_of_day
+            ))
+            y.append(label)
+    return readiness_feature_matrix(encode_readiness_inputs(inputs)), np.array(y, dtype=np.int8)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the gradient boosting readiness model")
+    parser.add_argument("--output", default=os.path.join("ml", "artifacts", "readiness-gb.joblib"))
+    parser.add_argument("--estimators", type=int, default=200)
+    parser.add_argument("--max-depth", type=int, default=3)
+    parser.add_argument("--learning-rate", type=float, default=0.05)
+    parser.add_argument("--holdout", type=float, default=0.2, help="fraction held out for metrics")
+    parser.add_argument("--min-samples", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    started = time.perf_counter()
+    try:
+        X, y = build_dataset(db, ScoringService(), resolved_labels(db))
+    finally:
+        db.close()
+    positives = int(y.sum())
+    print(f"Built {len(y)} labeled startups ({positives} term sheets) in {time.perf_counter() - started:.1f}s")
+    if len(y) < args.min_samples or positives < 2 or positives > len(y) - 2:
+        print("Not enough labeled data (need --min-samples rows and both outcomes); nothing saved")
+        sys.exit(1)
+
+    def classifier():
+        return GradientBoostingClassifier(
+            n_estimators=args.estimators, max_depth=args.max_depth,
+            learning_rate=args.learning_rate, subsample=0.8, random_state=args.seed
+        )
+
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=args.holdout, stratify=y, random_state=args.seed
+    )
+    holdout = classifier().fit(X_train, y_train).predict_proba(X_test)[:, 1]
+    metrics = {
+        "holdout_rows": len(y_test),
+        "roc_auc": float(roc_auc_score(y_test, holdout)),
+        "average_precision": float(average_precision_score(y_test, holdout)),
+        "base_rate": float(y.mean())
+    }
+    print(f"Holdout: ROC AUC {metrics['roc_auc']:.3f}, average precision {metrics['average_precision']:.3f} "
+          f"(base rate {metrics['base_rate']:.3f})")
+
+    started = time.perf_counter()
+    model = classifier().fit(X, y)
+    artifact = save_readiness_artifact(model, model.predict_proba(X)[:, 1], args.output, metrics, len(y))
+    print(f"Trained on {len(y)} rows in {time.perf_counter() - started:.1f}s; "
+          f"saved {artifact['version']} to {args.output}")
+    print(f"Serve it with READINESS_MODEL_PATH={os.path.abspath(args.output)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,5 @@
 import os
 import uuid
-import json
 import random
 from datetime import date, datetime, timedelta
 from sqlalchemy import create_engine
@@ -111,7 +110,7 @@ def seed():
                 investor = models.Investor(
                     user_id=user.id, name=inv["name"], firm_name=inv["firm"], investor_type=inv["type"],
                     investment_thesis=inv["thesis"], check_size_min=inv["check_min"], check_size_max=inv["check_max"],
-                    stage_focus=json.dumps(inv["stage"]), sector_focus=json.dumps(inv["sector"])
+                    stage_focus=inv["stage"], sector_focus=inv["sector"]
                 )
                 db.add(investor)
         db.commit()
@@ -314,24 +313,24 @@ def seed():
                 "slug": "vertical-ai-healthcare-2024",
                 "type": StoryType.ECOSYSTEM_INSIGHT,
                 "summary": "Why specialized models like DataScribe are outperforming generalized LLMs in clinical settings.",
-                "content": json.dumps({"blocks": [{"type": "paragraph", "text": "Vertical AI is eating the world..."}]}),
-                "tags": json.dumps(["AI", "Healthcare", "Trends"])
+                "content": {"blocks": [{"type": "paragraph", "text": "Vertical AI is eating the world..."}]},
+                "tags": ["AI", "Healthcare", "Trends"]
             },
             {
                 "title": "Market Momentum: Fintech Infrastructure",
                 "slug": "fintech-infra-momentum",
                 "type": StoryType.ECOSYSTEM_INSIGHT,
                 "summary": "Infrastructure plays like VaultX are seeing 3x higher deal flow than consumer fintech apps this quarter.",
-                "content": json.dumps({"blocks": [{"type": "paragraph", "text": "Investors are fleeing to safety..."}]}),
-                "tags": json.dumps(["Fintech", "Infrastructure"])
+                "content": {"blocks": [{"type": "paragraph", "text": "Investors are fleeing to safety..."}]},
+                "tags": ["Fintech", "Infrastructure"]
             },
              {
                 "title": "Decision Memo: Why We Passed on Visionary",
                 "slug": "decision-memo-visionary",
                 "type": StoryType.DECISION_STORY,
                 "summary": "A deep dive into the competitive landscape of generative video and why execution speed matters more than the model.",
-                "content": json.dumps({"blocks": [{"type": "paragraph", "text": "Visionary has great tech but..."}]}),
-                "tags": json.dumps(["GenAI", "Decision Memo"])
+                "content": {"blocks": [{"type": "paragraph", "text": "Visionary has great tech but..."}]},
+                "tags": ["GenAI", "Decision Memo"]
             }
         ]
         
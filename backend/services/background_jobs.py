@@ -0,0 +1,100 @@
+"""
+In-process background jobs
+Each registered job runs on its own daemon thread at a fixed interval.
+Jobs open their own DB sessions; nothing here touches the request path.
+
+Exactly one process should run them: scripts/run_worker.py. API processes
+don't, since every uvicorn/gunicorn worker would start its own copy (and on
+SQLite, where FOR UPDATE SKIP LOCKED is a no-op, dispatch the same outbox
+rows twice). BACKGROUND_JOBS_ENABLED=true makes a single-process API run
+them itself instead.
+
+The worker reaches the API processes through the database: each transaction
+that writes a user's signals bumps their user_feed_versions row, which cached
+feeds check on read and open streams poll (scripts/check_signal_push.py).
+"""
+
+import logging
+import os
+import threading
+from typing import Callable, List
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicJob:
+    """Calls fn() every interval_seconds until stopped"""
+
+    def __init__(self, name: str, interval_seconds: float, fn: Callable[[], object]):
+        self.name = name
+        self.interval_seconds = interval_seconds
+        self.fn = fn
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name=f"job-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.fn()
+            except Exception as e:
+                logger.error(f"Background job {self.name} failed: {e}")
+            self._stop.wait(self.interval_seconds)
+
+
+_jobs: List[PeriodicJob] = []
+
+
+def background_jobs_enabled() -> bool:
+    """Whether the API process runs the jobs itself (only for a single API process without run_worker.py)"""
+    return os.getenv("BACKGROUND_JOBS_ENABLED", "false").lower() == "true"
+
+
+def register_job(name: str, interval_seconds: float, fn: Callable[[], object]) -> PeriodicJob:
+    job = PeriodicJob(name, interval_seconds, fn)
+    _jobs.append(job)
+    return job
+
+
+def start_background_jobs():
+    for job in _jobs:
+        logger.info(f"Starting background job {job.name} (every {job.interval_seconds}s)")
+        job.start()
+
+
+def stop_background_jobs():
+    for job in _jobs:
+        job.stop()
+
+
+def register_default_jobs():
+    """Jobs run by scripts/run_worker.py (or the API process with BACKGROUND_JOBS_ENABLED=true)"""
+    from services.outbox_service import dispatch_pending_events, OUTBOX_POLL_SECONDS
+    from services.signal_retention import archive_expired_signals, SIGNAL_ARCHIVE_INTERVAL_SECONDS
+    from services.interest_rollup import prune_interest_rollups, INTEREST_ROLLUP_PRUNE_SECONDS
+    from services.execution_gap_sweeper import sweep_execution_gaps, EXECUTION_GAP_SWEEP_SECONDS
+    from services.ecosystem_counters import reconcile_ecosystem_counters, ECOSYSTEM_RECONCILE_SECONDS
+    from services.cohort_stats import reconcile_cohort_stats, COHORT_RECONCILE_SECONDS
+    from services.timeline_stats import reconcile_startup_timeline_stats, TIMELINE_STATS_RECONCILE_SECONDS
+    from services.profile_view_rollup import run_profile_view_rollup, PROFILE_VIEW_ROLLUP_SECONDS
+    from services.readiness_history import downsample_readiness_history, READINESS_HISTORY_DOWNSAMPLE_SECONDS
+
+    if _jobs:
+        return
+    register_job("outbox-dispatcher", OUTBOX_POLL_SECONDS, dispatch_pending_events)
+    register_job("signal-archiver", SIGNAL_ARCHIVE_INTERVAL_SECONDS, archive_expired_signals)
+    register_job("interest-rollup-pruner", INTEREST_ROLLUP_PRUNE_SECONDS, prune_interest_rollups)
+    register_job("execution-gap-sweeper", EXECUTION_GAP_SWEEP_SECONDS, sweep_execution_gaps)
+    register_job("ecosystem-counter-reconcile", ECOSYSTEM_RECONCILE_SECONDS, reconcile_ecosystem_counters)
+    register_job("cohort-stats-reconcile", COHORT_RECONCILE_SECONDS, reconcile_cohort_stats)
+    register_job("timeline-stats-reconcile", TIMELINE_STATS_RECONCILE_SECONDS, reconcile_startup_timeline_stats)
+    register_job("profile-view-rollup", PROFILE_VIEW_ROLLUP_SECONDS, run_profile_view_rollup)
+    register_job("readiness-history-downsampler", READINESS_HISTORY_DOWNSAMPLE_SECONDS, downsample_readiness_history)
@@ -0,0 +1,182 @@
+"""
+Cohort Readiness Statistics
+Readiness scores are integers in 0-100, so each (sector, stage) cohort keeps
+an exact histogram (cohort_score_buckets, at most 102 rows per cohort) rather
+than an approximate quantile sketch. Median and percentile reads are exact and
+touch only the cohort's buckets.
+
+The histogram is maintained like ecosystem_counters: a before_flush listener
+applies Startup sector/stage/score changes in the writing transaction, and a
+reconciliation job rebuilds it from a grouped scan. Until the first rebuild
+the cohort is read with the same grouped query.
+"""
+
+import logging
+import os
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import event, func
+from sqlalchemy.orm import Session
+
+from db.database import SessionLocal
+from db.upsert import dialect_insert
+from models.models import Startup, CohortScoreBucket
+from services.ecosystem_counters import old_values, new_values, track_old_values
+
+logger = logging.getLogger(__name__)
+
+COHORT_RECONCILE_SECONDS = float(os.getenv("COHORT_RECONCILE_SECONDS", "86400"))
+
+UNSCORED = -1
+INITIALIZED = ("_meta", "initialized", 0)
+
+COHORT_FIELDS = ("sector", "stage", "readiness_score")
+
+# (sector, stage, score) -> count
+Buckets = Dict[Tuple[str, str, int], int]
+
+
+def cohort_key(sector, stage, score) -> Tuple[str, str, int]:
+    return (sector or "", stage or "", UNSCORED if score is None else int(score))
+
+
+def apply_bucket_deltas(db: Session, deltas: Buckets):
+    deltas = {key: count for key, count in deltas.items() if count}
+    if not deltas:
+        return
+    stmt = dialect_insert(db, CohortScoreBucket)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["sector", "stage", "score"],
+        set_={"count": CohortScoreBucket.count + stmt.excluded.count}
+    )
+    db.connection().execute(stmt, [
+        {"sector": sector, "stage": stage, "score": score, "count": count}
+        for (sector, stage, score), count in deltas.items()
+    ])
+
+
+@event.listens_for(Session, "before_flush")
+def _maintain_buckets(session, flush_context, instances):
+    deltas: Buckets = {}
+
+    def add(values, sign):
+        key = cohort_key(values["sector"], values["stage"], values["readiness_score"])
+        deltas[key] = deltas.get(key, 0) + sign
+
+    for obj in session.new:
+        if isinstance(obj, Startup):
+            add(new_values(obj, COHORT_FIELDS), 1)
+    for obj in session.dirty:
+        if isinstance(obj, Startup) and session.is_modified(obj):
+            add(old_values(obj, COHORT_FIELDS), -1)
+            add(new_values(obj, COHORT_FIELDS), 1)
+    for obj in session.deleted:
+        if isinstance(obj, Startup):
+            add(old_values(obj, COHORT_FIELDS), -1)
+    if deltas:
+        apply_bucket_deltas(session, deltas)
+
+
+track_old_values(Startup, COHORT_FIELDS)
+
+
+def recompute_buckets(db: Session) -> Buckets:
+    buckets: Buckets = {}
+    rows = db.query(
+        Startup.sector, Startup.stage, Startup.readiness_score, func.count(Startup.id)
+    ).group_by(Startup.sector, Startup.stage, Startup.readiness_score)
+    for sector, stage, score, count in rows:
+        key = cohort_key(sector, stage, score)
+        buckets[key] = buckets.get(key, 0) + count
+    return buckets
+
+
+def cohort_histogram(db: Session, sector: Optional[str], stage: Optional[str]) -> Dict[int, int]:
+    """score -> count for one cohort (UNSCORED counts startups without a score)"""
+    if db.get(CohortScoreBucket, INITIALIZED) is not None:
+        rows = db.query(CohortScoreBucket.score, CohortScoreBucket.count).filter(
+            CohortScoreBucket.sector == (sector or ""),
+            CohortScoreBucket.stage == (stage or ""),
+            CohortScoreBucket.count > 0
+        )
+        return dict(rows.all())
+
+    # Not initialized yet: same histogram from a grouped query over the cohort
+    query = db.query(Startup.readiness_score, func.count(Startup.id))
+    query = query.filter(Startup.sector == sector) if sector else query.filter(func.coalesce(Startup.sector, "") == "")
+    query = query.filter(Startup.stage == stage) if stage else query.filter(func.coalesce(Startup.stage, "") == "")
+    histogram: Dict[int, int] = {}
+    for score, count in query.group_by(Startup.readiness_score):
+        key = UNSCORED if score is None else int(score)
+        histogram[key] = histogram.get(key, 0) + count
+    return histogram
+
+
+def histogram_median(histogram: Dict[int, int]) -> Optional[float]:
+    """Median of the scored entries"""
+    scored = sorted((score, count) for score, count in histogram.items() if score != UNSCORED and count > 0)
+    total = sum(count for _, count in scored)
+    if not total:
+        return None
+
+    def nth(n):  # 0-based
+        seen = 0
+        for score, count in scored:
+            seen += count
+            if n < seen:
+                return score
+
+    if total % 2:
+        return float(nth(total // 2))
+    return (nth(total // 2 - 1) + nth(total // 2)) / 2
+
+
+def histogram_percentile(histogram: Dict[int, int], score: int) -> Optional[int]:
+    """Percentage of scored entries strictly below score"""
+    total = sum(count for s, count in histogram.items() if s != UNSCORED)
+    if not total:
+        return None
+    below = sum(count for s, count in histogram.items() if s != UNSCORED and s < score)
+    return round(below / total * 100)
+
+
+def reconcile_buckets(db: Session, repair: bool = True) -> Dict[Tuple[str, str, int], Tuple[int, int]]:
+    """Compare the histogram with a full recompute; returns key -> (stored, expected) for drifted keys"""
+    if db.get_bind().dialect.name == "postgresql":
+        db.connection().exec_driver_sql("LOCK TABLE cohort_score_buckets IN SHARE ROW EXCLUSIVE MODE")
+
+    expected = recompute_buckets(db)
+    stored = {
+        (row.sector, row.stage, row.score): row.count
+        for row in db.query(CohortScoreBucket)
+        if (row.sector, row.stage, row.score) != INITIALIZED
+    }
+    drift = {}
+    for key in set(expected) | set(stored):
+        if stored.get(key, 0) != expected.get(key, 0):
+            drift[key] = (stored.get(key, 0), expected.get(key, 0))
+
+    initialized = db.get(CohortScoreBucket, INITIALIZED) is not None
+    if repair and (drift or not initialized):
+        db.query(CohortScoreBucket).delete(synchronize_session=False)
+        db.bulk_insert_mappings(CohortScoreBucket, [
+            {"sector": sector, "stage": stage, "score": score, "count": count}
+            for (sector, stage, score), count in expected.items()
+        ] + [{"sector": INITIALIZED[0], "stage": INITIALIZED[1], "score": INITIALIZED[2], "count": 1}])
+    db.commit()
+    return drift
+
+
+def reconcile_cohort_stats() -> int:
+    """Background job entry point: initialize, verify and repair; returns the number of drifted buckets"""
+    db = SessionLocal()
+    try:
+        initialized = db.get(CohortScoreBucket, INITIALIZED) is not None
+        drift = reconcile_buckets(db)
+        if not initialized:
+            logger.info("Cohort score buckets initialized from a full recompute")
+        elif drift:
+            logger.warning(f"Cohort score buckets drifted on {len(drift)} keys (repaired)")
+        return len(drift)
+    finally:
+        db.close()
@@ -0,0 +1,315 @@
+"""
+Ecosystem Counters
+ecosystem_counters holds the ecosystem aggregates (per band, depth, stage and
+location counts plus readiness sums, and introduction outcomes). A before_flush
+listener applies each Startup/Introduction insert, update or delete to it in
+the same transaction, so /api/ecosystem/metrics can be exact without scanning.
+
+Writes that bypass the ORM unit of work (bulk query.update(), raw SQL, DB-level
+cascades) are not seen here. The reconciliation job recomputes the counters
+from a full scan, logs any drift and repairs it. It also initializes the
+counters (at worker start); until then the API computes the same aggregates
+from a two-pass scan.
+"""
+
+import enum
+import logging
+import os
+from collections import Counter
+from typing import Dict, List, Tuple
+
+from sqlalchemy import case, event, func, inspect as sa_inspect
+from sqlalchemy.orm import Session
+
+from db.database import SessionLocal
+from db.json_columns import json_array_nonempty, json_list
+from db.upsert import dialect_insert
+from models.models import (
+    Startup, Introduction, VisibilityStatus, IntroductionStatus, EcosystemCounter
+)
+
+logger = logging.getLogger(__name__)
+
+ECOSYSTEM_RECONCILE_SECONDS = float(os.getenv("ECOSYSTEM_RECONCILE_SECONDS", "86400"))
+
+INITIALIZED = ("_meta", "initialized")
+
+STARTUP_FIELDS = ("visibility_status", "impact_tags", "readiness_band", "impact_depth", "stage", "location", "readiness_score")
+INTRODUCTION_FIELDS = ("status",)
+
+# (dimension, key) -> [count, readiness_sum, readiness_n]
+Counters = Dict[Tuple[str, str], List[int]]
+
+
+def _value(v):
+    return v.value if isinstance(v, enum.Enum) else v
+
+
+def startup_keys(visible: bool, tagged: bool, band, depth, stage, location) -> List[Tuple[str, str]]:
+    keys = [("startups", "total")]
+    if band is not None:
+        keys.append(("band", _value(band)))
+    if depth is not None:
+        keys.append(("depth", _value(depth)))
+    if visible:
+        keys.append(("startups", "visible"))
+        if tagged:
+            keys.append(("startups", "visible_impact_tagged"))
+        if location is not None:
+            keys.append(("visible_location", location))
+        if stage is not None:
+            keys.append(("visible_stage", stage))
+    return keys
+
+
+def introduction_keys(status) -> List[Tuple[str, str]]:
+    return [("introductions", "total"), ("intro_status", _value(status or IntroductionStatus.REQUESTED))]
+
+
+def _startup_contribution(values: Dict) -> Counters:
+    score = values["readiness_score"]
+    tags = values["impact_tags"]
+    keys = startup_keys(
+        _value(values["visibility_status"]) == VisibilityStatus.VISIBLE.value,
+        bool(json_list(tags)),
+        values["readiness_band"], values["impact_depth"], values["stage"], values["location"]
+    )
+    return {key: [1, score or 0, 1 if score is not None else 0] for key in keys}
+
+
+def _introduction_contribution(values: Dict) -> Counters:
+    return {key: [1, 0, 0] for key in introduction_keys(values["status"])}
+
+
+def _add(total: Counters, part: Counters, sign: int):
+    for key, (count, readiness_sum, readiness_n) in part.items():
+        row = total.setdefault(key, [0, 0, 0])
+        row[0] += sign * count
+        row[1] += sign * readiness_sum
+        row[2] += sign * readiness_n
+
+
+def old_values(obj, fields) -> Dict:
+    """Pre-flush values of fields on a dirty/deleted instance"""
+    state = sa_inspect(obj)
+    values = {}
+    for field in fields:
+        history = state.attrs[field].history
+        if history.deleted:
+            values[field] = history.deleted[0]
+        elif history.unchanged:
+            values[field] = history.unchanged[0]
+        elif history.added:
+            # Set over a previous NULL
+            values[field] = None
+        else:
+            # Not loaded and not set: unchanged, load it
+            values[field] = getattr(obj, field)
+    return values
+
+
+def new_values(obj, fields) -> Dict:
+    return {field: getattr(obj, field) for field in fields}
+
+
+def apply_counter_deltas(db: Session, deltas: Counters):
+    """Add deltas to the counters with one upsert per touched key"""
+    deltas = {key: row for key, row in deltas.items() if any(row)}
+    if not deltas:
+        return
+    stmt = dialect_insert(db, EcosystemCounter)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["dimension", "key"],
+        set_={
+            "count": EcosystemCounter.count + stmt.excluded.count,
+            "readiness_sum": EcosystemCounter.readiness_sum + stmt.excluded.readiness_sum,
+            "readiness_n": EcosystemCounter.readiness_n + stmt.excluded.readiness_n
+        }
+    )
+    db.connection().execute(stmt, [
+        {"dimension": dimension, "key": key, "count": count, "readiness_sum": readiness_sum, "readiness_n": readiness_n}
+        for (dimension, key), (count, readiness_sum, readiness_n) in deltas.items()
+    ])
+
+
+@event.listens_for(Session, "before_flush")
+def _maintain_counters(session, flush_context, instances):
+    deltas: Counters = {}
+    for obj in session.new:
+        if isinstance(obj, Startup):
+            _add(deltas, _startup_contribution(new_values(obj, STARTUP_FIELDS)), 1)
+        elif isinstance(obj, Introduction):
+            _add(deltas, _introduction_contribution(new_values(obj, INTRODUCTION_FIELDS)), 1)
+    for obj in session.dirty:
+        if isinstance(obj, Startup) and session.is_modified(obj):
+            _add(deltas, _startup_contribution(old_values(obj, STARTUP_FIELDS)), -1)
+            _add(deltas, _startup_contribution(new_values(obj, STARTUP_FIELDS)), 1)
+        elif isinstance(obj, Introduction) and session.is_modified(obj):
+            _add(deltas, _introduction_contribution(old_values(obj, INTRODUCTION_FIELDS)), -1)
+            _add(deltas, _introduction_contribution(new_values(obj, INTRODUCTION_FIELDS)), 1)
+    for obj in session.deleted:
+        if isinstance(obj, Startup):
+            _add(deltas, _startup_contribution(old_values(obj, STARTUP_FIELDS)), -1)
+        elif isinstance(obj, Introduction):
+            _add(deltas, _introduction_contribution(old_values(obj, INTRODUCTION_FIELDS)), -1)
+    if deltas:
+        apply_counter_deltas(session, deltas)
+
+
+def _load_old_value_on_set(target, value, oldvalue, initiator):
+    return value
+
+
+def track_old_values(model, fields):
+    """
+    Load the previous value when one of these attributes is set on an expired
+    instance, so old_values() can subtract what was there
+    """
+    for field in fields:
+        event.listen(getattr(model, field), "set", _load_old_value_on_set, active_history=True, retval=True)
+
+
+track_old_values(Startup, STARTUP_FIELDS)
+track_old_values(Introduction, INTRODUCTION_FIELDS)
+
+
+def recompute_counters(db: Session) -> Counters:
+    """Full recompute: one grouped scan of startups, one of introductions"""
+    is_visible = case((Startup.visibility_status == VisibilityStatus.VISIBLE, 1), else_=0)
+    has_impact_tags = case((json_array_nonempty(Startup.impact_tags), 1), else_=0)
+    groups = db.query(
+        is_visible,
+        has_impact_tags,
+        Startup.readiness_band,
+        Startup.impact_depth,
+        Startup.stage,
+        Startup.location,
+        func.count(Startup.id),
+        func.sum(Startup.readiness_score),
+        func.count(Startup.readiness_score)
+    ).group_by(
+        is_visible, has_impact_tags, Startup.readiness_band, Startup.impact_depth, Startup.stage, Startup.location
+    ).all()
+
+    counters: Counters = {}
+    for visible, tagged, band, depth, stage, location, count, readiness_sum, readiness_n in groups:
+        part = {key: [count, int(readiness_sum or 0), readiness_n]
+                for key in startup_keys(bool(visible), bool(tagged), band, depth, stage, location)}
+        _add(counters, part, 1)
+
+    for status, count in db.query(Introduction.status, func.count(Introduction.id)).group_by(Introduction.status):
+        _add(counters, {key: [count, 0, 0] for key in introduction_keys(status)}, 1)
+    return counters
+
+
+def load_counters(db: Session) -> Counters:
+    return {
+        (row.dimension, row.key): [row.count, row.readiness_sum, row.readiness_n]
+        for row in db.query(EcosystemCounter)
+        if (row.dimension, row.key) != INITIALIZED
+    }
+
+
+def counters_initialized(db: Session) -> bool:
+    return db.get(EcosystemCounter, INITIALIZED) is not None
+
+
+def assemble_metrics(counters: Counters) -> Dict:
+    """The /api/ecosystem/metrics payload from counters (zero rows are ignored)"""
+    def count(dimension, key):
+        return counters.get((dimension, key), [0, 0, 0])[0]
+
+    def distribution(dimension):
+        return {key: row for (dim, key), row in counters.items() if dim == dimension and row[0] > 0}
+
+    total_startups = count("startups", "total")
+    visible_startups = count("startups", "visible")
+    impact_tagged_visible = count("startups", "visible_impact_tagged")
+
+    impact_visibility_rate = (
+        (impact_tagged_visible / visible_startups * 100)
+        if visible_startups > 0 else 0
+    )
+
+    locations = Counter({key: row[0] for key, row in distribution("visible_location").items()})
+    regions = [
+        {"location": loc, "startup_count": startup_count}
+        for loc, startup_count in locations.most_common(10)
+    ]
+
+    stage_bottlenecks = [
+        {
+            "stage": stage,
+            "startup_count": startup_count,
+            "average_readiness": round(readiness_sum / readiness_n, 1) if readiness_n else None
+        }
+        for stage, (startup_count, readiness_sum, readiness_n) in distribution("visible_stage").items()
+    ]
+
+    total_intros = count("introductions", "total")
+    accepted_intros = count("intro_status", IntroductionStatus.ACCEPTED.value)
+    intro_acceptance_rate = (
+        (accepted_intros / total_intros * 100)
+        if total_intros > 0 else 0
+    )
+
+    return {
+        "total_startups": total_startups,
+        "visible_startups": visible_startups,
+        "visibility_rate": round((visible_startups / total_startups * 100) if total_startups > 0 else 0, 1),
+        "impact_tagged_visible": impact_tagged_visible,
+        "impact_visibility_rate": round(impact_visibility_rate, 1),
+        "readiness_distribution": {key: row[0] for key, row in distribution("band").items()},
+        "impact_depth_distribution": {key: row[0] for key, row in distribution("depth").items()},
+        "regional_breakdown": regions,
+        "stage_bottlenecks": stage_bottlenecks,
+        "introduction_stats": {
+            "total_introductions": total_intros,
+            "accepted_introductions": accepted_intros,
+            "acceptance_rate": round(intro_acceptance_rate, 1)
+        }
+    }
+
+
+def reconcile_counters(db: Session, repair: bool = True) -> Dict[Tuple[str, str], Tuple[List[int], List[int]]]:
+    """
+    Compare the counters with a full recompute. Returns key -> (stored, expected)
+    for every drifted key; with repair, rewrites the table from the recompute.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        # Hold off counter upserts so the recompute and the stored rows agree
+        db.connection().exec_driver_sql("LOCK TABLE ecosystem_counters IN SHARE ROW EXCLUSIVE MODE")
+
+    expected = recompute_counters(db)
+    stored = load_counters(db)
+    drift = {}
+    for key in set(expected) | set(stored):
+        stored_row = stored.get(key, [0, 0, 0])
+        expected_row = expected.get(key, [0, 0, 0])
+        if stored_row != expected_row:
+            drift[key] = (stored_row, expected_row)
+
+    initialized = counters_initialized(db)
+    if repair and (drift or not initialized):
+        db.query(EcosystemCounter).delete(synchronize_session=False)
+        db.bulk_insert_mappings(EcosystemCounter, [
+            {"dimension": dimension, "key": key, "count": count, "readiness_sum": readiness_sum, "readiness_n": readiness_n}
+            for (dimension, key), (count, readiness_sum, readiness_n) in expected.items()
+        ] + [{"dimension": INITIALIZED[0], "key": INITIALIZED[1], "count": 1, "readiness_sum": 0, "readiness_n": 0}])
+    db.commit()
+    return drift
+
+
+def reconcile_ecosystem_counters() -> int:
+    """Background job entry point: verify and repair; returns the number of drifted keys"""
+    db = SessionLocal()
+    try:
+        initialized = counters_initialized(db)
+        drift = reconcile_counters(db)
+        if not initialized:
+            logger.info("Ecosystem counters initialized from a full recompute")
+        elif drift:
+            logger.warning(f"Ecosystem counters drifted on {len(drift)} keys (repaired): {sorted(drift)[:10]}")
+        return len(drift)
+    finally:
+        db.close()
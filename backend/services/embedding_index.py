@@ -0,0 +1,234 @@
+"""
+Embedding Index
+Startup description embeddings (Startup.description_embedding) and investor
+thesis embeddings (Investor.thesis_embedding) are recomputed by a
+before_flush listener whenever the text they are built from changes. Each is
+tagged with the EMBEDDING_MODEL_VERSION it was computed with; vectors from
+another version are ignored until re-embedded (scripts/migrate_embeddings.py).
+
+Pattern similarity for an investor is one matrix-vector product against an
+in-process float32 matrix of every startup embedding. For ranking, the raw
+cosines are turned into percentile ranks among the candidates, with a neutral
+value for candidates that have no embedding. A local commit that changes
+startup embeddings patches those rows in place; the matrix is reloaded, by
+one caller at a time, at most every EMBEDDING_INDEX_TTL_SECONDS, which bounds
+staleness for writes made by other processes.
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from ml.embeddings import (
+    EMBEDDING_DIM, EMBEDDING_DTYPE, EMBEDDING_MODEL_VERSION,
+    embed_texts, investor_text, pack_embedding, startup_text, unpack_embedding
+)
+from models.models import Investor, Startup
+
+EMBEDDING_INDEX_TTL_SECONDS = int(os.getenv("EMBEDDING_INDEX_TTL_SECONDS", "300"))
+
+STARTUP_TEXT_FIELDS = ("sector", "description", "product_description")
+INVESTOR_TEXT_FIELDS = ("investment_thesis",)
+
+# Fit blend value for a candidate with no comparable embedding
+NEUTRAL_PATTERN_SIMILARITY = 0.5
+
+_FLUSHING_KEY = "embedding_index_flushing"
+_DIRTY_KEY = "embedding_index_dirty"
+
+
+def investor_embedding(investor: Investor) -> Optional[np.ndarray]:
+    """The investor's stored thesis embedding, or one computed from the thesis"""
+    if investor.thesis_embedding_model == EMBEDDING_MODEL_VERSION:
+        vector = unpack_embedding(investor.thesis_embedding)
+        if vector is not None:
+            return vector
+    if not investor.investment_thesis:
+        return None
+    return embed_texts([investor_text(investor)])[0]
+
+
+def embed_startups(startups: List[Startup]):
+    for startup, vector in zip(startups, embed_texts([startup_text(s) for s in startups])):
+        startup.description_embedding = pack_embedding(vector) if vector.any() else None
+        startup.description_embedding_model = EMBEDDING_MODEL_VERSION
+
+
+def embed_investors(investors: List[Investor]):
+    for investor, vector in zip(investors, embed_texts([investor_text(i) for i in investors])):
+        investor.thesis_embedding = pack_embedding(vector) if vector.any() else None
+        investor.thesis_embedding_model = EMBEDDING_MODEL_VERSION
+
+
+class StartupEmbeddingIndex:
+    """(startup ids, unit-norm embedding matrix) snapshot, patched on local commits and reloaded when expired"""
+
+    def __init__(self, ttl_seconds: int = EMBEDDING_INDEX_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._rebuild_lock = threading.Lock()
+        self._ids: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._matrix = np.zeros((0, EMBEDDING_DIM), dtype=EMBEDDING_DTYPE)
+        self._expires_at = 0.0
+        # Updates committed while a reload is reading, replayed onto its result
+        self._updates_during_rebuild: Optional[Dict[str, Optional[np.ndarray]]] = None
+
+    def invalidate(self):
+        with self._lock:
+            self._expires_at = 0.0
+
+    def apply_updates(self, updates: Dict[str, Optional[np.ndarray]]):
+        """Patch committed startup embeddings (None removes one) into the current snapshot"""
+        with self._lock:
+            if self._updates_during_rebuild is not None:
+                self._updates_during_rebuild.update(updates)
+            self._ids, self._positions, self._matrix = self._patched(
+                self._ids, self._positions, self._matrix, updates
+            )
+
+    @staticmethod
+    def _patched(ids, positions, matrix, updates):
+        """Changed rows are overwritten in place; additions and removals build new arrays"""
+        added = {startup_id: vector for startup_id, vector in updates.items()
+                 if vector is not None and startup_id not in positions}
+        removed = {startup_id for startup_id, vector in updates.items()
+                   if vector is None and startup_id in positions}
+        for startup_id, vector in updates.items():
+            if vector is not None and startup_id in positions:
+                matrix[positions[startup_id]] = vector
+        if removed:
+            keep = [i for i, startup_id in enumerate(ids) if startup_id not in removed]
+            ids = [ids[i] for i in keep]
+            matrix = matrix[keep]
+        if added:
+            ids = ids + list(added)
+            matrix = np.vstack([matrix, np.vstack(list(added.values()))])
+        if added or removed:
+            positions = {startup_id: i for i, startup_id in enumerate(ids)}
+        return ids, positions, matrix
+
+    def _load(self, db: Session):
+        ids, vectors = [], []
+        for startup_id, blob in db.query(Startup.id, Startup.description_embedding).filter(
+            Startup.description_embedding.isnot(None),
+            Startup.description_embedding_model == EMBEDDING_MODEL_VERSION
+        ).yield_per(1000):
+            vector = unpack_embedding(blob)
+            if vector is not None:
+                ids.append(startup_id)
+                vectors.append(vector)
+        matrix = np.vstack(vectors) if vectors else np.zeros((0, EMBEDDING_DIM), dtype=EMBEDDING_DTYPE)
+        return ids, {startup_id: i for i, startup_id in enumerate(ids)}, matrix
+
+    def _snapshot(self, db: Session):
+        with self._lock:
+            if self._expires_at > time.monotonic():
+                return self._ids, self._positions, self._matrix
+        # One reload at a time; callers queued behind it use its result
+        with self._rebuild_lock:
+            with self._lock:
+                if self._expires_at > time.monotonic():
+                    return self._ids, self._positions, self._matrix
+                self._updates_during_rebuild = {}
+            try:
+                ids, positions, matrix = self._load(db)
+            finally:
+                with self._lock:
+                    updates, self._updates_during_rebuild = self._updates_during_rebuild, None
+            with self._lock:
+                self._ids, self._positions, self._matrix = self._patched(ids, positions, matrix, updates)
+                self._expires_at = time.monotonic() + self.ttl_seconds
+                return self._ids, self._positions, self._matrix
+
+    def similarities(self, db: Session, vector: Optional[np.ndarray], startup_ids: Optional[Iterable[str]] = None) -> Dict[str, float]:
+        """Cosine similarity (0-1) of vector to every indexed startup, or to startup_ids only"""
+        if vector is None or not vector.any():
+            return {}
+        ids, positions, matrix = self._snapshot(db)
+        if startup_ids is None:
+            return dict(zip(ids, (matrix @ vector).tolist()))
+        rows = [(startup_id, positions[startup_id]) for startup_id in startup_ids if startup_id in positions]
+        if not rows:
+            return {}
+        scores = matrix[[position for _, position in rows]] @ vector
+        return dict(zip((startup_id for startup_id, _ in rows), scores.tolist()))
+
+
+startup_embedding_index = StartupEmbeddingIndex()
+
+
+def pattern_similarities(db: Session, investor: Investor, startup_ids: Optional[Iterable[str]] = None) -> Dict[str, float]:
+    """startup id -> thesis/description cosine similarity; startups without an embedding are absent"""
+    return startup_embedding_index.similarities(db, investor_embedding(investor), startup_ids)
+
+
+def relative_similarities(similarities: Dict[str, float], startup_ids: List[str]) -> Dict[str, float]:
+    """
+    Every candidate's similarity as its percentile rank (0-1, ties averaged)
+    among the embedded candidates; NEUTRAL_PATTERN_SIMILARITY for the rest.
+    Raw hashing cosines are small and bunched, so only their order is used.
+    """
+    embedded = [startup_id for startup_id in startup_ids if startup_id in similarities]
+    if len(embedded) < 2:
+        return {startup_id: NEUTRAL_PATTERN_SIMILARITY for startup_id in startup_ids}
+    values = np.array([similarities[startup_id] for startup_id in embedded])
+    ordered = np.sort(values)
+    below = np.searchsorted(ordered, values, side='left')
+    through = np.searchsorted(ordered, values, side='right')
+    ranks = (below + through - 1) / 2 / (len(values) - 1)
+    relative = dict.fromkeys(startup_ids, NEUTRAL_PATTERN_SIMILARITY)
+    relative.update(zip(embedded, ranks.tolist()))
+    return relative
+
+
+def candidate_pattern_similarities(db: Session, investor: Investor, startup_ids: List[str]) -> Dict[str, float]:
+    """Relative pattern similarity (see relative_similarities) for every candidate being ranked"""
+    return relative_similarities(pattern_similarities(db, investor, startup_ids), startup_ids)
+
+
+def _text_changed(obj, fields) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[field].history.has_changes() for field in fields)
+
+
+@event.listens_for(Session, "before_flush")
+def _embed_changed_text(session, flush_context, instances):
+    startups = [obj for obj in session.new if isinstance(obj, Startup)]
+    startups += [obj for obj in session.dirty if isinstance(obj, Startup) and _text_changed(obj, STARTUP_TEXT_FIELDS)]
+    investors = [obj for obj in session.new if isinstance(obj, Investor)]
+    investors += [obj for obj in session.dirty if isinstance(obj, Investor) and _text_changed(obj, INVESTOR_TEXT_FIELDS)]
+    if startups:
+        embed_startups(startups)
+        session.info[_FLUSHING_KEY] = startups
+    if investors:
+        embed_investors(investors)
+
+
+@event.listens_for(Session, "after_flush")
+def _stage_index_updates(session, flush_context):
+    # Ids of new startups are only assigned by the flush
+    startups = session.info.pop(_FLUSHING_KEY, None)
+    if startups:
+        staged = session.info.setdefault(_DIRTY_KEY, {})
+        for startup in startups:
+            staged[startup.id] = unpack_embedding(startup.description_embedding)
+
+
+@event.listens_for(Session, "after_commit")
+def _patch_after_commit(session):
+    updates = session.info.pop(_DIRTY_KEY, None)
+    if updates:
+        startup_embedding_index.apply_updates(updates)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_after_rollback(session, transaction):
+    if transaction.parent is None:
+        session.info.pop(_DIRTY_KEY, None)
+        session.info.pop(_FLUSHING_KEY, None)
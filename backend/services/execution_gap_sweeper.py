@@ -0,0 +1,114 @@
+"""
+Execution Gap Sweeper
+Periodically finds startups whose latest timeline event is older than
+EXECUTION_GAP_THRESHOLD_DAYS, or that were created longer ago than that and
+have no events, and raises an execution alarm for each one.
+
+Startups are walked in id order, EXECUTION_GAP_CHUNK_SIZE at a time. Each
+chunk is one query selecting the lapsed startups with their latest event date
+(a MAX(event_date) per startup, served by ix_timeline_events_startup_date),
+one lookup of their existing alerts, and one bulk insert each of alerts and
+founder signals. Each gap is identified by the date of the last event before
+it (the creation date for a startup without events), so a gap alarms once no
+matter how often the sweep runs. A new event ends the gap, and the next gap
+alarms again.
+"""
+
+import logging
+import os
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.orm import Session
+
+from db.database import SessionLocal
+from db.upsert import insert_ignore_duplicates
+from models.models import Startup, TimelineEvent, ExecutionGapAlert
+from services.signal_service import SignalService
+
+logger = logging.getLogger(__name__)
+
+EXECUTION_GAP_THRESHOLD_DAYS = int(os.getenv("EXECUTION_GAP_THRESHOLD_DAYS", "90"))
+EXECUTION_GAP_CHUNK_SIZE = int(os.getenv("EXECUTION_GAP_CHUNK_SIZE", "1000"))
+EXECUTION_GAP_SWEEP_SECONDS = float(os.getenv("EXECUTION_GAP_SWEEP_SECONDS", "21600"))
+
+
+class ExecutionGapSweeper:
+    def __init__(self, db: Session, threshold_days: int = EXECUTION_GAP_THRESHOLD_DAYS):
+        self.db = db
+        self.threshold_days = threshold_days
+        self.signal_service = SignalService(db)
+
+    def sweep_chunk(self, after_startup_id: Optional[str], today: date,
+                    chunk_size: int = EXECUTION_GAP_CHUNK_SIZE):
+        """
+        Alarm new gaps among the next chunk of lapsed startups.
+        Returns (last startup_id seen or None when done, alarms raised).
+        """
+        cutoff = today - timedelta(days=self.threshold_days)
+        last_event = select(func.max(TimelineEvent.event_date)).where(
+            TimelineEvent.startup_id == Startup.id
+        ).scalar_subquery()
+        query = self.db.query(Startup.id, Startup.user_id, Startup.created_at, last_event).filter(
+            or_(
+                last_event < cutoff,
+                and_(last_event.is_(None), Startup.created_at < datetime.combine(cutoff, time.min))
+            )
+        )
+        if after_startup_id:
+            query = query.filter(Startup.id > after_startup_id)
+        lapsed = query.order_by(Startup.id).limit(chunk_size).all()
+
+        if not lapsed:
+            return None, 0
+
+        alerted = {
+            (startup_id, last_date) for startup_id, last_date in
+            self.db.query(ExecutionGapAlert.startup_id, ExecutionGapAlert.last_event_date).filter(
+                ExecutionGapAlert.startup_id.in_([row[0] for row in lapsed])
+            )
+        }
+        new_gaps = []
+        for startup_id, user_id, created_at, last_date in lapsed:
+            # Without events the gap runs from the profile's creation
+            since = last_date or created_at.date()
+            if (startup_id, since) not in alerted:
+                new_gaps.append({
+                    "startup_id": startup_id,
+                    "user_id": user_id,
+                    "last_event_date": since,
+                    "gap_days": (today - since).days,
+                    "has_events": last_date is not None
+                })
+
+        if new_gaps:
+            insert_ignore_duplicates(self.db, ExecutionGapAlert, [
+                {key: gap[key] for key in ("startup_id", "last_event_date", "gap_days")}
+                for gap in new_gaps
+            ], index_elements=["startup_id", "last_event_date"])
+            self.signal_service.trigger_execution_gaps(new_gaps)
+        self.db.commit()
+        return lapsed[-1][0], len(new_gaps)
+
+    def sweep(self, today: Optional[date] = None) -> int:
+        """Walk the whole catalog; returns the number of alarms raised"""
+        today = today or date.today()
+        after, raised = None, 0
+        while True:
+            after, count = self.sweep_chunk(after, today)
+            raised += count
+            if after is None:
+                return raised
+
+
+def sweep_execution_gaps() -> int:
+    """Background job entry point"""
+    db = SessionLocal()
+    try:
+        raised = ExecutionGapSweeper(db).sweep()
+        if raised:
+            logger.info(f"Execution gap sweep raised {raised} alarms")
+        return raised
+    finally:
+        db.close()
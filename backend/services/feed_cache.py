@@ -0,0 +1,216 @@
+"""
+Per-user Feed Cache
+Holds the first FEED_CACHE_SIZE formatted items of each user's signal feed, in
+feed order, so repeat feed loads skip the query and formatting.
+
+Every transaction that writes signals for a user bumps that user's row in
+user_feed_versions, in the same transaction. Entries record the version they
+were built at and a read that finds a newer version rebuilds, so writes made
+by any process (the background worker included) invalidate every process's
+cache. Entries also expire after FEED_CACHE_TTL_SECONDS as a backstop, e.g.
+for startup renames, and a local commit drops its users' entries eagerly.
+
+Both backends are supported with API processes and scripts/run_worker.py
+running separately: the local LRU is per process (correct through the version
+check); FEED_CACHE_REDIS_URL shares one cache between API workers.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from db.upsert import dialect_insert
+from models.models import UserFeedVersion
+
+logger = logging.getLogger(__name__)
+
+FEED_CACHE_SIZE = int(os.getenv("FEED_CACHE_SIZE", "50"))
+FEED_CACHE_MAX_USERS = int(os.getenv("FEED_CACHE_MAX_USERS", "10000"))
+FEED_CACHE_TTL_SECONDS = int(os.getenv("FEED_CACHE_TTL_SECONDS", "300"))
+# Log this process's hit/miss counters every N lookups (0 disables)
+FEED_CACHE_STATS_LOG_EVERY = int(os.getenv("FEED_CACHE_STATS_LOG_EVERY", "1000"))
+
+_DIRTY_KEY = "feed_cache_dirty_users"
+
+
+class LocalFeedCacheBackend:
+    """In-process LRU of user_id -> entry"""
+
+    def __init__(self, max_users: int = FEED_CACHE_MAX_USERS, ttl_seconds: int = FEED_CACHE_TTL_SECONDS):
+        self.max_users = max_users
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def get(self, user_id: str) -> Optional[Dict]:
+        with self._lock:
+            cached = self._entries.get(user_id)
+            if cached is None:
+                return None
+            expires_at, entry = cached
+            if expires_at < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return entry
+
+    def set(self, user_id: str, entry: Dict):
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl_seconds, entry)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_users:
+                self._entries.popitem(last=False)
+
+    def delete_many(self, user_ids: Iterable[str]):
+        with self._lock:
+            for user_id in user_ids:
+                self._entries.pop(user_id, None)
+
+
+class RedisFeedCacheBackend:
+    """Shared backend; entries are stored as JSON under feed:<user_id>"""
+
+    def __init__(self, client, ttl_seconds: int = FEED_CACHE_TTL_SECONDS):
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+
+    def get(self, user_id: str) -> Optional[Dict]:
+        raw = self.client.get(f"feed:{user_id}")
+        return json.loads(raw) if raw else None
+
+    def set(self, user_id: str, entry: Dict):
+        self.client.set(f"feed:{user_id}", json.dumps(entry), ex=self.ttl_seconds)
+
+    def delete_many(self, user_ids: Iterable[str]):
+        keys = [f"feed:{user_id}" for user_id in user_ids]
+        if keys:
+            self.client.delete(*keys)
+
+
+class FeedCache:
+    """
+    Entry shape: {"items": [...], "cursors": [...], "complete": bool, "version": int}
+    cursors[i] is the keyset cursor after items[i]; complete means the user has
+    no signals beyond the cached items; version is the user's feed version the
+    entry was built at.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.errors = 0
+
+    def get(self, user_id: str, version: int) -> Optional[Dict]:
+        """The user's entry if it was built at this feed version"""
+        try:
+            entry = self.backend.get(user_id)
+        except Exception as e:
+            # A cache outage degrades to DB reads, never to a failed feed
+            self.errors += 1
+            logger.error(f"Feed cache read failed: {e}")
+            entry = None
+        if entry is not None and entry.get("version") != version:
+            # Signals written since, possibly by another process
+            entry = None
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        if FEED_CACHE_STATS_LOG_EVERY and (self.hits + self.misses) % FEED_CACHE_STATS_LOG_EVERY == 0:
+            logger.info(f"Feed cache stats: {self.stats()}")
+        return entry
+
+    def set(self, user_id: str, entry: Dict):
+        try:
+            self.backend.set(user_id, entry)
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Feed cache write failed: {e}")
+
+    def invalidate(self, user_ids: Iterable[str]):
+        user_ids = set(user_ids)
+        if not user_ids:
+            return
+        try:
+            self.backend.delete_many(user_ids)
+            self.invalidations += len(user_ids)
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Feed cache invalidation failed: {e}")
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            "invalidations": self.invalidations,
+            "errors": self.errors
+        }
+
+
+def _create_backend():
+    redis_url = os.getenv("FEED_CACHE_REDIS_URL")
+    if redis_url:
+        try:
+            import redis
+            return RedisFeedCacheBackend(redis.Redis.from_url(redis_url))
+        except ImportError:
+            logger.warning("FEED_CACHE_REDIS_URL is set but redis is not installed (pip install redis); using the local feed cache")
+    return LocalFeedCacheBackend()
+
+
+feed_cache = FeedCache(_create_backend())
+
+
+def bump_feed_versions(db: Session, user_ids: Iterable[str]):
+    """Advance the users' feed versions in the caller's transaction (one upsert)"""
+    user_ids = sorted(set(user_ids))
+    if not user_ids:
+        return
+    stmt = dialect_insert(db, UserFeedVersion)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["user_id"],
+            set_={"version": UserFeedVersion.version + 1}
+        ),
+        [{"user_id": user_id, "version": 1} for user_id in user_ids]
+    )
+
+
+def feed_version(db: Session, user_id: str) -> int:
+    version = db.query(UserFeedVersion.version).filter(UserFeedVersion.user_id == user_id).scalar()
+    return version or 0
+
+
+def mark_feed_dirty(db: Session, user_ids: Iterable[str]):
+    """
+    Record that these users' signals changed in this transaction: their feed
+    versions are bumped now, and this process's entries are dropped on commit
+    """
+    user_ids = set(user_ids)
+    bump_feed_versions(db, user_ids)
+    db.info.setdefault(_DIRTY_KEY, set()).update(user_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    dirty = session.info.pop(_DIRTY_KEY, None)
+    if dirty:
+        feed_cache.invalidate(dirty)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_after_rollback(session, transaction):
+    # A rolled-back write changed nothing, so its users stay cached
+    if transaction.parent is None:
+        session.info.pop(_DIRTY_KEY, None)
@@ -0,0 +1,80 @@
+"""
+Market Interest Rollups
+Investor interest actions are counted into hourly per-startup buckets on write,
+so the 7-day market-interest check sums at most 168 rows instead of running
+COUNT(*) over investor_interests. Crossing the threshold fires the signal at
+most once per window, claimed with a conditional UPDATE.
+"""
+
+import os
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+
+from db.database import SessionLocal
+from db.upsert import dialect_insert, insert_ignore_duplicates
+from models.models import StartupInterestRollup, MarketInterestAlertState
+
+MARKET_INTEREST_WINDOW_DAYS = int(os.getenv("MARKET_INTEREST_WINDOW_DAYS", "7"))
+MARKET_INTEREST_THRESHOLD = int(os.getenv("MARKET_INTEREST_THRESHOLD", "3"))
+INTEREST_ROLLUP_PRUNE_SECONDS = float(os.getenv("INTEREST_ROLLUP_PRUNE_SECONDS", "3600"))
+
+
+def hour_bucket(ts: datetime) -> datetime:
+    return ts.replace(minute=0, second=0, microsecond=0)
+
+
+def window_start(now: datetime) -> datetime:
+    return hour_bucket(now - timedelta(days=MARKET_INTEREST_WINDOW_DAYS))
+
+
+def record_interest(db: Session, startup_id: str, at: Optional[datetime] = None):
+    """Count one interest action in the current hourly bucket (caller commits)"""
+    stmt = dialect_insert(db, StartupInterestRollup).values(
+        startup_id=startup_id,
+        bucket_start=hour_bucket(at or datetime.utcnow()),
+        interest_count=1
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["startup_id", "bucket_start"],
+        set_={"interest_count": StartupInterestRollup.interest_count + 1}
+    )
+    db.execute(stmt)
+
+
+def interest_in_window(db: Session, startup_id: str, now: Optional[datetime] = None) -> int:
+    """Interest actions in the last MARKET_INTEREST_WINDOW_DAYS (hour granularity)"""
+    total = db.query(func.sum(StartupInterestRollup.interest_count)).filter(
+        StartupInterestRollup.startup_id == startup_id,
+        StartupInterestRollup.bucket_start >= window_start(now or datetime.utcnow())
+    ).scalar()
+    return int(total or 0)
+
+
+def claim_market_interest_alert(db: Session, startup_id: str, now: Optional[datetime] = None) -> bool:
+    """True for exactly one caller per startup per window (caller commits)"""
+    now = now or datetime.utcnow()
+    insert_ignore_duplicates(db, MarketInterestAlertState, [{"startup_id": startup_id}], index_elements=["startup_id"])
+    claimed = db.query(MarketInterestAlertState).filter(
+        MarketInterestAlertState.startup_id == startup_id,
+        or_(
+            MarketInterestAlertState.last_fired_at.is_(None),
+            MarketInterestAlertState.last_fired_at <= now - timedelta(days=MARKET_INTEREST_WINDOW_DAYS)
+        )
+    ).update({MarketInterestAlertState.last_fired_at: now}, synchronize_session=False)
+    return claimed == 1
+
+
+def prune_interest_rollups() -> int:
+    """Background job: drop buckets that have left the window"""
+    db = SessionLocal()
+    try:
+        deleted = db.query(StartupInterestRollup).filter(
+            StartupInterestRollup.bucket_start < window_start(datetime.utcnow())
+        ).delete(synchronize_session=False)
+        db.commit()
+        return deleted
+    finally:
+        db.close()
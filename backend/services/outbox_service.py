@@ -0,0 +1,121 @@
+"""
+Transactional Outbox
+Write endpoints record domain events in outbox_events inside their own
+transaction; the dispatcher materializes them into SignalEvents off the
+request path, in batches.
+"""
+
+import logging
+import os
+from datetime import datetime
+from typing import Dict, List
+
+from sqlalchemy.orm import Session
+
+from db.database import SessionLocal
+from db.json_columns import json_dict
+from models.models import (
+    OutboxEvent, OutboxEventType, Startup, TimelineEvent, EventType, ConfidenceLevel
+)
+from services.signal_service import SignalService
+from services.signal_broker import pending_push_count, discard_pending_pushes
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "200"))
+OUTBOX_POLL_SECONDS = float(os.getenv("OUTBOX_POLL_SECONDS", "1.0"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "5"))
+
+
+def enqueue_event(db: Session, event_type: OutboxEventType, payload: Dict) -> OutboxEvent:
+    """Record a domain event in the caller's transaction (caller commits)"""
+    event = OutboxEvent(event_type=event_type, payload=payload)
+    db.add(event)
+    return event
+
+
+class OutboxDispatcher:
+    """Claims pending outbox events and turns them into signals"""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.signal_service = SignalService(db)
+
+    def dispatch_batch(self, batch_size: int = OUTBOX_BATCH_SIZE) -> int:
+        """Process one batch of pending events. Returns the number of events handled."""
+        events = self.db.query(OutboxEvent).filter(
+            OutboxEvent.processed_at.is_(None),
+            OutboxEvent.attempts < OUTBOX_MAX_ATTEMPTS
+        ).order_by(
+            OutboxEvent.created_at
+        ).limit(batch_size).with_for_update(skip_locked=True).all()
+
+        if not events:
+            return 0
+
+        now = datetime.utcnow()
+        market_interest_seen = set()
+
+        for event in events:
+            pushes_before = pending_push_count(self.db)
+            try:
+                # Savepoint per event so one bad payload doesn't sink the batch
+                with self.db.begin_nested():
+                    payload = json_dict(event.payload)
+                    if event.event_type == OutboxEventType.MARKET_INTEREST:
+                        # Several interest actions on one startup in a batch need one check
+                        if payload['startup_id'] in market_interest_seen:
+                            event.processed_at = now
+                            continue
+                        market_interest_seen.add(payload['startup_id'])
+                    self._handle(event, payload)
+                    event.processed_at = now
+            except Exception as e:
+                logger.error(f"Outbox event {event.id} ({event.event_type.value}) failed: {e}")
+                discard_pending_pushes(self.db, keep=pushes_before)
+                event.attempts = (event.attempts or 0) + 1
+                event.last_error = str(e)
+
+        self.db.commit()
+        return len(events)
+
+    def _handle(self, event: OutboxEvent, payload: Dict):
+        if event.event_type == OutboxEventType.TIMELINE_EVENT_ADDED:
+            startup = self.db.query(Startup).filter(Startup.id == payload['startup_id']).first()
+            if not startup:
+                return
+            # Rebuilt from the payload: the timeline row may have been edited or deleted since
+            timeline_event = TimelineEvent(
+                event_type=EventType(payload['event_type']),
+                title=payload['title'],
+                confidence=ConfidenceLevel(payload['confidence']),
+                impact_score=payload.get('impact_score')
+            )
+            self.signal_service.trigger_timeline_signal(startup, timeline_event, idempotency_key=event.id)
+
+        elif event.event_type == OutboxEventType.READINESS_SHIFT:
+            startup = self.db.query(Startup).filter(Startup.id == payload['startup_id']).first()
+            if not startup:
+                return
+            self.signal_service.trigger_readiness_shift(
+                startup, payload['old_band'], payload['new_band'], idempotency_key=event.id
+            )
+
+        elif event.event_type == OutboxEventType.MARKET_INTEREST:
+            self.signal_service.trigger_market_interest(payload['startup_id'], idempotency_key=event.id)
+
+
+def dispatch_pending_events(max_batches: int = 10) -> int:
+    """Background job entry point: drain up to max_batches batches"""
+    db = SessionLocal()
+    handled = 0
+    try:
+        dispatcher = OutboxDispatcher(db)
+        for _ in range(max_batches):
+            count = dispatcher.dispatch_batch()
+            handled += count
+            if count < OUTBOX_BATCH_SIZE:
+                break
+    finally:
+        db.close()
+    return handled
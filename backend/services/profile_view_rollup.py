@@ -0,0 +1,149 @@
+"""
+Profile View Rollups
+Raw profile_views rows are folded into profile_view_daily (one row per startup,
+UTC day and view type, with a view count and a HyperLogLog sketch of distinct
+investors, plus an ALL_VIEW_TYPES row per startup and day that window reads
+use) by a background aggregator. The aggregator consumes raw rows in
+(viewed_at, id) order behind a watermark, PROFILE_VIEW_ROLLUP_LAG_SECONDS
+behind the clock so in-flight transactions land first.
+
+Raw rows older than PROFILE_VIEW_RAW_RETENTION_DAYS are deleted once they are
+behind the watermark.
+"""
+
+import logging
+import os
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session
+
+from db.database import SessionLocal
+from db.upsert import insert_ignore_duplicates
+from models.models import ProfileView, ProfileViewDaily, RollupWatermark
+from services.hyperloglog import HyperLogLog
+
+logger = logging.getLogger(__name__)
+
+PROFILE_VIEW_ROLLUP_SECONDS = float(os.getenv("PROFILE_VIEW_ROLLUP_SECONDS", "300"))
+PROFILE_VIEW_ROLLUP_LAG_SECONDS = int(os.getenv("PROFILE_VIEW_ROLLUP_LAG_SECONDS", "300"))
+PROFILE_VIEW_ROLLUP_BATCH_SIZE = int(os.getenv("PROFILE_VIEW_ROLLUP_BATCH_SIZE", "5000"))
+PROFILE_VIEW_RAW_RETENTION_DAYS = int(os.getenv("PROFILE_VIEW_RAW_RETENTION_DAYS", "30"))
+
+WATERMARK_NAME = "profile_view_daily"
+
+# view_type of the per-day row covering every view type
+ALL_VIEW_TYPES = "all"
+
+
+def record_profile_view(db: Session, investor_id: str, startup_id: str, view_type: str):
+    """Log one raw view (caller commits); the aggregator rolls it up"""
+    db.add(ProfileView(investor_id=investor_id, startup_id=startup_id, view_type=view_type))
+
+
+def _claim_watermark(db: Session) -> RollupWatermark:
+    insert_ignore_duplicates(db, RollupWatermark, [{"name": WATERMARK_NAME}], index_elements=["name"])
+    # Row lock serializes aggregators on Postgres
+    return db.query(RollupWatermark).filter(
+        RollupWatermark.name == WATERMARK_NAME
+    ).with_for_update().one()
+
+
+def aggregate_batch(db: Session, upto: datetime, batch_size: int = PROFILE_VIEW_ROLLUP_BATCH_SIZE) -> int:
+    """Fold the next batch of raw views (viewed_at <= upto) into the daily rollup"""
+    watermark = _claim_watermark(db)
+    query = db.query(
+        ProfileView.id, ProfileView.investor_id, ProfileView.startup_id, ProfileView.view_type, ProfileView.viewed_at
+    ).filter(ProfileView.viewed_at <= upto)
+    if watermark.watermark_at is not None:
+        query = query.filter(
+            tuple_(ProfileView.viewed_at, ProfileView.id) > tuple_(watermark.watermark_at, watermark.watermark_id)
+        )
+    rows = query.order_by(ProfileView.viewed_at, ProfileView.id).limit(batch_size).all()
+    if not rows:
+        db.commit()
+        return 0
+
+    groups: Dict[Tuple[str, date, str], List] = {}
+    for row in rows:
+        if not row.startup_id:
+            continue
+        for view_type in (row.view_type or "unknown", ALL_VIEW_TYPES):
+            group = groups.setdefault((row.startup_id, row.viewed_at.date(), view_type), [0, HyperLogLog()])
+            group[0] += 1
+            if row.investor_id:
+                group[1].add(row.investor_id)
+
+    if groups:
+        existing = {
+            (daily.startup_id, daily.day, daily.view_type): daily
+            for daily in db.query(ProfileViewDaily).filter(
+                ProfileViewDaily.startup_id.in_({startup_id for startup_id, _, _ in groups}),
+                ProfileViewDaily.day.in_({day for _, day, _ in groups})
+            )
+        }
+        for (startup_id, day, view_type), (count, sketch) in groups.items():
+            daily = existing.get((startup_id, day, view_type))
+            if daily is None:
+                daily = ProfileViewDaily(startup_id=startup_id, day=day, view_type=view_type, view_count=0)
+                db.add(daily)
+            else:
+                sketch.merge(HyperLogLog.from_bytes(daily.investor_sketch))
+            daily.view_count += count
+            daily.investor_sketch = sketch.to_bytes()
+            daily.unique_investors = sketch.count()
+
+    watermark.watermark_at = rows[-1].viewed_at
+    watermark.watermark_id = rows[-1].id
+    db.commit()
+    return len(rows)
+
+
+def compact_raw_views(db: Session, now: Optional[datetime] = None) -> int:
+    """Delete raw views past retention that the aggregator has already consumed"""
+    watermark = db.get(RollupWatermark, WATERMARK_NAME)
+    if watermark is None or watermark.watermark_at is None:
+        return 0
+    horizon = min(
+        (now or datetime.utcnow()) - timedelta(days=PROFILE_VIEW_RAW_RETENTION_DAYS),
+        watermark.watermark_at
+    )
+    deleted = db.query(ProfileView).filter(
+        ProfileView.viewed_at < horizon
+    ).delete(synchronize_session=False)
+    db.commit()
+    return deleted
+
+
+def rollup_window(db: Session, startup_id: str, start_day: date, end_day: date) -> Tuple[int, int]:
+    """(views, approximate unique investors) for a startup over [start_day, end_day]; one row per day"""
+    days = db.query(ProfileViewDaily.view_count, ProfileViewDaily.investor_sketch).filter(
+        ProfileViewDaily.startup_id == startup_id,
+        ProfileViewDaily.view_type == ALL_VIEW_TYPES,
+        ProfileViewDaily.day >= start_day,
+        ProfileViewDaily.day <= end_day
+    ).all()
+    sketch = HyperLogLog()
+    for _, investor_sketch in days:
+        sketch.merge(HyperLogLog.from_bytes(investor_sketch))
+    return sum(count for count, _ in days), (sketch.count() if days else 0)
+
+
+def run_profile_view_rollup(max_batches: int = 20) -> int:
+    """Background job entry point: aggregate what's behind the lag, then compact"""
+    db = SessionLocal()
+    handled = 0
+    try:
+        upto = datetime.utcnow() - timedelta(seconds=PROFILE_VIEW_ROLLUP_LAG_SECONDS)
+        for _ in range(max_batches):
+            count = aggregate_batch(db, upto)
+            handled += count
+            if count < PROFILE_VIEW_ROLLUP_BATCH_SIZE:
+                break
+        compacted = compact_raw_views(db)
+        if handled or compacted:
+            logger.info(f"Profile view rollup: aggregated {handled}, compacted {compacted}")
+    finally:
+        db.close()
+    return handled
@@ -0,0 +1,151 @@
+"""
+Readiness History
+Every readiness recomputation that changes a startup's scores is applied to
+the Startup row and appended to readiness_scores. Consecutive identical
+results are not appended; the series is a step function.
+
+The downsampling job keeps raw points for READINESS_HISTORY_RAW_DAYS, then one
+point per UTC day (the last of the day), then one per ISO week after
+READINESS_HISTORY_DAILY_DAYS. Buckets are only compacted once they are
+entirely past the cutoff.
+"""
+
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from db.database import SessionLocal
+from models.models import ReadinessBand, ReadinessScore, Startup
+
+logger = logging.getLogger(__name__)
+
+READINESS_HISTORY_RAW_DAYS = int(os.getenv("READINESS_HISTORY_RAW_DAYS", "30"))
+READINESS_HISTORY_DAILY_DAYS = int(os.getenv("READINESS_HISTORY_DAILY_DAYS", "365"))
+READINESS_HISTORY_DOWNSAMPLE_SECONDS = float(os.getenv("READINESS_HISTORY_DOWNSAMPLE_SECONDS", "86400"))
+
+RESOLUTIONS = ("raw", "daily", "weekly")
+
+SUB_SCORES = ('execution_score', 'traction_score', 'market_score', 'team_score', 'capital_efficiency_score')
+
+
+def persist_readiness(db: Session, startup: Startup, result: Dict) -> bool:
+    """
+    Apply a calculate_readiness result to the startup (caller commits) and
+    append it to the history if anything changed. Returns True if appended.
+    """
+    band = ReadinessBand(result['band'])
+    current = (startup.readiness_score, startup.readiness_band, *(getattr(startup, field) for field in SUB_SCORES))
+    new = (result['score'], band, *(result.get(field, 0) for field in SUB_SCORES))
+    if current == new:
+        return False
+
+    startup.readiness_score = result['score']
+    startup.readiness_band = band
+    for field in SUB_SCORES:
+        setattr(startup, field, result.get(field, 0))
+    db.add(ReadinessScore(
+        startup_id=startup.id,
+        score=result['score'],
+        confidence_band=10,  # Default
+        **{field: result.get(field, 0) for field in SUB_SCORES}
+    ))
+    return True
+
+
+def bucket_of(at: datetime, resolution: str):
+    """Bucket key of a timestamp at a resolution (the timestamp itself for raw)"""
+    if resolution == "daily":
+        return at.date()
+    if resolution == "weekly":
+        return at.date() - timedelta(days=at.weekday())
+    return at
+
+
+def downsample(db: Session, target: str, cutoff: datetime, batch_startups: int = 100) -> int:
+    """
+    Collapse points finer than target and older than cutoff to the last point
+    per target bucket. cutoff must be a bucket boundary. Returns rows deleted.
+    """
+    finer = RESOLUTIONS[:RESOLUTIONS.index(target)]
+    startup_ids = [startup_id for (startup_id,) in db.query(ReadinessScore.startup_id).filter(
+        ReadinessScore.resolution.in_(finer),
+        ReadinessScore.calculated_at < cutoff
+    ).distinct()]
+
+    deleted = 0
+    for i in range(0, len(startup_ids), batch_startups):
+        for startup_id in startup_ids[i:i + batch_startups]:
+            rows = db.query(ReadinessScore.id, ReadinessScore.calculated_at).filter(
+                ReadinessScore.startup_id == startup_id,
+                ReadinessScore.resolution.in_(finer),
+                ReadinessScore.calculated_at < cutoff
+            ).order_by(ReadinessScore.calculated_at, ReadinessScore.id).all()
+
+            last_in_bucket = {}
+            for row in rows:
+                last_in_bucket[bucket_of(row.calculated_at, target)] = row.id
+            keep = set(last_in_bucket.values())
+            drop = [row.id for row in rows if row.id not in keep]
+            for j in range(0, len(drop), 500):
+                db.query(ReadinessScore).filter(
+                    ReadinessScore.id.in_(drop[j:j + 500])
+                ).delete(synchronize_session=False)
+            db.query(ReadinessScore).filter(
+                ReadinessScore.id.in_(keep)
+            ).update({ReadinessScore.resolution: target}, synchronize_session=False)
+            deleted += len(drop)
+        db.commit()
+    return deleted
+
+
+def downsample_readiness_history(now: Optional[datetime] = None) -> int:
+    """Background job entry point: raw -> daily -> weekly; returns rows deleted"""
+    now = now or datetime.utcnow()
+    daily_cutoff = datetime.combine((now - timedelta(days=READINESS_HISTORY_RAW_DAYS)).date(), datetime.min.time())
+    weekly_day = (now - timedelta(days=READINESS_HISTORY_DAILY_DAYS)).date()
+    weekly_cutoff = datetime.combine(weekly_day - timedelta(days=weekly_day.weekday()), datetime.min.time())
+
+    db = SessionLocal()
+    try:
+        deleted = downsample(db, "daily", daily_cutoff) + downsample(db, "weekly", weekly_cutoff)
+        if deleted:
+            logger.info(f"Readiness history downsampled: {deleted} points removed")
+        return deleted
+    finally:
+        db.close()
+
+
+def history_points(
+    db: Session,
+    startup_id: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    resolution: str = "raw",
+    limit: int = 100
+) -> List[ReadinessScore]:
+    """
+    Newest-first history in [start, end], at most one point (the latest) per
+    resolution bucket. Points already stored coarser are returned as stored.
+    """
+    query = db.query(ReadinessScore).filter(ReadinessScore.startup_id == startup_id)
+    if start is not None:
+        query = query.filter(ReadinessScore.calculated_at >= start)
+    if end is not None:
+        query = query.filter(ReadinessScore.calculated_at <= end)
+    query = query.order_by(ReadinessScore.calculated_at.desc(), ReadinessScore.id.desc())
+    if resolution == "raw":
+        return query.limit(limit).all()
+
+    points, seen = [], set()
+    for score in query.yield_per(500):
+        bucket = bucket_of(score.calculated_at, resolution)
+        if bucket in seen:
+            continue
+        if len(points) == limit:
+            break
+        seen.add(bucket)
+        points.append(score)
+    return points
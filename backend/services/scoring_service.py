@@ -4,13 +4,84 @@ Orchestrates all three models: Readiness, Fit, and Public Review
 """
 
 from typing import Dict, List, Optional, Tuple
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+import hashlib
 import json
 
-from ml.readiness_model import get_readiness_model
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from db.json_columns import json_dict, json_list
+from ml.readiness_model import get_readiness_model, event_bucket_counts, EVENT_TYPE_BUCKETS
 from ml.fit_model import get_fit_model
 from ml.public_review_model import get_public_review_model
-from models.models import Startup, TimelineEvent, Investor
+from models.models import Startup, TimelineEvent, Investor, EventType
+
+_unmapped = {event_type.value for event_type in EventType} - set(EVENT_TYPE_BUCKETS)
+if _unmapped:
+    raise RuntimeError(f"EventType values without a readiness feature bucket: {sorted(_unmapped)}")
+
+# Startup attributes read by ScoringService.readiness_inputs
+READINESS_INPUT_FIELDS = (
+    'metrics', 'team_size', 'founder_role', 'time_commitment', 'prev_startup_exp', 'experience_years',
+    'cofounder_count', 'is_incorporated', 'mau_range', 'user_growth_rate', 'revenue_status', 'revenue_range',
+    'retention_level', 'customer_type', 'market_size', 'monetization_model', 'competition_level',
+    'next_milestone', 'current_bottleneck', 'fundraising_intent', 'target_raise_stage'
+)
+
+# session.info flag: a memo was refreshed in this transaction
+_MEMO_REFRESHED_KEY = "readiness_memo_refreshed"
+
+
+def timeline_aggregate(timeline_events: List[TimelineEvent]) -> Tuple[int, Dict[str, int], Optional[date]]:
+    """(event count, count per EventType value, latest event_date)"""
+    event_type_counts = {}
+    for event in timeline_events:
+        event_type_counts[event.event_type.value] = event_type_counts.get(event.event_type.value, 0) + 1
+    last_event_date = max(e.event_date for e in timeline_events) if timeline_events else None
+    return len(timeline_events), event_type_counts, last_event_date
+
+
+def days_since_last_event(event_count: int, last_event_date: Optional[date], today: Optional[date] = None) -> int:
+    """calculate_readiness's days_since_last_event (999 without events)"""
+    if not event_count:
+        return 999
+    return ((today or datetime.now().date()) - last_event_date).days
+
+
+def readiness_fingerprint(
+    startup,
+    event_count: int,
+    event_type_counts: Dict[str, int],
+    recency_key: int,
+    version: str
+) -> str:
+    """
+    Stable hash of everything calculate_readiness sees for a startup, plus the
+    model version. Recency enters as the model's recency_key, so the
+    fingerprint only changes with the date when the score can.
+    """
+    payload = json.dumps({
+        'version': version,
+        'profile': [getattr(startup, field) for field in READINESS_INPUT_FIELDS],
+        'timeline': [event_count, sorted(event_type_counts.items()), recency_key]
+    }, default=str, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def save_readiness_memo(db: Session):
+    """
+    Commit a memo that a read path just refreshed, so later reads hit it
+    (nothing to do on a hit). Call it last: committing expires the session.
+    """
+    if db.info.get(_MEMO_REFRESHED_KEY):
+        db.commit()
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _forget_memo_refresh(session, transaction):
+    if transaction.parent is None:
+        session.info.pop(_MEMO_REFRESHED_KEY, None)
 
 
 class ScoringService:
@@ -22,24 +93,67 @@ class ScoringService:
         self.public_review_model = get_public_review_model()
     
     def calculate_startup_readiness(self, startup: Startup, timeline_events: List[TimelineEvent]) -> Dict:
-        """Calculate current readiness estimation for a startup (signal-based evaluation)"""
+        """
+        Calculate current readiness estimation for a startup (signal-based evaluation).
+        Memoized on the startup: if the fingerprint of the inputs matches
+        startup.readiness_fingerprint, the stored result is returned as is.
+        """
+        return self.calculate_startup_readiness_from_aggregate(startup, *timeline_aggregate(timeline_events))
+    
+    def calculate_startup_readiness_from_aggregate(
+        self,
+        startup: Startup,
+        event_count: int,
+        event_type_counts: Dict[str, int],
+        last_event_date: Optional[date]
+    ) -> Dict:
+        """calculate_startup_readiness from a timeline aggregate (see services.timeline_stats)"""
+        aggregate = (event_count, event_type_counts, last_event_date)
+        version = self.readiness_model.version
+        if version is None:
+            return self.readiness_model.calculate_readiness(**self.readiness_inputs_from_aggregates(startup, *aggregate))
+        
+        recency = self.readiness_model.recency_key(days_since_last_event(event_count, last_event_date))
+        fingerprint = readiness_fingerprint(startup, event_count, event_type_counts, recency, version=version)
+        cached = json_dict(startup.readiness_cache)
+        if startup.readiness_fingerprint == fingerprint and cached:
+            return dict(cached)
+        
+        # Call enhanced readiness model with comprehensive data
+        result = self.readiness_model.calculate_readiness(**self.readiness_inputs_from_aggregates(startup, *aggregate))
+        startup.readiness_fingerprint = fingerprint
+        startup.readiness_cache = dict(result)
+        session = object_session(startup)
+        if session is not None:
+            session.info[_MEMO_REFRESHED_KEY] = True
+        return result
+    
+    def readiness_inputs(self, startup: Startup, timeline_events: List[TimelineEvent]) -> Dict:
+        """calculate_readiness keyword arguments for a startup (also the batch encoder's input)"""
+        return self.readiness_inputs_from_aggregates(startup, *timeline_aggregate(timeline_events))
+    
+    def readiness_inputs_from_aggregates(
+        self,
+        startup,
+        event_count: int,
+        event_type_counts: Dict[str, int],
+        last_event_date,
+        today=None
+    ) -> Dict:
+        """
+        readiness_inputs from a timeline aggregate (event count, count per
+        EventType value, latest event_date) instead of the events themselves.
+        startup may be any object with the READINESS_INPUT_FIELDS attributes.
+        """
         
         # Process timeline events
-        event_types = {'team': 0, 'product': 0, 'traction': 0, 'capital': 0}
-        for event in timeline_events:
-            event_type_key = event.event_type.value
-            if event_type_key in event_types:
-                event_types[event_type_key] += 1
+        event_types = event_bucket_counts(event_type_counts)
         
         # Calculate days since last event
-        if timeline_events:
-            last_event_date = max(e.event_date for e in timeline_events)
-            days_since_last = (datetime.now().date() - last_event_date).days
-        else:
-            days_since_last = 999
+        days_since_last = days_since_last_event(event_count, last_event_date, today)
         
         # Get legacy metrics for backward compatibility
-        metrics = json.loads(startup.metrics) if startup.metrics else {}
+        metrics = json_dict(startup.metrics)
         traction_bucket = metrics.get('users_bucket', startup.mau_range or '0-100')
         burn_bucket = metrics.get('burn_bucket', 'medium')
         
@@ -78,21 +192,18 @@ class ScoringService:
             'target_raise_stage': startup.target_raise_stage
         }
         
-        # Call enhanced readiness model with comprehensive data
-        result = self.readiness_model.calculate_readiness(
-            timeline_event_count=len(timeline_events),
-            days_since_last_event=days_since_last,
-            event_types=event_types,
-            team_size=startup.team_size or "1-2",
-            traction_bucket=traction_bucket,
-            burn_bucket=burn_bucket,
-            founder_data=founder_data,
-            traction_data=traction_data,
-            market_data=market_data,
-            roadmap_data=roadmap_data
-        )
-        
-        return result
+        return {
+            'timeline_event_count': event_count,
+            'days_since_last_event': days_since_last,
+            'event_types': event_types,
+            'team_size': startup.team_size or "1-2",
+            'traction_bucket': traction_bucket,
+            'burn_bucket': burn_bucket,
+            'founder_data': founder_data,
+            'traction_data': traction_data,
+            'market_data': market_data,
+            'roadmap_data': roadmap_data
+        }
     
     def calculate_public_review(self, startup: Startup) -> Dict:
         """Calculate public review score"""
@@ -110,13 +221,17 @@ class ScoringService:
         self,
         investor: Investor,
         startup: Startup,
-        startup_readiness_band: str
+        startup_readiness_band: str,
+        pattern_similarity: Optional[float] = None
     ) -> float:
-        """Calculate fit score between investor and startup"""
+        """
+        Calculate fit score between investor and startup. pattern_similarity
+        comes from services.embedding_index.candidate_pattern_similarities.
+        """
         
         # Parse investor preferences
-        stage_pref = json.loads(investor.stage_focus) if investor.stage_focus else []
-        sector_pref = json.loads(investor.sector_focus) if investor.sector_focus else []
+        stage_pref = json_list(investor.stage_focus)
+        sector_pref = json_list(investor.sector_focus)
         check_size_range = (investor.check_size_min, investor.check_size_max)
         
         # Get startup funding raised (would come from capital events)
@@ -129,7 +244,8 @@ class ScoringService:
             investor_stage_preference=stage_pref,
             investor_sector_preference=sector_pref,
             check_size_range=check_size_range,
-            startup_funding_raised=startup_funding
+            startup_funding_raised=startup_funding,
+            pattern_similarity=pattern_similarity
         )
     
     def detect_execution_gap(self, timeline_events: List[TimelineEvent], threshold_days: int = 90) -> Optional[Dict]:
@@ -0,0 +1,120 @@
+"""
+In-process Signal Broker
+Pub/sub between signal writers (request handlers, the outbox dispatcher thread)
+and connected feed streams. Publishing is thread-safe; each subscriber is an
+asyncio queue bound to the event loop that created it.
+
+Signals are published only after the transaction that wrote them commits.
+The broker lives in one process and gives that process's streams immediate
+delivery. Signals written elsewhere (scripts/run_worker.py, another API
+replica) reach a stream through its poll of the user's feed version row
+(api/feed.py, STREAM_POLL_SECONDS); clients resume from the DB
+(Last-Event-ID) on reconnect.
+"""
+
+import asyncio
+import logging
+import threading
+from typing import Dict, List, Set
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+SUBSCRIBER_QUEUE_SIZE = 100
+
+# Sentinel pushed to a subscriber whose queue overflowed: the stream closes and
+# the client reconnects, replaying what it missed from the DB
+RESYNC = object()
+
+_PENDING_KEY = "pending_signal_pushes"
+
+
+class Subscription:
+    def __init__(self, user_id: str):
+        self.user_id = user_id
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+
+    def _deliver(self, payload: Dict):
+        try:
+            self.queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            # Drop the backlog and ask the client to resync from the DB
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+
+
+class SignalBroker:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+
+    def subscribe(self, user_id: str) -> Subscription:
+        """Must be called from the event loop that will consume the subscription"""
+        subscription = Subscription(user_id)
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.user_id)
+            if subscribers:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.user_id]
+
+    def publish(self, payloads: List[Dict]):
+        """Deliver signal payloads (each with a user_id) to that user's open streams"""
+        with self._lock:
+            targets = [
+                (subscription, payload)
+                for payload in payloads
+                for subscription in self._subscribers.get(payload['user_id'], ())
+            ]
+        for subscription, payload in targets:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._deliver, payload)
+            except RuntimeError:
+                # Loop already closed - the stream is gone
+                self.unsubscribe(subscription)
+
+
+signal_broker = SignalBroker()
+
+
+def queue_signal_push(db: Session, payloads: List[Dict]):
+    """Stage payloads on the session; they are published when it commits"""
+    db.info.setdefault(_PENDING_KEY, []).extend(payloads)
+
+
+def pending_push_count(db: Session) -> int:
+    return len(db.info.get(_PENDING_KEY, ()))
+
+
+def discard_pending_pushes(db: Session, keep: int = 0):
+    """Drop staged payloads past `keep` (e.g. after a savepoint rollback)"""
+    pending = db.info.get(_PENDING_KEY)
+    if pending:
+        del pending[keep:]
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_after_commit(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        try:
+            signal_broker.publish(pending)
+        except Exception as e:
+            logger.error(f"Signal push failed: {e}")
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_after_rollback(session, transaction):
+    # Only the outermost transaction: a savepoint rollback leaves the rest of the
+    # session's pushes staged (callers trim their own with discard_pending_pushes)
+    if transaction.parent is None:
+        session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,157 @@
+"""
+Signal Retention & Archival
+signal_events only keeps the hot window (SIGNAL_HOT_DAYS). Older signals are
+moved, oldest first, into gzip-compressed JSON Lines files grouped by month:
+
+    <SIGNAL_ARCHIVE_DIR>/<YYYY-MM>/<run>-<batch>.jsonl.gz
+
+Each batch is written and fsynced before its rows are deleted. A crash between
+the two can leave a row in both places, so archive readers dedupe by id.
+Monthly archive directories older than SIGNAL_ARCHIVE_RETENTION_DAYS are
+removed (0 keeps them forever).
+"""
+
+import gzip
+import json
+import logging
+import os
+import shutil
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional
+
+from sqlalchemy.orm import Session
+
+from db.database import SessionLocal
+from models.models import SignalEvent
+from services.feed_cache import mark_feed_dirty
+
+logger = logging.getLogger(__name__)
+
+SIGNAL_HOT_DAYS = int(os.getenv("SIGNAL_HOT_DAYS", "90"))
+SIGNAL_ARCHIVE_DIR = os.getenv("SIGNAL_ARCHIVE_DIR", os.path.join(".", "archive", "signals"))
+SIGNAL_ARCHIVE_RETENTION_DAYS = int(os.getenv("SIGNAL_ARCHIVE_RETENTION_DAYS", "0"))
+SIGNAL_ARCHIVE_BATCH_SIZE = int(os.getenv("SIGNAL_ARCHIVE_BATCH_SIZE", "5000"))
+SIGNAL_ARCHIVE_INTERVAL_SECONDS = float(os.getenv("SIGNAL_ARCHIVE_INTERVAL_SECONDS", "3600"))
+
+
+def archived_row(signal: SignalEvent) -> Dict:
+    return {
+        "id": signal.id,
+        "user_id": signal.user_id,
+        "user_type": signal.user_type,
+        "startup_id": signal.startup_id,
+        "signal_type": signal.signal_type.value,
+        "severity": signal.severity.value,
+        "headline": signal.headline,
+        "explanation": signal.explanation,
+        "evidence": signal.evidence,
+        "created_at": signal.created_at.isoformat() if signal.created_at else None,
+        "occurrence_count": signal.occurrence_count,
+        "last_occurred_at": signal.last_occurred_at.isoformat() if signal.last_occurred_at else None
+    }
+
+
+class SignalArchiver:
+    """Moves signals older than the hot window out of signal_events"""
+
+    def __init__(self, db: Session, archive_dir: str = SIGNAL_ARCHIVE_DIR, hot_days: int = SIGNAL_HOT_DAYS):
+        self.db = db
+        self.archive_dir = archive_dir
+        self.hot_days = hot_days
+        self.run_id = f"{datetime.utcnow():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+
+    def cutoff(self) -> datetime:
+        return datetime.utcnow() - timedelta(days=self.hot_days)
+
+    def archive_batch(self, batch_size: int = SIGNAL_ARCHIVE_BATCH_SIZE, dry_run: bool = False) -> int:
+        """Archive one batch of the oldest expired signals. Returns the number moved."""
+        # Served by ix_signal_events_created_at; on Postgres concurrent archivers skip each other's rows
+        signals = self.db.query(SignalEvent).filter(
+            SignalEvent.created_at < self.cutoff()
+        ).order_by(
+            SignalEvent.created_at, SignalEvent.id
+        ).limit(batch_size).with_for_update(skip_locked=True).all()
+
+        if not signals or dry_run:
+            self.db.rollback()
+            return len(signals)
+
+        by_month: Dict[str, List[Dict]] = {}
+        for signal in signals:
+            by_month.setdefault(f"{signal.created_at:%Y-%m}", []).append(archived_row(signal))
+
+        batch_id = uuid.uuid4().hex[:8]
+        for month, rows in by_month.items():
+            self._write_file(month, batch_id, rows)
+
+        self.db.query(SignalEvent).filter(
+            SignalEvent.id.in_([signal.id for signal in signals])
+        ).delete(synchronize_session=False)
+        mark_feed_dirty(self.db, {signal.user_id for signal in signals})
+        self.db.commit()
+        return len(signals)
+
+    def _write_file(self, month: str, batch_id: str, rows: List[Dict]):
+        month_dir = os.path.join(self.archive_dir, month)
+        os.makedirs(month_dir, exist_ok=True)
+        path = os.path.join(month_dir, f"{self.run_id}-{batch_id}.jsonl.gz")
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as raw:
+            with gzip.GzipFile(fileobj=raw, mode="wb") as f:
+                for row in rows:
+                    f.write((json.dumps(row) + "\n").encode())
+            raw.flush()
+            os.fsync(raw.fileno())
+        # Readers never see a half-written file
+        os.replace(tmp_path, path)
+
+    def prune_archives(self, retention_days: int = SIGNAL_ARCHIVE_RETENTION_DAYS) -> List[str]:
+        """Delete monthly archive directories that ended before the retention horizon"""
+        if retention_days <= 0 or not os.path.isdir(self.archive_dir):
+            return []
+        horizon = f"{datetime.utcnow() - timedelta(days=retention_days):%Y-%m}"
+        removed = []
+        for month in sorted(os.listdir(self.archive_dir)):
+            if len(month) == 7 and month < horizon:
+                shutil.rmtree(os.path.join(self.archive_dir, month))
+                removed.append(month)
+        return removed
+
+
+def read_archived_signals(month: str, user_id: Optional[str] = None,
+                          archive_dir: str = SIGNAL_ARCHIVE_DIR) -> Iterator[Dict]:
+    """Archived signals for one month (YYYY-MM), optionally for one user, deduped by id"""
+    month_dir = os.path.join(archive_dir, month)
+    if not os.path.isdir(month_dir):
+        return
+    seen = set()
+    for name in sorted(os.listdir(month_dir)):
+        if not name.endswith(".jsonl.gz"):
+            continue
+        with gzip.open(os.path.join(month_dir, name), "rt") as f:
+            for line in f:
+                row = json.loads(line)
+                if row["id"] in seen or (user_id and row["user_id"] != user_id):
+                    continue
+                seen.add(row["id"])
+                yield row
+
+
+def archive_expired_signals(max_batches: int = 20) -> int:
+    """Background job entry point: archive up to max_batches batches, then prune old archives"""
+    db = SessionLocal()
+    moved = 0
+    try:
+        archiver = SignalArchiver(db)
+        for _ in range(max_batches):
+            count = archiver.archive_batch()
+            moved += count
+            if count < SIGNAL_ARCHIVE_BATCH_SIZE:
+                break
+        removed = archiver.prune_archives()
+        if moved or removed:
+            logger.info(f"Archived {moved} signals; pruned archive months {removed}")
+    finally:
+        db.close()
+    return moved
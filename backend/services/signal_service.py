@@ -1,8 +1,46 @@
+from sqlalchemy import insert, func
 from sqlalchemy.orm import Session
-from models.models import SignalEvent, SignalType, SignalSeverity, User, UserRole, Startup, Investor, TimelineEvent, WatchlistEntry, InvestorInterest, Story
-from datetime import datetime, timedelta
+from typing import Dict, List
+from db.upsert import insert_ignore_duplicates
+from services.signal_broker import queue_signal_push
+from services.feed_cache import mark_feed_dirty
+from services.interest_rollup import (
+    interest_in_window, claim_market_interest_alert, MARKET_INTEREST_THRESHOLD, MARKET_INTEREST_WINDOW_DAYS
+)
+from models.models import SignalEvent, SignalType, SignalSeverity, User, UserRole, Startup, Investor, TimelineEvent, WatchlistEntry, Story
+from datetime import date, datetime, timedelta
+import os
 import uuid
 
+# Repeats of the same startup/type signal within this window update one row
+SIGNAL_DIGEST_WINDOW_HOURS = int(os.getenv("SIGNAL_DIGEST_WINDOW_HOURS", "24"))
+# New non-HIGH signals an investor can receive per UTC day
+SIGNAL_DAILY_BUDGET = int(os.getenv("SIGNAL_DAILY_BUDGET", "10"))
+
+# Signals materialized from outbox events get deterministic ids, so replaying an
+# event can never insert the same signal twice
+SIGNAL_ID_NAMESPACE = uuid.UUID("6f1c2a52-3b8e-4d57-9a0e-5c4f7d9b2e11")
+
+def make_signal_id(idempotency_key: str, user_id: str) -> str:
+    return str(uuid.uuid5(SIGNAL_ID_NAMESPACE, f"{idempotency_key}:{user_id}"))
+
+def signal_push_payload(row: dict) -> dict:
+    """JSON-safe signal fields for the live feed stream"""
+    return {
+        "id": row["id"],
+        "user_id": row["user_id"],
+        "user_type": row["user_type"],
+        "startup_id": row["startup_id"],
+        "signal_type": row["signal_type"].value,
+        "severity": row["severity"].value,
+        "headline": row["headline"],
+        "explanation": row["explanation"],
+        "evidence": row["evidence"],
+        "created_at": row["created_at"].isoformat(),
+        "occurrence_count": row.get("occurrence_count", 1),
+        "last_occurred_at": row["last_occurred_at"].isoformat() if row.get("last_occurred_at") else None
+    }
+
 class SignalService:
     def __init__(self, db: Session):
         self.db = db
@@ -16,42 +54,225 @@ class SignalService:
         headline: str,
         explanation: str,
         evidence: str,
-        startup_id: str = None
+        startup_id: str = None,
+        commit: bool = True,
+        idempotency_key: str = None
     ):
-        """Creates an immutable signal event"""
-        signal = SignalEvent(
-            user_id=user_id,
-            user_type=user_type,
-            startup_id=startup_id,
-            signal_type=signal_type,
-            severity=severity,
-            headline=headline,
-            explanation=explanation,
-            evidence=evidence
+        """
+        Creates a signal event, or folds it into the user's open digest for the
+        same startup/type. Returns None if the user's daily budget is spent.
+        """
+        signal_id = make_signal_id(idempotency_key, user_id) if idempotency_key else str(uuid.uuid4())
+        if idempotency_key:
+            existing = self.db.get(SignalEvent, signal_id)
+            if existing:
+                return existing
+
+        now = datetime.utcnow()
+        signal = None
+        digested = self._fold_into_digests(
+            [user_id], user_type, signal_type, severity, headline, explanation, evidence, startup_id, now
         )
-        self.db.add(signal)
-        self.db.commit()
+        if digested:
+            signal = self.db.get(SignalEvent, digested[user_id], populate_existing=True)
+        elif self._within_daily_budget([user_id], user_type, severity, now):
+            fields = {
+                "id": signal_id,
+                "user_id": user_id,
+                "user_type": user_type,
+                "startup_id": startup_id,
+                "signal_type": signal_type,
+                "severity": severity,
+                "headline": headline,
+                "explanation": explanation,
+                "evidence": evidence,
+                "created_at": now
+            }
+            signal = SignalEvent(**fields)
+            self.db.add(signal)
+            # Pushed to live feed streams (and the user's cached feed dropped) once the transaction commits
+            queue_signal_push(self.db, [signal_push_payload(fields)])
+            mark_feed_dirty(self.db, [user_id])
+        if commit:
+            self.db.commit()
         return signal
 
-    def trigger_timeline_signal(self, startup: Startup, event: TimelineEvent):
-        """Triggered when a founder adds a new timeline event"""
+    def fan_out_signal(
+        self,
+        user_ids: List[str],
+        user_type: str,
+        signal_type: SignalType,
+        severity: SignalSeverity,
+        headline: str,
+        explanation: str,
+        evidence: str,
+        startup_id: str = None,
+        idempotency_key: str = None
+    ) -> int:
+        """
+        Creates the same signal for many users with a single bulk INSERT.
+        Users with an open digest for this startup/type get it folded in instead,
+        and users over their daily budget are skipped.
+        Runs in the caller's transaction - nothing is committed here.
+        With an idempotency_key, signals that already exist are skipped. Digest
+        folds are not keyed: the outbox marks an event processed in the same
+        transaction, so each event is folded in at most once.
+        Returns the number of users notified.
+        """
+        user_ids = list(dict.fromkeys(user_ids))
+        if idempotency_key and user_ids:
+            ids = {make_signal_id(idempotency_key, user_id): user_id for user_id in user_ids}
+            delivered = {
+                signal_id for (signal_id,) in
+                self.db.query(SignalEvent.id).filter(SignalEvent.id.in_(list(ids)))
+            }
+            user_ids = [user_id for signal_id, user_id in ids.items() if signal_id not in delivered]
+        if not user_ids:
+            return 0
+
+        now = datetime.utcnow()
+        digested = self._fold_into_digests(
+            user_ids, user_type, signal_type, severity, headline, explanation, evidence, startup_id, now
+        )
+        user_ids = self._within_daily_budget(
+            [user_id for user_id in user_ids if user_id not in digested], user_type, severity, now
+        )
+        if not user_ids:
+            return len(digested)
+
+        rows = [
+            {
+                "id": make_signal_id(idempotency_key, user_id) if idempotency_key else str(uuid.uuid4()),
+                "user_id": user_id,
+                "user_type": user_type,
+                "startup_id": startup_id,
+                "signal_type": signal_type,
+                "severity": severity,
+                "headline": headline,
+                "explanation": explanation,
+                "evidence": evidence,
+                "created_at": now
+            }
+            for user_id in user_ids
+        ]
+        if idempotency_key:
+            # Replayed outbox events hit the deterministic ids and are skipped
+            insert_ignore_duplicates(self.db, SignalEvent, rows, index_elements=["id"])
+        else:
+            self.db.execute(insert(SignalEvent), rows)
+        queue_signal_push(self.db, [signal_push_payload(row) for row in rows])
+        mark_feed_dirty(self.db, user_ids)
+        return len(digested) + len(user_ids)
+
+    def _fold_into_digests(
+        self,
+        user_ids: List[str],
+        user_type: str,
+        signal_type: SignalType,
+        severity: SignalSeverity,
+        headline: str,
+        explanation: str,
+        evidence: str,
+        startup_id: str,
+        now: datetime
+    ) -> Dict[str, str]:
+        """
+        Bumps each user's open digest row (same startup, type and severity, first
+        seen within the digest window) to the latest wording.
+        Returns user_id -> digest signal id for the users that had one.
+        """
+        if not startup_id or not user_ids:
+            return {}
+
+        candidates = self.db.query(
+            SignalEvent.id, SignalEvent.user_id, SignalEvent.created_at, SignalEvent.occurrence_count
+        ).filter(
+            SignalEvent.user_id.in_(user_ids),
+            SignalEvent.startup_id == startup_id,
+            SignalEvent.signal_type == signal_type,
+            SignalEvent.severity == severity,
+            SignalEvent.created_at >= now - timedelta(hours=SIGNAL_DIGEST_WINDOW_HOURS)
+        ).order_by(SignalEvent.created_at.desc()).all()
+
+        digests = {}
+        for row in candidates:
+            digests.setdefault(row.user_id, row)
+        if not digests:
+            return {}
+
+        self.db.query(SignalEvent).filter(
+            SignalEvent.id.in_([row.id for row in digests.values()])
+        ).update({
+            SignalEvent.occurrence_count: SignalEvent.occurrence_count + 1,
+            SignalEvent.last_occurred_at: now,
+            SignalEvent.headline: headline,
+            SignalEvent.explanation: explanation,
+            SignalEvent.evidence: evidence
+        }, synchronize_session=False)
+
+        queue_signal_push(self.db, [
+            signal_push_payload({
+                "id": row.id,
+                "user_id": row.user_id,
+                "user_type": user_type,
+                "startup_id": startup_id,
+                "signal_type": signal_type,
+                "severity": severity,
+                "headline": headline,
+                "explanation": explanation,
+                "evidence": evidence,
+                "created_at": row.created_at,
+                "occurrence_count": (row.occurrence_count or 1) + 1,
+                "last_occurred_at": now
+            })
+            for row in digests.values()
+        ])
+        mark_feed_dirty(self.db, digests.keys())
+        return {user_id: row.id for user_id, row in digests.items()}
+
+    def _within_daily_budget(
+        self, user_ids: List[str], user_type: str, severity: SignalSeverity, now: datetime
+    ) -> List[str]:
+        """Investors get at most SIGNAL_DAILY_BUDGET new signals per UTC day; HIGH severity is exempt"""
+        if user_type != "investor" or severity == SignalSeverity.HIGH or not user_ids:
+            return user_ids
+
+        day_start = datetime(now.year, now.month, now.day)
+        counts = dict(
+            self.db.query(SignalEvent.user_id, func.count(SignalEvent.id)).filter(
+                SignalEvent.user_id.in_(user_ids),
+                SignalEvent.created_at >= day_start
+            ).group_by(SignalEvent.user_id).all()
+        )
+        return [user_id for user_id in user_ids if counts.get(user_id, 0) < SIGNAL_DAILY_BUDGET]
+
+    def get_watcher_user_ids(self, startup_id: str) -> List[str]:
+        """User ids of every investor watching a startup, resolved with one join"""
+        rows = self.db.query(Investor.user_id).join(
+            WatchlistEntry, WatchlistEntry.investor_id == Investor.id
+        ).filter(
+            WatchlistEntry.startup_id == startup_id,
+            Investor.user_id.isnot(None)
+        ).distinct().all()
+        return [user_id for (user_id,) in rows]
+
+    def trigger_timeline_signal(self, startup: Startup, event: TimelineEvent, idempotency_key: str = None):
+        """Triggered when a founder adds a new timeline event (caller commits)"""
         # Notify investors watching this startup
-        watchlist = self.db.query(WatchlistEntry).filter(WatchlistEntry.startup_id == startup.id).all()
-        for entry in watchlist:
-            investor = entry.investor
-            self.generate_signal(
-                user_id=investor.user_id,
-                user_type="investor",
-                signal_type=SignalType.TIMELINE_UPDATE,
-                severity=SignalSeverity.LOW,
-                headline=f"{startup.name}: New Execution Milestone",
-                explanation=f"{startup.name} added a new {event.event_type.value} event: {event.title}.",
-                evidence=f"Verification status: {event.confidence.value}. Impact score: {event.impact_score}/10.",
-                startup_id=startup.id
-            )
-
-    def trigger_readiness_shift(self, startup: Startup, old_band: str, new_band: str):
-        """Triggered when readiness band changes (e.g. Early -> Medium)"""
+        self.fan_out_signal(
+            user_ids=self.get_watcher_user_ids(startup.id),
+            user_type="investor",
+            signal_type=SignalType.TIMELINE_UPDATE,
+            severity=SignalSeverity.LOW,
+            headline=f"{startup.name}: New Execution Milestone",
+            explanation=f"{startup.name} added a new {event.event_type.value} event: {event.title}.",
+            evidence=f"Verification status: {event.confidence.value}. Impact score: {event.impact_score}/10.",
+            startup_id=startup.id,
+            idempotency_key=idempotency_key
+        )
+
+    def trigger_readiness_shift(self, startup: Startup, old_band: str, new_band: str, idempotency_key: str = None):
+        """Triggered when readiness band changes (e.g. Early -> Medium) (caller commits)"""
         # Founder feed
         self.generate_signal(
             user_id=startup.user_id,
@@ -61,28 +282,30 @@ class SignalService:
             headline=f"Readiness Upgrade: Now in {new_band} Band",
             explanation=f"Your execution pattern has moved from {old_band} to {new_band}. This significantly improves your visibility to Tier-1 investors.",
             evidence=f"Recent milestones and metric consistency have pushed your readiness score above threshold.",
-            startup_id=startup.id
+            startup_id=startup.id,
+            commit=False,
+            idempotency_key=idempotency_key
         )
 
         # Quality Pool Investors (Fit Score > 75 or Watchlist)
         # Note: In a real system we'd iterate over all relevant investors, 
         # but for this demo we'll target watchlist and active searchers
-        watchlist = self.db.query(WatchlistEntry).filter(WatchlistEntry.startup_id == startup.id).all()
-        for entry in watchlist:
-            investor = entry.investor
-            self.generate_signal(
-                user_id=investor.user_id,
-                user_type="investor",
-                signal_type=SignalType.READINESS_SHIFT,
-                severity=SignalSeverity.HIGH if new_band == "HIGH" else SignalSeverity.MEDIUM,
-                headline=f"{startup.name}: Readiness Threshold Crossed",
-                explanation=f"{startup.name} has moved into the {new_band} readiness band, indicating high execution maturity.",
-                evidence=f"System metrics confirm a consistent execution pattern over the last 90 days.",
-                startup_id=startup.id
-            )
-
-    def trigger_execution_gap(self, startup: Startup, gap_days: int):
+        self.fan_out_signal(
+            user_ids=self.get_watcher_user_ids(startup.id),
+            user_type="investor",
+            signal_type=SignalType.READINESS_SHIFT,
+            severity=SignalSeverity.HIGH if new_band == "HIGH" else SignalSeverity.MEDIUM,
+            headline=f"{startup.name}: Readiness Threshold Crossed",
+            explanation=f"{startup.name} has moved into the {new_band} readiness band, indicating high execution maturity.",
+            evidence=f"System metrics confirm a consistent execution pattern over the last 90 days.",
+            startup_id=startup.id,
+            idempotency_key=idempotency_key
+        )
+
+    def trigger_execution_gap(self, startup: Startup, gap_days: int, last_event_date: date = None,
+                              commit: bool = True, idempotency_key: str = None):
         """Triggered when an execution gap threshold is crossed"""
+        last_event_date = last_event_date or (datetime.utcnow().date() - timedelta(days=gap_days))
         # Founder feed (Internal Alarm)
         self.generate_signal(
             user_id=startup.user_id,
@@ -91,33 +314,73 @@ class SignalService:
             severity=SignalSeverity.HIGH,
             headline=f"Execution Gap Detected: {gap_days} Days",
             explanation=f"No significant milestones have been logged for over {gap_days} days. This creates a negative signal for watching investors.",
-            evidence=f"Last verified milestone was logged on {datetime.now() - timedelta(days=gap_days)}.",
-            startup_id=startup.id
+            evidence=f"Last verified milestone was logged on {last_event_date.isoformat()}.",
+            startup_id=startup.id,
+            commit=commit,
+            idempotency_key=idempotency_key
         )
 
-    def trigger_market_interest(self, startup_id: str):
-        """Triggered periodically to aggregate market interest (delayed/anonymous for founder)"""
-        startup = self.db.query(Startup).filter(Startup.id == startup_id).first()
-        if not startup: return
-
-        # Count recent activities (last 7 days)
-        last_week = datetime.now() - timedelta(days=7)
-        views = self.db.query(InvestorInterest).filter(
-            InvestorInterest.startup_id == startup_id,
-            InvestorInterest.created_at >= last_week
-        ).count()
-
-        if views >= 3:
-            self.generate_signal(
-                user_id=startup.user_id,
-                user_type="founder",
-                signal_type=SignalType.MARKET_INTEREST,
-                severity=SignalSeverity.LOW,
-                headline="Inbound Signal: Increased Market Interest",
-                explanation="Your execution timeline is attracting significant attention from relevant investors in your sector.",
-                evidence=f"{views} relevant discovery actions detected in the last 7 days. These actions are anonymous and aggregated.",
-                startup_id=startup.id
-            )
+    def trigger_execution_gaps(self, gaps: List[Dict]) -> int:
+        """
+        Bulk trigger_execution_gap for a sweep chunk (caller commits). Each gap
+        is a dict with startup_id, user_id, gap_days, last_event_date and
+        has_events; a startup without events is measured from its creation.
+        Signal ids derive from the gap, so a repeated gap inserts nothing.
+        Returns the number of signals written.
+        """
+        now = datetime.utcnow()
+        rows = [
+            {
+                "id": make_signal_id(f"execution-gap:{gap['startup_id']}:{gap['last_event_date'].isoformat()}", gap["user_id"]),
+                "user_id": gap["user_id"],
+                "user_type": "founder",
+                "startup_id": gap["startup_id"],
+                "signal_type": SignalType.EXECUTION_ALARM,
+                "severity": SignalSeverity.HIGH,
+                "headline": f"Execution Gap Detected: {gap['gap_days']} Days",
+                "explanation": f"No significant milestones have been logged for over {gap['gap_days']} days. This creates a negative signal for watching investors.",
+                "evidence": (
+                    f"Last verified milestone was logged on {gap['last_event_date'].isoformat()}."
+                    if gap["has_events"] else
+                    f"No milestones have been logged since the profile was created on {gap['last_event_date'].isoformat()}."
+                ),
+                "created_at": now
+            }
+            for gap in gaps if gap["user_id"]
+        ]
+        if not rows:
+            return 0
+        insert_ignore_duplicates(self.db, SignalEvent, rows, index_elements=["id"])
+        queue_signal_push(self.db, [signal_push_payload(row) for row in rows])
+        mark_feed_dirty(self.db, [row["user_id"] for row in rows])
+        return len(rows)
+
+    def trigger_market_interest(self, startup_id: str, idempotency_key: str = None):
+        """
+        Aggregated market interest (delayed/anonymous for founder) (caller commits)
+        Fires once per window when the startup's rolling interest count reaches the threshold.
+        """
+        now = datetime.utcnow()
+        views = interest_in_window(self.db, startup_id, now)
+        if views < MARKET_INTEREST_THRESHOLD:
+            return
+
+        founder_user_id = self.db.query(Startup.user_id).filter(Startup.id == startup_id).scalar()
+        if not founder_user_id or not claim_market_interest_alert(self.db, startup_id, now):
+            return
+
+        self.generate_signal(
+            user_id=founder_user_id,
+            user_type="founder",
+            signal_type=SignalType.MARKET_INTEREST,
+            severity=SignalSeverity.LOW,
+            headline="Inbound Signal: Increased Market Interest",
+            explanation="Your execution timeline is attracting significant attention from relevant investors in your sector.",
+            evidence=f"{views} relevant discovery actions detected in the last {MARKET_INTEREST_WINDOW_DAYS} days. These actions are anonymous and aggregated.",
+            startup_id=startup_id,
+            commit=False,
+            idempotency_key=idempotency_key
+        )
 
     def trigger_ecosystem_bottleneck(self, user_id: str, user_type: str, sector: str):
         """General ecosystem signal"""
@@ -0,0 +1,316 @@
+"""
+Startup Timeline Stats
+startup_timeline_stats keeps, per startup, what readiness scoring and gap
+detection read from the timeline: event count, latest event date, counts per
+EventType, and the largest gap between consecutive events. A before_flush
+listener applies each TimelineEvent insert, update or delete to the row
+(locked FOR UPDATE) in the same transaction, so scoring a timeline edit
+doesn't re-read the timeline.
+
+Each edit touches only the neighbours of the date it inserts or removes,
+found with ix_timeline_events_startup_date: inserting a date splits one gap,
+removing one merges two. Only shrinking or removing the current largest gap
+rescans the startup's dates.
+
+Rows are only written by timeline writes (a startup without one gets it
+built from its events on its first write) and by the reconcile job, which
+creates missing rows, e.g. for events written before this table existed,
+and repairs drift from writes that bypass the ORM unit of work. Reads of a
+startup still without a row build a transient one and don't store it.
+scripts/reconcile_timeline_stats.py runs the job on demand.
+"""
+
+import logging
+import os
+from collections import Counter
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event, func
+from sqlalchemy.orm import Session
+
+from db.database import SessionLocal
+from db.json_columns import json_dict
+from db.upsert import dialect_insert
+from models.models import EventType, StartupTimelineStats, TimelineEvent
+from services.ecosystem_counters import old_values, new_values, track_old_values
+
+logger = logging.getLogger(__name__)
+
+TIMELINE_STATS_RECONCILE_SECONDS = float(os.getenv("TIMELINE_STATS_RECONCILE_SECONDS", "86400"))
+
+TIMELINE_FIELDS = ("startup_id", "event_type", "event_date")
+
+# (sign, EventType value, event date)
+Delta = Tuple[int, str, date]
+
+# (days, start date) of the gap after start
+Gap = Tuple[int, date]
+
+
+def _type_value(event_type) -> str:
+    return EventType(event_type).value
+
+
+def _gap_key(gap: Gap):
+    """Longer gaps win; among equal ones, the earliest (as a sorted scan finds it first)"""
+    return gap[0], -gap[1].toordinal()
+
+
+def _largest_gap(dates: List[date]) -> Optional[Gap]:
+    """Largest gap between consecutive sorted dates"""
+    gaps = [((current - previous).days, previous) for previous, current in zip(dates, dates[1:])]
+    return max(gaps, key=_gap_key, default=None)
+
+
+def _set_largest_gap(stats: StartupTimelineStats, gap: Optional[Gap]):
+    stats.largest_gap_days, stats.largest_gap_start = gap if gap else (None, None)
+
+
+def _store(stats: StartupTimelineStats, counts: Dict[str, int], dates: List[date]):
+    """Fill stats from the full sorted date list (building and reconciling only)"""
+    stats.event_count = len(dates)
+    stats.last_event_date = dates[-1] if dates else None
+    stats.event_type_counts = dict(sorted(counts.items()))
+    _set_largest_gap(stats, _largest_gap(dates))
+
+
+def build_stats(db: Session, startup_id: str) -> StartupTimelineStats:
+    """Stats row computed from the startup's events as currently stored"""
+    counts: Dict[str, int] = {}
+    dates: List[date] = []
+    for event_type, event_date in db.query(TimelineEvent.event_type, TimelineEvent.event_date).filter(
+        TimelineEvent.startup_id == startup_id
+    ):
+        counts[_type_value(event_type)] = counts.get(_type_value(event_type), 0) + 1
+        dates.append(event_date)
+    stats = StartupTimelineStats(startup_id=startup_id)
+    _store(stats, counts, sorted(dates))
+    return stats
+
+
+def _ensure_stats(db: Session, startup_id: str, lock: bool) -> StartupTimelineStats:
+    """The startup's stats row, created from its events if missing (concurrent first writers insert once)"""
+    stats = db.get(StartupTimelineStats, startup_id, with_for_update=lock)
+    if stats is not None:
+        return stats
+    built = build_stats(db, startup_id)
+    db.execute(dialect_insert(db, StartupTimelineStats).values(
+        {column.key: getattr(built, column.key) for column in StartupTimelineStats.__table__.columns}
+    ).on_conflict_do_nothing(index_elements=["startup_id"]))
+    return db.get(StartupTimelineStats, startup_id, with_for_update=lock, populate_existing=True)
+
+
+class _FlushDates:
+    """
+    One startup's event dates as this flush sees them: the stored rows, read
+    through the (startup_id, event_date) index, plus the deltas already
+    applied in this flush, which aren't written yet.
+    """
+
+    def __init__(self, db: Session, startup_id: str):
+        self.db = db
+        self.startup_id = startup_id
+        self.pending: Counter = Counter()
+
+    def _stored(self):
+        return self.db.query(TimelineEvent.event_date).filter(TimelineEvent.startup_id == self.startup_id)
+
+    def count(self, day: date) -> int:
+        return self._stored().filter(TimelineEvent.event_date == day).count() + self.pending[day]
+
+    def _nearest(self, day: date, before: bool) -> Optional[date]:
+        column = TimelineEvent.event_date
+        nearest = func.max(column) if before else func.min(column)
+        candidate = day
+        while True:
+            beyond = column < candidate if before else column > candidate
+            candidate = self.db.query(nearest).filter(
+                TimelineEvent.startup_id == self.startup_id, beyond
+            ).scalar()
+            # Skip stored dates whose events this flush removes
+            if candidate is None or self.count(candidate) > 0:
+                break
+        added = [
+            pending_day for pending_day, delta in self.pending.items()
+            if delta > 0 and (pending_day < day if before else pending_day > day) and self.count(pending_day) > 0
+        ]
+        found = [d for d in [candidate] + added if d is not None]
+        if not found:
+            return None
+        return max(found) if before else min(found)
+
+    def previous(self, day: date) -> Optional[date]:
+        return self._nearest(day, before=True)
+
+    def next(self, day: date) -> Optional[date]:
+        return self._nearest(day, before=False)
+
+    def all(self) -> List[date]:
+        counts = Counter(day for (day,) in self._stored())
+        counts.update(self.pending)
+        return sorted(day for day, n in counts.items() for _ in range(max(n, 0)))
+
+
+def _gap(start: date, end: date) -> Gap:
+    return (end - start).days, start
+
+
+def _apply_date(stats: StartupTimelineStats, dates: _FlushDates, sign: int, day: date) -> bool:
+    """Apply one inserted/removed date; returns True when the largest gap needs a rescan"""
+    same_day = dates.count(day)
+    previous = next_day = None
+    if sign > 0 and same_day:
+        removed, added = [], [(0, day)]
+    elif sign < 0 and same_day > 1:
+        removed, added = [(0, day)], []
+    else:
+        previous, next_day = dates.previous(day), dates.next(day)
+        split = [_gap(previous, day)] if previous else []
+        split += [_gap(day, next_day)] if next_day else []
+        merged = [_gap(previous, next_day)] if previous and next_day else []
+        removed, added = (merged, split) if sign > 0 else (split, merged)
+
+    if sign > 0:
+        stats.last_event_date = max(filter(None, [stats.last_event_date, day]))
+    elif day == stats.last_event_date and same_day == 1:
+        stats.last_event_date = previous
+    dates.pending[day] += sign
+
+    largest = (stats.largest_gap_days, stats.largest_gap_start) if stats.largest_gap_start else None
+    best_added = max(added, key=_gap_key, default=None)
+    if largest in removed and (best_added is None or _gap_key(best_added) < _gap_key(largest)):
+        return True
+    candidates = [gap for gap in (largest, best_added) if gap]
+    _set_largest_gap(stats, max(candidates, key=_gap_key, default=None))
+    return False
+
+
+def apply_timeline_deltas(db: Session, startup_id: str, deltas: Iterable[Delta]):
+    stats = _ensure_stats(db, startup_id, lock=True)
+    # A copy: the column only sees reassignment
+    counts = dict(json_dict(stats.event_type_counts))
+    dates = _FlushDates(db, startup_id)
+    rescan = False
+    for sign, event_type, event_date in deltas:
+        stats.event_count = (stats.event_count or 0) + sign
+        counts[event_type] = counts.get(event_type, 0) + sign
+        if counts[event_type] <= 0:
+            del counts[event_type]
+        rescan = _apply_date(stats, dates, sign, event_date) or rescan
+    stats.event_type_counts = dict(sorted(counts.items()))
+    if rescan:
+        _set_largest_gap(stats, _largest_gap(dates.all()))
+
+
+@event.listens_for(Session, "before_flush")
+def _maintain_timeline_stats(session, flush_context, instances):
+    changes: Dict[str, List[Delta]] = {}
+
+    def add(values, sign):
+        if values["startup_id"] and values["event_type"] is not None and values["event_date"] is not None:
+            changes.setdefault(values["startup_id"], []).append(
+                (sign, _type_value(values["event_type"]), values["event_date"])
+            )
+
+    for obj in session.new:
+        if isinstance(obj, TimelineEvent):
+            add(new_values(obj, TIMELINE_FIELDS), 1)
+    for obj in session.dirty:
+        if isinstance(obj, TimelineEvent) and session.is_modified(obj):
+            old, new = old_values(obj, TIMELINE_FIELDS), new_values(obj, TIMELINE_FIELDS)
+            if old != new:
+                add(old, -1)
+                add(new, 1)
+    for obj in session.deleted:
+        if isinstance(obj, TimelineEvent):
+            add(old_values(obj, TIMELINE_FIELDS), -1)
+    for startup_id, deltas in changes.items():
+        apply_timeline_deltas(session, startup_id, deltas)
+
+
+track_old_values(TimelineEvent, TIMELINE_FIELDS)
+
+
+def load_timeline_stats(db: Session, startup_id: str) -> StartupTimelineStats:
+    """
+    The startup's stats row, including this session's unflushed timeline edits;
+    without a row yet, a transient one built from its events (not added)
+    """
+    db.flush()
+    return db.get(StartupTimelineStats, startup_id) or build_stats(db, startup_id)
+
+
+def load_timeline_aggregate(db: Session, startup_id: str) -> Tuple[int, Dict[str, int], Optional[date]]:
+    """(event count, count per EventType value, latest event_date) as ScoringService expects"""
+    stats = load_timeline_stats(db, startup_id)
+    return stats.event_count, json_dict(stats.event_type_counts), stats.last_event_date
+
+
+def execution_gap_from_stats(stats: StartupTimelineStats, threshold_days: int = 90) -> Optional[Dict]:
+    """ScoringService.detect_execution_gap's result, from the stored gap statistics"""
+    if stats.event_count < 2:
+        return None
+    if stats.largest_gap_days is None or stats.largest_gap_days <= threshold_days:
+        return {'has_gap': False}
+    end = date.fromordinal(stats.largest_gap_start.toordinal() + stats.largest_gap_days)
+    return {
+        'has_gap': True,
+        'largest_gap_days': stats.largest_gap_days,
+        'last_gap_start': stats.largest_gap_start.isoformat(),
+        'last_gap_end': end.isoformat()
+    }
+
+
+STATS_FIELDS = ("event_count", "last_event_date", "event_type_counts", "largest_gap_days", "largest_gap_start")
+
+
+def reconcile_timeline_stats(db: Session, repair: bool = True) -> Tuple[List[str], List[str]]:
+    """
+    Rebuild every stats row from one scan of timeline_events. Returns
+    (startup ids without a row, startup ids whose row had drifted).
+    """
+    if repair and db.get_bind().dialect.name == "postgresql":
+        # Hold off stats writes so the scan and the stored rows agree
+        db.connection().exec_driver_sql("LOCK TABLE startup_timeline_stats IN SHARE ROW EXCLUSIVE MODE")
+
+    events: Dict[str, Tuple[Dict[str, int], List[date]]] = {}
+    for startup_id, event_type, event_date in db.query(
+        TimelineEvent.startup_id, TimelineEvent.event_type, TimelineEvent.event_date
+    ).filter(TimelineEvent.startup_id.isnot(None)):
+        counts, dates = events.setdefault(startup_id, ({}, []))
+        counts[_type_value(event_type)] = counts.get(_type_value(event_type), 0) + 1
+        dates.append(event_date)
+
+    stored = {stats.startup_id: stats for stats in db.query(StartupTimelineStats)}
+    missing, drifted = [], []
+    for startup_id in sorted(set(events) | set(stored)):
+        counts, dates = events.get(startup_id, ({}, []))
+        expected = StartupTimelineStats(startup_id=startup_id)
+        _store(expected, counts, sorted(dates))
+        current = stored.get(startup_id)
+        if current is None:
+            missing.append(startup_id)
+            if repair:
+                db.add(expected)
+        elif any(getattr(current, field) != getattr(expected, field) for field in STATS_FIELDS):
+            drifted.append(startup_id)
+            if repair:
+                for field in STATS_FIELDS:
+                    setattr(current, field, getattr(expected, field))
+    db.commit()
+    return missing, drifted
+
+
+def reconcile_startup_timeline_stats() -> int:
+    """Background job entry point: create missing rows, repair drift; returns the number of rows fixed"""
+    db = SessionLocal()
+    try:
+        missing, drifted = reconcile_timeline_stats(db)
+        if missing:
+            logger.info(f"Timeline stats created for {len(missing)} startups")
+        if drifted:
+            logger.warning(f"Timeline stats drifted for {len(drifted)} startups (repaired): {drifted[:10]}")
+        return len(missing) + len(drifted)
+    finally:
+        db.close()
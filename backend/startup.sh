@@ -1,2 +1,4 @@
 #!/bin/bash
+# One background worker (outbox dispatcher, rollups, reconcilers) next to the API
+python scripts/run_worker.py &
 python -m uvicorn main:app --host 0.0.0.0 --port 8000
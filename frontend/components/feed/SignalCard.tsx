@@ -20,6 +20,8 @@ interface SignalCardProps {
         evidence: string
         startup_name: string
         created_at: string
+        occurrence_count?: number
+        last_occurred_at?: string | null
         action_label: string
         action_link: string
     }
@@ -61,7 +63,8 @@ export const SignalCard: React.FC<SignalCardProps> = ({ signal }) => {
                             {signal.startup_name} • {signal.type.replace('_', ' ')}
                         </span>
                         <span className="text-[10px] text-gray-600">
-                            {new Date(signal.created_at).toLocaleDateString()}
+                            {(signal.occurrence_count ?? 1) > 1 && `${signal.occurrence_count} updates • `}
+                            {new Date(signal.last_occurred_at || signal.created_at).toLocaleDateString()}
                         </span>
                     </div>
 
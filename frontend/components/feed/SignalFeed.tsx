@@ -1,4 +1,5 @@
 import React, { useState, useEffect } from 'react'
+import Cookies from 'js-cookie'
 import { api } from '@/lib/api'
 import { SignalCard } from './SignalCard'
 import { BoltIcon } from '@heroicons/react/24/outline'
@@ -11,6 +12,21 @@ export const SignalFeed: React.FC = () => {
         fetchFeed()
     }, [])
 
+    // Live signals over SSE (EventSource can't set headers, so the token goes in the query)
+    useEffect(() => {
+        const token = Cookies.get('token')
+        if (!token) return
+        const source = new EventSource(`${api.defaults.baseURL}/feed/stream?token=${encodeURIComponent(token)}`)
+        source.addEventListener('signal', (event) => {
+            const signal = JSON.parse((event as MessageEvent).data)
+            // Digest updates reuse the id of the signal they fold into
+            setSignals((prev: any[]) => prev.some(s => s.id === signal.id)
+                ? prev.map(s => s.id === signal.id ? signal : s)
+                : [signal, ...prev])
+        })
+        return () => source.close()
+    }, [])
+
     const fetchFeed = async () => {
         try {
             const response = await api.get('/feed')